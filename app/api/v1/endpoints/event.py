@@ -1,19 +1,106 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, Header, UploadFile, File
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
+from pydantic import TypeAdapter
 from typing import List, Optional
 from app.db.database import get_db
 from app.schemas.event import (
     EventCreate, EventUpdate, EventOut, EventList, EventRegistrationCreate,
     EventRegistrationOut, EventLikeCreate, EventLikeOut, EventCommentCreate,
-    EventCommentOut, EventAnalytics, EventSearchParams, EventStats
+    EventCommentUpdate, EventCommentOut, EventCommentPage, EventAnalytics, EventSearchParams, EventStats, EventChanges,
+    EventFacets, EventListWithState, TrendingEvent, SimilarEvent, EventFeed, RegistrationTicketOut,
+    TicketTierCreate, TicketTierUpdate, TicketTierOut, SeatMapCreate, SeatMapOut, SeatHoldCreate,
+    SeatSelection, SeatHoldOut, EventPage, EventSeriesCreate, EventSeriesOut, SeriesUpdateResult
 )
 from app.services.event_service import event_service
+from app.services.event_cache import event_list_cache, CachedList
+from app.services.view_counter import view_counter
+from app.services.reconciliation_service import reconciliation_service
+from app.services.recommendation_service import recommendation_service
+from app.services.feed_service import feed_service
+from app.services.admission_queue import admission_queue
+from app.services.ticket_service import ticket_service
+from app.services.seating_service import seating_service
+from app.services.registration_import import registration_import
+from app.services.series_service import series_service
 from app.core.dependencies import get_current_active_user, require_permission
+from app.core.http_cache import weak_etag, etag_matches, set_cache_headers, not_modified
 from app.db.models import User, EventStatus, EventCategory
 from datetime import datetime
+import tempfile
 
 router = APIRouter(prefix="/events", tags=["Event Management"])
 
+event_state_list_adapter = TypeAdapter(List[EventListWithState])
+
+def with_user_state(db: Session, user_id: int, events_list: List[EventList]) -> List[EventListWithState]:
+    """Attach the caller's like/registration flags using one query per relation"""
+    states = event_service.get_user_event_state(db, user_id, [event.id for event in events_list])
+    return [
+        EventListWithState(**event.model_dump(), **states[event.id])
+        for event in events_list
+    ]
+
+def cached_list_response(route_name: str, cached: CachedList, include_my_state: bool,
+                         if_none_match: Optional[str], db: Session, user_id: int) -> Response:
+    """Build a list response from a cache entry, personalised when requested"""
+    body, etag = cached.body, cached.etag
+    if include_my_state:
+        body = event_state_list_adapter.dump_json(with_user_state(db, user_id, cached.items))
+        etag = weak_etag(body)
+    
+    if etag_matches(if_none_match, etag):
+        return not_modified(route_name, etag)
+    response = Response(content=body, media_type="application/json")
+    set_cache_headers(response, route_name, etag)
+    return response
+
+def event_out(event) -> EventOut:
+    """Build the event detail response, including views not yet flushed"""
+    return EventOut(
+        id=event.id,
+        title=event.title,
+        description=event.description,
+        short_description=event.short_description,
+        category=event.category,
+        status=event.status,
+        start_date=event.start_date,
+        end_date=event.end_date,
+        start_time=event.start_time,
+        end_time=event.end_time,
+        location=event.location,
+        address=event.address,
+        city=event.city,
+        country=event.country,
+        is_online=event.is_online,
+        online_url=event.online_url,
+        max_capacity=event.max_capacity,
+        current_registrations=event.current_registrations,
+        price=event.price,
+        currency=event.currency,
+        is_free=event.is_free,
+        flyer_url=event.flyer_url,
+        banner_url=event.banner_url,
+        gallery_urls=event.gallery_urls.split(',') if event.gallery_urls else None,
+        organizer_name=event.organizer_name,
+        organizer_email=event.organizer_email,
+        organizer_phone=event.organizer_phone,
+        is_featured=event.is_featured,
+        allow_waitlist=event.allow_waitlist,
+        require_approval=event.require_approval,
+        use_admission_queue=event.use_admission_queue,
+        organizer_id=event.organizer_id,
+        series_id=event.series_id,
+        is_active=event.is_active,
+        views_count=event.views_count + view_counter.pending(event.id),
+        likes_count=event.likes_count,
+        shares_count=event.shares_count,
+        created_at=event.created_at,
+        updated_at=event.updated_at,
+        published_at=event.published_at
+    )
+
 # Event CRUD Operations
 
 @router.post("/", response_model=EventOut)
@@ -25,51 +112,13 @@ def create_event(
     """Create a new event"""
     try:
         new_event = event_service.create_event(db, event, current_user.id)
-        return EventOut(
-            id=new_event.id,
-            title=new_event.title,
-            description=new_event.description,
-            short_description=new_event.short_description,
-            category=new_event.category,
-            status=new_event.status,
-            start_date=new_event.start_date,
-            end_date=new_event.end_date,
-            start_time=new_event.start_time,
-            end_time=new_event.end_time,
-            location=new_event.location,
-            address=new_event.address,
-            city=new_event.city,
-            country=new_event.country,
-            is_online=new_event.is_online,
-            online_url=new_event.online_url,
-            max_capacity=new_event.max_capacity,
-            current_registrations=new_event.current_registrations,
-            price=new_event.price,
-            currency=new_event.currency,
-            is_free=new_event.is_free,
-            flyer_url=new_event.flyer_url,
-            banner_url=new_event.banner_url,
-            gallery_urls=new_event.gallery_urls.split(',') if new_event.gallery_urls else None,
-            organizer_name=new_event.organizer_name,
-            organizer_email=new_event.organizer_email,
-            organizer_phone=new_event.organizer_phone,
-            is_featured=new_event.is_featured,
-            allow_waitlist=new_event.allow_waitlist,
-            require_approval=new_event.require_approval,
-            organizer_id=new_event.organizer_id,
-            is_active=new_event.is_active,
-            views_count=new_event.views_count,
-            likes_count=new_event.likes_count,
-            shares_count=new_event.shares_count,
-            created_at=new_event.created_at,
-            updated_at=new_event.updated_at,
-            published_at=new_event.published_at
-        )
+        return event_out(new_event)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/", response_model=dict)
 def get_events(
+    response: Response,
     search: Optional[str] = Query(None, description="Search term"),
     category: Optional[EventCategory] = Query(None, description="Event category"),
     status: Optional[EventStatus] = Query(None, description="Event status"),
@@ -83,6 +132,9 @@ def get_events(
     limit: int = Query(10, ge=1, le=100, description="Items per page"),
     sort_by: str = Query("created_at", description="Sort field"),
     sort_order: str = Query("desc", description="Sort order (asc/desc)"),
+    include_my_state: bool = Query(False, description="Add liked_by_me/registered_by_me flags"),
+    collapse_series: bool = Query(False, description="One card per recurring series (its first matching occurrence)"),
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -109,11 +161,27 @@ def get_events(
             page=page,
             limit=limit,
             sort_by=sort_by,
-            sort_order=sort_order
+            sort_order=sort_order,
+            collapse_series=collapse_series
         )
         
         result = event_service.get_events(db, params)
         
+        states = None
+        if include_my_state:
+            states = event_service.get_user_event_state(db, current_user.id, [e.id for e in result["events"]])
+        
+        # Weak ETag over the page contents; skip building the list when unchanged
+        etag = weak_etag(
+            result["total"], result["page"], result["limit"],
+            [(e.id, e.version, e.views_count, e.likes_count, e.current_registrations) for e in result["events"]],
+            sorted(states.items()) if states else None,
+            sorted(result["series_occurrences"].items())
+        )
+        if etag_matches(if_none_match, etag):
+            return not_modified("event_list", etag)
+        set_cache_headers(response, "event_list", etag)
+        
         # Convert events to EventList format
         events_list = []
         for event in result["events"]:
@@ -136,9 +204,14 @@ def get_events(
                 max_capacity=event.max_capacity,
                 views_count=event.views_count,
                 likes_count=event.likes_count,
-                created_at=event.created_at
+                created_at=event.created_at,
+                series_id=event.series_id,
+                series_occurrences=result["series_occurrences"].get(event.id)
             ))
         
+        if states is not None:
+            events_list = [EventListWithState(**event.model_dump(), **states[event.id]) for event in events_list]
+        
         return {
             "events": events_list,
             "total": result["total"],
@@ -149,61 +222,182 @@ def get_events(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.get("/facets", response_model=EventFacets)
+def get_event_facets(
+    search: Optional[str] = Query(None, description="Search term"),
+    category: Optional[EventCategory] = Query(None, description="Event category"),
+    status: Optional[EventStatus] = Query(None, description="Event status"),
+    city: Optional[str] = Query(None, description="City filter"),
+    is_online: Optional[bool] = Query(None, description="Online event filter"),
+    is_free: Optional[bool] = Query(None, description="Free event filter"),
+    start_date: Optional[str] = Query(None, description="Start date filter (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="End date filter (YYYY-MM-DD)"),
+    organizer_id: Optional[int] = Query(None, description="Organizer ID filter"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get filter chip counts (category, city, online, free) for the current filters"""
+    try:
+        params = EventSearchParams(
+            search=search,
+            category=category,
+            status=status,
+            city=city,
+            is_online=is_online,
+            is_free=is_free,
+            start_date=datetime.strptime(start_date, "%Y-%m-%d").date() if start_date else None,
+            end_date=datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else None,
+            organizer_id=organizer_id
+        )
+        
+        return EventFacets(**event_service.get_facets(db, params))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/changes", response_model=EventChanges)
+def get_event_changes(
+    cursor: int = Query(0, ge=0, description="Last cursor received (0 for a full sync)"),
+    limit: int = Query(500, ge=1, le=1000, description="Maximum changes to return"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get events created, updated or deleted since a cursor (delta sync)"""
+    try:
+        result = event_service.get_changes(db, cursor, limit)
+        return EventChanges(
+            changes=[EventList.model_validate(event) for event in result["changes"]],
+            deleted=result["deleted"],
+            cursor=result["cursor"],
+            has_more=result["has_more"]
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/feed", response_model=EventFeed)
+def get_event_feed(
+    limit: int = Query(20, ge=1, le=100, description="Events per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get published events from followed organizers, newest first"""
+    try:
+        before = None
+        if cursor:
+            published_at, event_id = cursor.rsplit("|", 1)
+            before = (datetime.fromisoformat(published_at), int(event_id))
+        
+        events, next_before = feed_service.get_feed(db, current_user.id, limit, before)
+        return EventFeed(
+            events=[EventList.model_validate(event) for event in events],
+            next_cursor=f"{next_before[0].isoformat()}|{next_before[1]}" if next_before else None
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/batch")
+def get_events_batch(
+    ids: str = Query(..., description="Comma separated event IDs (max 100)"),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get many events by ID in one request"""
+    try:
+        event_ids = list(dict.fromkeys(int(i) for i in ids.split(",") if i.strip()))
+        if not event_ids or len(event_ids) > 100:
+            raise HTTPException(status_code=400, detail="Between 1 and 100 event IDs required")
+        
+        events = event_service.get_events_by_ids(db, event_ids, event_service.parse_fields(fields))
+        found = {event["id"] for event in events}
+        
+        return {
+            "events": jsonable_encoder(events),
+            "missing": [event_id for event_id in event_ids if event_id not in found]
+        }
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/{event_id}", response_model=EventOut)
 def get_event(
     event_id: int,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma separated fields to return"),
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Get event by ID"""
+    """Get event by ID (weak ETag on the event revision; view counts are not versioned)"""
     try:
+        revision = event_service.get_event_revision(db, event_id)
+        if revision is None:
+            raise HTTPException(status_code=404, detail="Event not found")
+        
+        # Each fieldset is its own representation, so the normalized field list is part of the ETag
+        selected_fields = event_service.parse_fields(fields)
+        etag = weak_etag(event_id, revision, sorted(selected_fields) if selected_fields else None)
+        if etag_matches(if_none_match, etag):
+            event_service.increment_views(db, event_id, current_user.id)
+            return not_modified("event_detail", etag)
+        
+        # Sparse fieldset: project only the requested columns
+        if selected_fields:
+            events = event_service.get_events_by_ids(db, [event_id], selected_fields)
+            event_service.increment_views(db, event_id, current_user.id)
+            sparse = JSONResponse(content=jsonable_encoder(events[0]))
+            set_cache_headers(sparse, "event_detail", etag)
+            return sparse
+        
         event = event_service.get_event(db, event_id)
         if not event:
             raise HTTPException(status_code=404, detail="Event not found")
+        set_cache_headers(response, "event_detail", weak_etag(event.id, event_service.event_revision(event), None))
         
         # Increment views count
-        event_service.increment_views(db, event_id)
-        
-        return EventOut(
-            id=event.id,
-            title=event.title,
-            description=event.description,
-            short_description=event.short_description,
-            category=event.category,
-            status=event.status,
-            start_date=event.start_date,
-            end_date=event.end_date,
-            start_time=event.start_time,
-            end_time=event.end_time,
-            location=event.location,
-            address=event.address,
-            city=event.city,
-            country=event.country,
-            is_online=event.is_online,
-            online_url=event.online_url,
-            max_capacity=event.max_capacity,
-            current_registrations=event.current_registrations,
-            price=event.price,
-            currency=event.currency,
-            is_free=event.is_free,
-            flyer_url=event.flyer_url,
-            banner_url=event.banner_url,
-            gallery_urls=event.gallery_urls.split(',') if event.gallery_urls else None,
-            organizer_name=event.organizer_name,
-            organizer_email=event.organizer_email,
-            organizer_phone=event.organizer_phone,
-            is_featured=event.is_featured,
-            allow_waitlist=event.allow_waitlist,
-            require_approval=event.require_approval,
-            organizer_id=event.organizer_id,
-            is_active=event.is_active,
-            views_count=event.views_count,
-            likes_count=event.likes_count,
-            shares_count=event.shares_count,
-            created_at=event.created_at,
-            updated_at=event.updated_at,
-            published_at=event.published_at
+        event_service.increment_views(db, event_id, current_user.id)
+        
+        return event_out(event)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/{event_id}/page", response_model=EventPage)
+def get_event_page(
+    event_id: int,
+    comments_limit: int = Query(10, ge=1, le=50, description="Latest comments to include"),
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Event detail screen in one round trip: event, organizer, the caller's like and registration state, latest comments and rating"""
+    try:
+        page = event_service.get_event_page(db, event_id, current_user.id, comments_limit)
+        if not page:
+            raise HTTPException(status_code=404, detail="Event not found")
+        event_service.increment_views(db, event_id, current_user.id)
+        
+        event = page["event"]
+        result = EventPage(
+            event=event_out(event),
+            organizer=page["organizer"],
+            liked_by_me=page["liked_by_me"],
+            registered_by_me=page["registered_by_me"],
+            my_registration_status=page["my_registration_status"],
+            comments=EventCommentPage(
+                comments=[comment_out(comment, user_name) for comment, user_name in page["comments"]],
+                next_cursor=page["next_cursor"],
+                comments_count=event.comments_count,
+                rating_count=event.rating_count,
+                average_rating=round(event.average_rating, 2) if event.average_rating else None
+            )
         )
+        
+        # Personalised, so the ETag is a digest of the page; like the detail ETag it ignores views
+        etag = weak_etag(result.model_dump_json(exclude={"event": {"views_count"}}).encode())
+        if etag_matches(if_none_match, etag):
+            return not_modified("event_page", etag)
+        response = Response(content=result.model_dump_json(), media_type="application/json")
+        set_cache_headers(response, "event_page", etag)
+        return response
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -220,46 +414,69 @@ def update_event(
         if not updated_event:
             raise HTTPException(status_code=404, detail="Event not found or access denied")
         
-        return EventOut(
-            id=updated_event.id,
-            title=updated_event.title,
-            description=updated_event.description,
-            short_description=updated_event.short_description,
-            category=updated_event.category,
-            status=updated_event.status,
-            start_date=updated_event.start_date,
-            end_date=updated_event.end_date,
-            start_time=updated_event.start_time,
-            end_time=updated_event.end_time,
-            location=updated_event.location,
-            address=updated_event.address,
-            city=updated_event.city,
-            country=updated_event.country,
-            is_online=updated_event.is_online,
-            online_url=updated_event.online_url,
-            max_capacity=updated_event.max_capacity,
-            current_registrations=updated_event.current_registrations,
-            price=updated_event.price,
-            currency=updated_event.currency,
-            is_free=updated_event.is_free,
-            flyer_url=updated_event.flyer_url,
-            banner_url=updated_event.banner_url,
-            gallery_urls=updated_event.gallery_urls.split(',') if updated_event.gallery_urls else None,
-            organizer_name=updated_event.organizer_name,
-            organizer_email=updated_event.organizer_email,
-            organizer_phone=updated_event.organizer_phone,
-            is_featured=updated_event.is_featured,
-            allow_waitlist=updated_event.allow_waitlist,
-            require_approval=updated_event.require_approval,
-            organizer_id=updated_event.organizer_id,
-            is_active=updated_event.is_active,
-            views_count=updated_event.views_count,
-            likes_count=updated_event.likes_count,
-            shares_count=updated_event.shares_count,
-            created_at=updated_event.created_at,
-            updated_at=updated_event.updated_at,
-            published_at=updated_event.published_at
-        )
+        return event_out(updated_event)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# Recurring Series Endpoints
+
+def series_out(series, occurrences) -> EventSeriesOut:
+    return EventSeriesOut(
+        id=series.id,
+        organizer_id=series.organizer_id,
+        frequency=series.frequency,
+        interval=series.interval,
+        weekdays=[int(weekday) for weekday in series.weekdays.split(",")] if series.weekdays else None,
+        starts_on=series.starts_on,
+        until=series.until,
+        count=series.count,
+        occurrences=[EventList.model_validate(event) for event in occurrences]
+    )
+
+@router.post("/series", response_model=EventSeriesOut)
+def create_event_series(
+    series: EventSeriesCreate,
+    current_user: User = Depends(require_permission("event:create")),
+    db: Session = Depends(get_db)
+):
+    """Create a recurring series; all occurrences are created as drafts in one insert"""
+    try:
+        new_series, _ = series_service.create_series(db, series, current_user.id)
+        return series_out(*series_service.get_series(db, new_series.id))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/series/{series_id}", response_model=EventSeriesOut)
+def get_event_series(
+    series_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get a series and its occurrences in date order"""
+    try:
+        found = series_service.get_series(db, series_id)
+        if not found:
+            raise HTTPException(status_code=404, detail="Series not found")
+        
+        return series_out(*found)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.put("/{event_id}/following", response_model=SeriesUpdateResult)
+def update_event_and_following(
+    event_id: int,
+    event: EventUpdate,
+    current_user: User = Depends(require_permission("event:update")),
+    db: Session = Depends(get_db)
+):
+    """Update this occurrence and every later one of its series (date changes shift them all)"""
+    try:
+        updated = series_service.update_following(db, event_id, current_user.id, event)
+        if not updated:
+            raise HTTPException(status_code=404, detail="Series occurrence not found or access denied")
+        
+        series_id, event_ids = updated
+        return SeriesUpdateResult(series_id=series_id, updated_event_ids=event_ids)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -329,6 +546,38 @@ def unlike_event(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/organizers/{organizer_id}/follow")
+def follow_organizer(
+    organizer_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Follow an organizer"""
+    try:
+        success = feed_service.follow(db, current_user.id, organizer_id)
+        if not success:
+            raise HTTPException(status_code=400, detail="Already following or organizer not found")
+        
+        return {"message": "Organizer followed successfully"}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.delete("/organizers/{organizer_id}/follow")
+def unfollow_organizer(
+    organizer_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Unfollow an organizer"""
+    try:
+        success = feed_service.unfollow(db, current_user.id, organizer_id)
+        if not success:
+            raise HTTPException(status_code=400, detail="Not following this organizer")
+        
+        return {"message": "Organizer unfollowed successfully"}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.post("/{event_id}/register")
 def register_for_event(
     event_id: int,
@@ -336,9 +585,16 @@ def register_for_event(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Register for an event"""
+    """Register for an event (queued for events with an admission queue)"""
     try:
-        registration_data = registration.dict()
+        registration_data = registration.dict(exclude={"event_id"})
+        ticket = admission_queue.enqueue(db, event_id, current_user.id, registration_data)
+        if ticket:
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content={"message": "Registration queued", "ticket_id": ticket.id, "status": ticket.status}
+            )
+        
         new_registration = event_service.register_for_event(db, event_id, current_user.id, registration_data)
         if not new_registration:
             raise HTTPException(status_code=400, detail="Registration failed or event not available")
@@ -347,6 +603,153 @@ def register_for_event(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.delete("/{event_id}/register")
+def cancel_registration(
+    event_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Cancel own registration (frees the seat for the waitlist)"""
+    try:
+        result = event_service.cancel_registration(db, event_id, current_user.id)
+        if not result:
+            raise HTTPException(status_code=400, detail="Not registered for this event")
+        
+        registration, promoted = result
+        return {"message": "Registration cancelled successfully", "promoted": promoted}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/{event_id}/registrations/import")
+def import_registrations(
+    event_id: int,
+    file: UploadFile = File(..., description="CSV with a header row, or NDJSON; an email per row"),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$", description="Defaults from the file name"),
+    current_user: User = Depends(require_permission("event:update")),
+    db: Session = Depends(get_db)
+):
+    """Register an attendee list to own event, creating missing users; streams an NDJSON report line per row"""
+    fmt = format or ("ndjson" if (file.filename or "").endswith((".ndjson", ".jsonl")) else "csv")
+    # The upload and the report are spooled to disk past 1 MB, so large files never sit in memory
+    report = tempfile.SpooledTemporaryFile(max_size=1024 * 1024, mode="w+", encoding="utf-8")
+    try:
+        summary = registration_import.import_registrations(db, event_id, current_user.id, file.file, fmt, report)
+        if summary is None:
+            raise HTTPException(status_code=404, detail="Event not found or not authorized")
+        report.seek(0)
+    except Exception as e:
+        report.close()
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    def lines():
+        with report:
+            yield from report
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@router.get("/registration-requests/{ticket_id}", response_model=RegistrationTicketOut)
+def get_registration_ticket(
+    ticket_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get the state of a queued registration (poll until it is no longer pending)"""
+    ticket = admission_queue.get_ticket(db, ticket_id, current_user.id)
+    if not ticket:
+        raise HTTPException(status_code=404, detail="Registration request not found")
+    
+    result = RegistrationTicketOut.model_validate(ticket)
+    result.position = admission_queue.position(db, ticket)
+    return result
+
+# Comment Endpoints
+
+def comment_out(comment, user_name: Optional[str]) -> EventCommentOut:
+    return EventCommentOut(
+        id=comment.id,
+        event_id=comment.event_id,
+        user_id=comment.user_id,
+        user_name=user_name or "",
+        content=comment.content,
+        rating=comment.rating,
+        is_approved=comment.is_approved,
+        created_at=comment.created_at,
+        updated_at=comment.updated_at
+    )
+
+@router.get("/{event_id}/comments", response_model=EventCommentPage)
+def get_event_comments(
+    event_id: int,
+    limit: int = Query(20, ge=1, le=100, description="Number of comments to return"),
+    cursor: Optional[int] = Query(None, description="next_cursor from the previous page"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get event comments, newest first, with rating summary"""
+    try:
+        stats = event_service.get_comment_stats(db, event_id)
+        if not stats:
+            raise HTTPException(status_code=404, detail="Event not found")
+        
+        rows, next_cursor = event_service.get_comments(db, event_id, limit, cursor)
+        return EventCommentPage(
+            comments=[comment_out(comment, user_name) for comment, user_name in rows],
+            next_cursor=next_cursor,
+            **stats
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/{event_id}/comments", response_model=EventCommentOut)
+def add_event_comment(
+    event_id: int,
+    comment: EventCommentCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Comment on (and optionally rate) an event"""
+    try:
+        new_comment = event_service.add_comment(db, event_id, current_user.id, comment)
+        if not new_comment:
+            raise HTTPException(status_code=404, detail="Event not found")
+        
+        return comment_out(new_comment, current_user.full_name)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.put("/comments/{comment_id}", response_model=EventCommentOut)
+def update_event_comment(
+    comment_id: int,
+    comment: EventCommentUpdate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Update own comment"""
+    try:
+        updated_comment = event_service.update_comment(db, comment_id, current_user.id, comment)
+        if not updated_comment:
+            raise HTTPException(status_code=404, detail="Comment not found or not authorized")
+        
+        return comment_out(updated_comment, current_user.full_name)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.delete("/comments/{comment_id}")
+def delete_event_comment(
+    comment_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Delete own comment"""
+    try:
+        success = event_service.delete_comment(db, comment_id, current_user.id)
+        if not success:
+            raise HTTPException(status_code=404, detail="Comment not found or not authorized")
+        
+        return {"message": "Comment deleted successfully"}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 # Analytics Endpoints
 
 @router.get("/{event_id}/analytics", response_model=EventAnalytics)
@@ -365,6 +768,200 @@ def get_event_analytics(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.get("/{event_id}/similar", response_model=List[SimilarEvent])
+def get_similar_events(
+    event_id: int,
+    limit: int = Query(10, ge=1, le=50, description="Number of events to return"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get events people who liked, registered for or attended this event also joined"""
+    try:
+        return [
+            SimilarEvent(**EventList.model_validate(event).model_dump(), similarity=round(score, 4))
+            for event, score in recommendation_service.get_similar_events(db, event_id, limit)
+        ]
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/{event_id}/tiers", response_model=List[TicketTierOut])
+def get_ticket_tiers(
+    event_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get an event's ticket tiers with remaining tickets (cached briefly)"""
+    try:
+        tiers = ticket_service.get_availability(db, event_id)
+        etag = weak_etag(tiers)
+        if etag_matches(if_none_match, etag):
+            return not_modified("ticket_tiers", etag)
+        set_cache_headers(response, "ticket_tiers", etag)
+        return tiers
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/{event_id}/tiers", response_model=TicketTierOut)
+def create_ticket_tier(
+    event_id: int,
+    tier: TicketTierCreate,
+    current_user: User = Depends(require_permission("event:update")),
+    db: Session = Depends(get_db)
+):
+    """Add a ticket tier (e.g. early_bird, regular, vip) to own event"""
+    try:
+        new_tier = ticket_service.create_tier(db, event_id, current_user.id, tier)
+        if not new_tier:
+            raise HTTPException(status_code=404, detail="Event not found or not authorized")
+        
+        return next(t for t in ticket_service.get_availability(db, event_id) if t["id"] == new_tier.id)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.put("/tiers/{tier_id}", response_model=TicketTierOut)
+def update_ticket_tier(
+    tier_id: int,
+    tier: TicketTierUpdate,
+    current_user: User = Depends(require_permission("event:update")),
+    db: Session = Depends(get_db)
+):
+    """Change a ticket tier's price or capacity"""
+    try:
+        updated_tier = ticket_service.update_tier(db, tier_id, current_user.id, tier)
+        if not updated_tier:
+            raise HTTPException(status_code=404, detail="Ticket tier not found or not authorized")
+        
+        return next(t for t in ticket_service.get_availability(db, updated_tier.event_id) if t["id"] == tier_id)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# Reserved Seating Endpoints
+
+@router.get("/{event_id}/seat-map", response_model=SeatMapOut)
+def get_seat_map(
+    event_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get an event's seat map with a bitmap of available seats per section"""
+    try:
+        sections = seating_service.get_sections(db, event_id)
+        if not sections:
+            raise HTTPException(status_code=404, detail="Seat map not found")
+        
+        # Section versions change on every hold, so they identify the bitmaps
+        etag = weak_etag([(section.id, section.version) for section in sections])
+        if etag_matches(if_none_match, etag):
+            return not_modified("seat_map", etag)
+        set_cache_headers(response, "seat_map", etag)
+        return {"event_id": event_id, "sections": [seating_service.section_out(section) for section in sections]}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.put("/{event_id}/seat-map", response_model=SeatMapOut)
+def set_seat_map(
+    event_id: int,
+    seat_map: SeatMapCreate,
+    current_user: User = Depends(require_permission("event:update")),
+    db: Session = Depends(get_db)
+):
+    """Upload own event's seat map (sets max_capacity to its seat count)"""
+    try:
+        sections = seating_service.set_seat_map(db, event_id, current_user.id, seat_map)
+        if sections is None:
+            raise HTTPException(status_code=404, detail="Event not found or not authorized")
+        
+        return {"event_id": event_id, "sections": [seating_service.section_out(section) for section in sections]}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/{event_id}/seat-map/best", response_model=SeatSelection)
+def get_best_seats(
+    event_id: int,
+    quantity: int = Query(..., ge=1, description="Adjacent seats wanted"),
+    section_id: Optional[int] = Query(None, description="Only look in this section"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Find the best available adjacent seats without holding them"""
+    try:
+        selection = seating_service.find_seats(db, event_id, SeatHoldCreate(section_id=section_id, quantity=quantity))
+        if not selection:
+            raise HTTPException(status_code=404, detail="No adjacent seats available")
+        
+        return selection
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/{event_id}/seat-holds", response_model=SeatHoldOut)
+def hold_seats(
+    event_id: int,
+    hold: SeatHoldCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Hold seats (named seats, or the best available quantity) until the hold expires"""
+    try:
+        new_hold = seating_service.hold_seats(db, event_id, current_user.id, hold)
+        if not new_hold:
+            raise HTTPException(status_code=404, detail="Event not found or not available")
+        
+        return seating_service.hold_out(db, new_hold)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/seat-holds/{hold_id}", response_model=SeatHoldOut)
+def get_seat_hold(
+    hold_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get own seat hold"""
+    hold = seating_service.get_hold(db, hold_id, current_user.id)
+    if not hold:
+        raise HTTPException(status_code=404, detail="Seat hold not found")
+    
+    return seating_service.hold_out(db, hold)
+
+@router.post("/seat-holds/{hold_id}/confirm")
+def confirm_seat_hold(
+    hold_id: int,
+    registration: EventRegistrationCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Register for the event with the held seats"""
+    try:
+        new_registration = event_service.confirm_seat_hold(
+            db, hold_id, current_user.id, registration.dict(exclude={"event_id"})
+        )
+        if not new_registration:
+            raise HTTPException(status_code=400, detail="Seat hold expired or registration failed")
+        
+        return {"message": "Registration successful", "status": new_registration.status, "registration_id": new_registration.id}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.delete("/seat-holds/{hold_id}")
+def release_seat_hold(
+    hold_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Release own held seats"""
+    try:
+        success = seating_service.release_hold(db, hold_id, current_user.id)
+        if not success:
+            raise HTTPException(status_code=404, detail="Seat hold not found or no longer held")
+        
+        return {"message": "Seats released successfully"}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/analytics/stats", response_model=EventStats)
 def get_global_stats(
     current_user: User = Depends(require_permission("event:read")),
@@ -379,14 +976,22 @@ def get_global_stats(
 
 # Special Event Lists
 
-@router.get("/featured/list", response_model=List[EventList])
+@router.get("/featured/list", response_model=List[EventListWithState])
 def get_featured_events(
     limit: int = Query(10, ge=1, le=50, description="Number of events to return"),
+    include_my_state: bool = Query(False, description="Add liked_by_me/registered_by_me flags"),
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """Get featured events"""
     try:
+        cached = event_list_cache.get("featured", limit)
+        if cached is not None:
+            return cached_list_response(
+                "featured_events", cached, include_my_state, if_none_match, db, current_user.id
+            )
+        
         events = event_service.get_featured_events(db, limit)
         events_list = []
         for event in events:
@@ -412,18 +1017,44 @@ def get_featured_events(
                 created_at=event.created_at
             ))
         
-        return events_list
+        cached = event_list_cache.set("featured", limit, events_list)
+        return cached_list_response(
+            "featured_events", cached, include_my_state, if_none_match, db, current_user.id
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/trending/list", response_model=List[TrendingEvent])
+def get_trending_events(
+    limit: int = Query(50, ge=1, le=100, description="Number of events to return"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get trending events ranked by time-decayed interactions"""
+    try:
+        return [
+            TrendingEvent(**EventList.model_validate(event).model_dump(), trending_score=round(score, 3))
+            for event, score in event_service.get_trending_events(db, limit)
+        ]
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/upcoming/list", response_model=List[EventList])
+@router.get("/upcoming/list", response_model=List[EventListWithState])
 def get_upcoming_events(
     limit: int = Query(10, ge=1, le=50, description="Number of events to return"),
+    include_my_state: bool = Query(False, description="Add liked_by_me/registered_by_me flags"),
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """Get upcoming events"""
     try:
+        cached = event_list_cache.get("upcoming", limit)
+        if cached is not None:
+            return cached_list_response(
+                "upcoming_events", cached, include_my_state, if_none_match, db, current_user.id
+            )
+        
         events = event_service.get_upcoming_events(db, limit)
         events_list = []
         for event in events:
@@ -449,6 +1080,52 @@ def get_upcoming_events(
                 created_at=event.created_at
             ))
         
-        return events_list
+        cached = event_list_cache.set("upcoming", limit, events_list)
+        return cached_list_response(
+            "upcoming_events", cached, include_my_state, if_none_match, db, current_user.id
+        )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/cache/stats")
+def get_list_cache_stats(
+    current_user: User = Depends(require_permission("analytics:read"))
+):
+    """Get featured/upcoming list cache statistics"""
+    return event_list_cache.get_stats()
+
+@router.get("/counters/reconciliation")
+def get_last_reconciliation(
+    current_user: User = Depends(require_permission("analytics:read"))
+):
+    """Get the report of the last counter reconciliation run"""
+    return reconciliation_service.last_report or {}
+
+@router.post("/counters/reconcile")
+def reconcile_counters(
+    current_user: User = Depends(require_permission("event:approve"))
+):
+    """Recompute registration, like and template usage counters now"""
+    try:
+        report = reconciliation_service.run()
+        if report is None:
+            raise ValueError("Counter reconciliation is already running")
+        return report
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.post("/recommendations/rebuild")
+def rebuild_recommendations(
+    current_user: User = Depends(require_permission("event:approve"))
+):
+    """Rebuild the co-occurrence matrix and similar events from scratch"""
+    try:
+        return {"cooccurrences": recommendation_service.rebuild()}
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
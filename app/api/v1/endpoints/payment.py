@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Request
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.db.database import get_db
+from app.services.payment_webhooks import payment_webhooks
+from app.core.dependencies import require_permission
+from app.db.models import User
+
+router = APIRouter(prefix="/payments", tags=["Payments"])
+
+async def raw_body(request: Request) -> bytes:
+    """Request body exactly as sent (signatures cover the raw bytes)"""
+    return await request.body()
+
+@router.post("/webhooks/{provider}")
+def receive_payment_webhook(
+    provider: str,
+    body: bytes = Depends(raw_body),
+    x_webhook_timestamp: Optional[str] = Header(None),
+    x_webhook_signature: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Store a signed payment provider webhook; registrations are updated in the background"""
+    if not payment_webhooks.verify(provider, body, x_webhook_timestamp, x_webhook_signature):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid webhook signature")
+    
+    try:
+        stored = payment_webhooks.receive(db, provider, body)
+        return {"received": True, "duplicate": not stored}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/webhooks/stats")
+def get_payment_webhook_stats(
+    current_user: User = Depends(require_permission("analytics:read")),
+    db: Session = Depends(get_db)
+):
+    """Get the payment webhook inbox backlog"""
+    return payment_webhooks.get_stats(db)
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from pydantic import Field
+from typing import Dict
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Event Organizer"
@@ -18,6 +19,95 @@ class Settings(BaseSettings):
     
     # Frontend URL for password reset
     FRONTEND_URL: str = Field(default="http://localhost:3000", alias="FRONTEND_URL")
+    
+    # HTTP caching (Cache-Control policy per route name, JSON in env)
+    CACHE_CONTROL_POLICIES: Dict[str, str] = Field(default={
+        "event_detail": "private, no-cache",
+        "event_list": "private, max-age=30",
+        "featured_events": "private, max-age=60",
+        "upcoming_events": "private, max-age=60",
+        "ticket_tiers": "private, max-age=5",
+        "seat_map": "private, no-cache",
+        "event_page": "private, no-cache"
+    }, alias="CACHE_CONTROL_POLICIES")
+    FACET_CACHE_TTL_SECONDS: int = Field(default=30, alias="FACET_CACHE_TTL_SECONDS")
+    
+    # Write-behind view counter: flush interval and max unflushed views per worker
+    VIEW_FLUSH_INTERVAL_SECONDS: float = Field(default=5.0, alias="VIEW_FLUSH_INTERVAL_SECONDS")
+    VIEW_MAX_PENDING: int = Field(default=1000, alias="VIEW_MAX_PENDING")
+    
+    # Unique viewer HyperLogLog sketches (precision 12 = 4 KB, ~1.6% error)
+    HLL_PRECISION: int = Field(default=12, alias="HLL_PRECISION")
+    HLL_FLUSH_INTERVAL_SECONDS: float = Field(default=60.0, alias="HLL_FLUSH_INTERVAL_SECONDS")
+    
+    # Sharded event counters (views/likes/shares) and their compaction interval
+    COUNTER_SHARDS: int = Field(default=8, alias="COUNTER_SHARDS")
+    COUNTER_COMPACT_INTERVAL_SECONDS: float = Field(default=300.0, alias="COUNTER_COMPACT_INTERVAL_SECONDS")
+    
+    # Denormalized counter reconciliation (rows per batch and run interval)
+    RECONCILE_BATCH_SIZE: int = Field(default=1000, alias="RECONCILE_BATCH_SIZE")
+    RECONCILE_INTERVAL_SECONDS: float = Field(default=3600.0, alias="RECONCILE_INTERVAL_SECONDS")
+    
+    # Trending ranking: interaction weights, score half-life and persistence
+    TRENDING_WEIGHTS: Dict[str, float] = Field(default={
+        "view": 1.0,
+        "like": 3.0,
+        "registration": 5.0,
+        "check_in": 8.0
+    }, alias="TRENDING_WEIGHTS")
+    TRENDING_HALF_LIFE_HOURS: float = Field(default=12.0, alias="TRENDING_HALF_LIFE_HOURS")
+    TRENDING_FLUSH_INTERVAL_SECONDS: float = Field(default=60.0, alias="TRENDING_FLUSH_INTERVAL_SECONDS")
+    TRENDING_MAX_EVENTS: int = Field(default=10000, alias="TRENDING_MAX_EVENTS")
+    
+    # Similar events: neighbors kept per event, how often they are refreshed,
+    # pending interactions folded into the matrix per statement and how often the
+    # matrix is rebuilt from scratch (the refresh never removes unlikes or cancellations)
+    SIMILAR_EVENTS_TOP_K: int = Field(default=20, alias="SIMILAR_EVENTS_TOP_K")
+    SIMILAR_EVENTS_REFRESH_INTERVAL_SECONDS: float = Field(default=300.0, alias="SIMILAR_EVENTS_REFRESH_INTERVAL_SECONDS")
+    SIMILAR_EVENTS_FOLD_BATCH_SIZE: int = Field(default=10000, alias="SIMILAR_EVENTS_FOLD_BATCH_SIZE")
+    SIMILAR_EVENTS_REBUILD_INTERVAL_SECONDS: float = Field(default=86400.0, alias="SIMILAR_EVENTS_REBUILD_INTERVAL_SECONDS")
+    
+    # Follow feed: organizers above this many followers are read on demand
+    # instead of fanned out; new follows get this many recent events
+    FEED_FANOUT_MAX_FOLLOWERS: int = Field(default=10000, alias="FEED_FANOUT_MAX_FOLLOWERS")
+    FEED_BACKFILL_EVENTS: int = Field(default=20, alias="FEED_BACKFILL_EVENTS")
+    
+    # Admission queue: requests admitted per batch and how often queues are drained
+    ADMISSION_QUEUE_BATCH_SIZE: int = Field(default=500, alias="ADMISSION_QUEUE_BATCH_SIZE")
+    ADMISSION_QUEUE_INTERVAL_SECONDS: float = Field(default=1.0, alias="ADMISSION_QUEUE_INTERVAL_SECONDS")
+    
+    # Notification outbox: delivered per batch, retried up to max attempts
+    NOTIFICATION_BATCH_SIZE: int = Field(default=100, alias="NOTIFICATION_BATCH_SIZE")
+    NOTIFICATION_INTERVAL_SECONDS: float = Field(default=30.0, alias="NOTIFICATION_INTERVAL_SECONDS")
+    NOTIFICATION_MAX_ATTEMPTS: int = Field(default=5, alias="NOTIFICATION_MAX_ATTEMPTS")
+    
+    # Ticket tiers: inventory rows per tier (1 = unsharded) and availability cache TTL
+    TICKET_TIER_SHARDS: int = Field(default=1, alias="TICKET_TIER_SHARDS")
+    TICKET_TIER_CACHE_TTL_SECONDS: int = Field(default=5, alias="TICKET_TIER_CACHE_TTL_SECONDS")
+    
+    # Reserved seating: how long seats stay held, expiry sweep interval and seats per hold
+    SEAT_HOLD_TTL_SECONDS: int = Field(default=600, alias="SEAT_HOLD_TTL_SECONDS")
+    SEAT_HOLD_EXPIRY_INTERVAL_SECONDS: float = Field(default=30.0, alias="SEAT_HOLD_EXPIRY_INTERVAL_SECONDS")
+    SEAT_HOLD_MAX_SEATS: int = Field(default=10, alias="SEAT_HOLD_MAX_SEATS")
+    
+    # Idempotency-Key replay store (per worker): key lifetime, max stored responses and
+    # how long a duplicate waits for the first request before giving up
+    IDEMPOTENCY_KEY_TTL_SECONDS: int = Field(default=86400, alias="IDEMPOTENCY_KEY_TTL_SECONDS")
+    IDEMPOTENCY_MAX_KEYS: int = Field(default=10000, alias="IDEMPOTENCY_MAX_KEYS")
+    IDEMPOTENCY_WAIT_SECONDS: float = Field(default=30.0, alias="IDEMPOTENCY_WAIT_SECONDS")
+    
+    # Bulk registration import: rows resolved, created and registered per transaction
+    REGISTRATION_IMPORT_BATCH_SIZE: int = Field(default=1000, alias="REGISTRATION_IMPORT_BATCH_SIZE")
+    
+    # Payment webhooks: signing secret per provider (JSON in env), accepted clock skew,
+    # and inbox events applied per batch by the background worker
+    PAYMENT_WEBHOOK_SECRETS: Dict[str, str] = Field(default={}, alias="PAYMENT_WEBHOOK_SECRETS")
+    PAYMENT_WEBHOOK_TOLERANCE_SECONDS: int = Field(default=300, alias="PAYMENT_WEBHOOK_TOLERANCE_SECONDS")
+    PAYMENT_WEBHOOK_BATCH_SIZE: int = Field(default=1000, alias="PAYMENT_WEBHOOK_BATCH_SIZE")
+    PAYMENT_WEBHOOK_INTERVAL_SECONDS: float = Field(default=1.0, alias="PAYMENT_WEBHOOK_INTERVAL_SECONDS")
+    
+    # Recurring event series: most occurrences one series may generate
+    SERIES_MAX_OCCURRENCES: int = Field(default=366, alias="SERIES_MAX_OCCURRENCES")
 
     class Config:
         env_file = ".env"
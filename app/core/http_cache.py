@@ -0,0 +1,41 @@
+from fastapi import Response
+from app.core.config import settings
+from typing import Optional, Any
+import hashlib
+
+DEFAULT_CACHE_CONTROL = "private, no-cache"
+
+def weak_etag(*parts: Any) -> str:
+    """Build a weak ETag from a digest of the given parts (bytes or values)"""
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else repr(part).encode())
+        digest.update(b"|")
+    return f'W/"{digest.hexdigest()[:20]}"'
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(_opaque(tag) == _opaque(etag) for tag in if_none_match.split(","))
+
+def cache_control(route_name: str) -> str:
+    """Get the configured Cache-Control policy for a route"""
+    return settings.CACHE_CONTROL_POLICIES.get(route_name, DEFAULT_CACHE_CONTROL)
+
+def set_cache_headers(response: Response, route_name: str, etag: str) -> None:
+    """Set ETag and Cache-Control headers on a response"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control(route_name)
+
+def not_modified(route_name: str, etag: str) -> Response:
+    """Build an empty 304 response"""
+    response = Response(status_code=304)
+    set_cache_headers(response, route_name, etag)
+    return response
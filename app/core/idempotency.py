@@ -0,0 +1,138 @@
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.core.config import settings
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+import asyncio
+import hashlib
+import re
+
+# POST routes that honor the Idempotency-Key header (retried by mobile clients)
+IDEMPOTENT_ROUTES = [
+    re.compile(r"^/api/v1/events/\d+/register$"),
+    re.compile(r"^/api/v1/events/\d+/like$"),
+    re.compile(r"^/api/v1/attendance/scan/(check-in|check-out|qr)$"),
+]
+
+MAX_KEY_LENGTH = 255
+
+class StoredResponse:
+    """First response to an idempotent request, or a placeholder while it runs"""
+
+    def __init__(self, fingerprint: str, expires_at: datetime):
+        self.fingerprint = fingerprint
+        self.expires_at = expires_at
+        self.status_code: Optional[int] = None
+        self.headers: Dict[str, str] = {}
+        self.body = b""
+        self.done = asyncio.Event()
+
+    @property
+    def completed(self) -> bool:
+        return self.status_code is not None
+
+class IdempotencyStore:
+    """Bounded in-memory store of responses by idempotency key (per worker)
+
+    Only touched from the event loop, so no lock is needed. The oldest key
+    is evicted when full and keys expire after `ttl_seconds`.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, StoredResponse]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[StoredResponse]:
+        """Get the stored (or in-flight) response for a key"""
+        entry = self._entries.get(key)
+        if entry and entry.expires_at <= datetime.now():
+            del self._entries[key]
+            return None
+        return entry
+
+    def begin(self, key: str, fingerprint: str) -> StoredResponse:
+        """Claim a key for a request that is about to run"""
+        if len(self._entries) >= self.max_entries:
+            self._entries.popitem(last=False)
+        entry = self._entries[key] = StoredResponse(fingerprint, datetime.now() + self.ttl)
+        return entry
+
+    def complete(self, entry: StoredResponse, status_code: int, headers: Dict[str, str], body: bytes) -> None:
+        """Store the response and release waiting duplicates"""
+        entry.status_code, entry.headers, entry.body = status_code, headers, body
+        entry.done.set()
+
+    def abort(self, key: str, entry: StoredResponse) -> None:
+        """Forget a key whose request failed, so a retry runs again"""
+        if self._entries.get(key) is entry:
+            del self._entries[key]
+        entry.done.set()
+
+    def clear(self) -> None:
+        """Drop all keys"""
+        self._entries.clear()
+
+idempotency_store = IdempotencyStore(settings.IDEMPOTENCY_KEY_TTL_SECONDS, settings.IDEMPOTENCY_MAX_KEYS)
+
+class IdempotencyMiddleware(BaseHTTPMiddleware):
+    """Replay the first response to retried POSTs carrying the same Idempotency-Key
+
+    Keys are scoped to the caller's credentials and the route, and checked
+    before authentication, so a retry never reaches the database. A
+    duplicate that arrives while the first request is still running waits
+    for its response, up to a bound. 5xx responses are not stored, so those
+    retries run again; reusing a key with a different body is rejected.
+    """
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        key = request.headers.get("idempotency-key")
+        path = request.url.path
+        if not key or request.method != "POST" or not any(route.match(path) for route in IDEMPOTENT_ROUTES):
+            return await call_next(request)
+        if len(key) > MAX_KEY_LENGTH:
+            return JSONResponse(status_code=400, content={"detail": "Idempotency-Key is too long"})
+
+        scope = hashlib.sha256(
+            "\n".join((request.headers.get("authorization", ""), path, key)).encode()
+        ).hexdigest()
+        fingerprint = hashlib.sha256(await request.body()).hexdigest()
+
+        while True:
+            entry = idempotency_store.get(scope)
+            if entry is None:
+                break
+            if entry.fingerprint != fingerprint:
+                return JSONResponse(
+                    status_code=422,
+                    content={"detail": "Idempotency-Key was already used for a different request"}
+                )
+            if entry.completed:
+                return Response(
+                    content=entry.body,
+                    status_code=entry.status_code,
+                    headers={**entry.headers, "Idempotent-Replayed": "true"}
+                )
+            # Same request still running: wait for it, then replay (or run if it failed)
+            try:
+                await asyncio.wait_for(entry.done.wait(), timeout=settings.IDEMPOTENCY_WAIT_SECONDS)
+            except asyncio.TimeoutError:
+                return JSONResponse(
+                    status_code=409,
+                    content={"detail": "A request with this Idempotency-Key is still in progress"}
+                )
+
+        entry = idempotency_store.begin(scope, fingerprint)
+        try:
+            response = await call_next(request)
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            headers = dict(response.headers)
+            if response.status_code < 500:
+                idempotency_store.complete(entry, response.status_code, headers, body)
+        finally:
+            # Errors, 5xx and cancellation (client gone) all free the key for a retry
+            if not entry.completed:
+                idempotency_store.abort(scope, entry)
+        return Response(content=body, status_code=response.status_code, headers=headers)
@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Session
 from app.db.database import engine, SessionLocal, Base
-from app.db.models import User, Role, RefreshToken, PasswordResetToken, Event, EventRegistration, EventLike, EventComment, Attendance, EventStatus, EventCategory
+from app.db.models import User, Role, RefreshToken, PasswordResetToken, Event, EventRegistration, EventLike, EventComment, Attendance, EventStatus, EventCategory, EventCounter
 from app.core.security import get_password_hash
 from app.core.config import settings
 from datetime import datetime, timedelta
@@ -112,9 +112,6 @@ def create_sample_events(db: Session, organizer_user: User):
         allow_waitlist=True,
         require_approval=False,
         is_active=True,
-        views_count=150,
-        likes_count=45,
-        shares_count=12,
         published_at=datetime.utcnow()
     )
     
@@ -147,9 +144,6 @@ def create_sample_events(db: Session, organizer_user: User):
         allow_waitlist=True,
         require_approval=True,
         is_active=True,
-        views_count=75,
-        likes_count=23,
-        shares_count=8,
         published_at=datetime.utcnow()
     )
     
@@ -180,9 +174,6 @@ def create_sample_events(db: Session, organizer_user: User):
         allow_waitlist=True,
         require_approval=False,
         is_active=True,
-        views_count=200,
-        likes_count=67,
-        shares_count=25,
         published_at=datetime.utcnow()
     )
     
@@ -191,6 +182,12 @@ def create_sample_events(db: Session, organizer_user: User):
     db.add(event3)
     db.commit()
     
+    # Sample engagement counters
+    db.add(EventCounter(event_id=event1.id, views_count=150, likes_count=45, shares_count=12))
+    db.add(EventCounter(event_id=event2.id, views_count=75, likes_count=23, shares_count=8))
+    db.add(EventCounter(event_id=event3.id, views_count=200, likes_count=67, shares_count=25))
+    db.commit()
+    
     return [event1, event2, event3]
 
 def init_db():
@@ -1,10 +1,23 @@
 from .models import User, Role, RefreshToken, PasswordResetToken
-from .event import Event, Attendance, EventRegistration, EventLike, EventComment, EventStatus, EventCategory
+from .event import Event, Attendance, EventRegistration, EventLike, EventComment, EventStatus, EventCategory, EventViewSketch, EventCounter, EventTrendingScore
 from .certificate import Certificate, CertificateTemplate, CertificateVerification
+from .sync import EventTombstone
+from .recommendation import PendingInteraction, UserEventInteraction, EventCooccurrence, EventNeighbor
+from .feed import OrganizerFollow, OrganizerFollowerCount, UserTimelineEntry
+from .admission import RegistrationRequest
+from .notification import Notification
+from .ticket import TicketTier, TicketTierInventory
+from .seating import SeatSection, SeatHold
+from .payment import PaymentWebhookEvent
+from .series import EventSeries
 
 __all__ = [
     "User", "Role", "RefreshToken", "PasswordResetToken", 
     "Event", "Attendance", "EventRegistration", "EventLike", "EventComment",
-    "EventStatus", "EventCategory",
-    "Certificate", "CertificateTemplate", "CertificateVerification"
+    "EventStatus", "EventCategory", "EventViewSketch", "EventCounter", "EventTrendingScore",
+    "Certificate", "CertificateTemplate", "CertificateVerification",
+    "EventTombstone", "PendingInteraction", "UserEventInteraction", "EventCooccurrence", "EventNeighbor",
+    "OrganizerFollow", "OrganizerFollowerCount", "UserTimelineEntry", "RegistrationRequest",
+    "Notification", "TicketTier", "TicketTierInventory", "SeatSection", "SeatHold",
+    "PaymentWebhookEvent", "EventSeries"
 ]
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, text
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+class RegistrationRequest(Base):
+    __tablename__ = "registration_requests"
+
+    # Queued registration for an event with an admission queue; the id is
+    # the ticket the client polls, and requests are admitted in id order
+    id = Column(Integer, primary_key=True, index=True)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+
+    # Registration details, copied to the registration when admitted
+    ticket_type = Column(String(50), nullable=True)
+    special_requirements = Column(Text, nullable=True)
+    dietary_restrictions = Column(String(255), nullable=True)
+    emergency_contact = Column(String(255), nullable=True)
+
+    # Outcome
+    status = Column(String(20), nullable=False, default="pending")  # pending, confirmed, waitlisted, rejected
+    registration_id = Column(Integer, nullable=True)
+    waitlist_position = Column(Integer, nullable=True)
+    detail = Column(String(255), nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    processed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_registration_requests_pending", "event_id", "id", postgresql_where=text("status = 'pending'")),
+    )
@@ -16,7 +16,7 @@ class Certificate(Base):
     # Event and User relationship
     event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    template_id = Column(Integer, ForeignKey("certificate_templates.id"), nullable=True)
+    template_id = Column(Integer, ForeignKey("certificate_templates.id"), nullable=True, index=True)
     
     # Certificate details
     title = Column(String(255), nullable=False)
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Date, Time, DateTime, Boolean, ForeignKey, Text, Float, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, String, Date, Time, DateTime, Boolean, ForeignKey, Text, Float, Enum, Sequence, LargeBinary, UniqueConstraint, Index, select, false, text
+from sqlalchemy.orm import relationship, column_property
 from sqlalchemy.sql import func
 from app.db.database import Base
 import uuid
@@ -8,6 +8,9 @@ import enum
 def generate_uuid():
     return str(uuid.uuid4())
 
+# Global, monotonic change counter for delta sync (events and tombstones)
+event_change_seq = Sequence("event_change_seq")
+
 class EventStatus(enum.Enum):
     DRAFT = "draft"
     PUBLISHED = "published"
@@ -25,6 +28,34 @@ class EventCategory(enum.Enum):
     CULTURE = "culture"
     OTHER = "other"
 
+class EventCounter(Base):
+    __tablename__ = "event_counters"
+    
+    # High-churn counters live here instead of on the wide events row. Views,
+    # likes, shares and comment/rating aggregates are spread over shards and
+    # summed on read; registrations always use shard 0 so capacity checks stay
+    # a single-row update.
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True)
+    shard = Column(Integer, primary_key=True, default=0)
+    views_count = Column(BigInteger, nullable=False, server_default="0")
+    likes_count = Column(BigInteger, nullable=False, server_default="0")
+    shares_count = Column(BigInteger, nullable=False, server_default="0")
+    registrations_count = Column(BigInteger, nullable=False, server_default="0")
+    comments_count = Column(BigInteger, nullable=False, server_default="0")
+    rating_sum = Column(BigInteger, nullable=False, server_default="0")
+    rating_count = Column(BigInteger, nullable=False, server_default="0")
+
+def counter_total(column, event_id_column, group=None):
+    """Correlated sum of a counter over all shards of an event (deferred when grouped)"""
+    return column_property(
+        select(func.coalesce(func.sum(column), 0).cast(BigInteger))
+        .where(EventCounter.event_id == event_id_column)
+        .correlate_except(EventCounter)
+        .scalar_subquery(),
+        deferred=group is not None,
+        group=group
+    )
+
 class Event(Base):
     __tablename__ = "events"
 
@@ -53,7 +84,7 @@ class Event(Base):
     
     # Capacity & Pricing
     max_capacity = Column(Integer, nullable=True)
-    current_registrations = Column(Integer, default=0)
+    current_registrations = counter_total(EventCounter.registrations_count, id)
     price = Column(Float, default=0.0)
     currency = Column(String(3), default="IDR")
     is_free = Column(Boolean, default=True)
@@ -74,6 +105,15 @@ class Event(Base):
     is_featured = Column(Boolean, default=False)
     allow_waitlist = Column(Boolean, default=True)
     require_approval = Column(Boolean, default=False)
+    use_admission_queue = Column(Boolean, default=False)  # queue registrations (high-demand events)
+    
+    # Feed delivery decided when published: pulled at read time instead of
+    # fanned out to timelines (the organizer had too many followers)
+    feed_on_read = Column(Boolean, nullable=False, default=False, server_default=false())
+    
+    # Recurring series membership (occurrence number from 0, in date order)
+    series_id = Column(Integer, ForeignKey("event_series.id", ondelete="SET NULL"), nullable=True)
+    series_index = Column(Integer, nullable=True)
     
     # Attendance tracking fields
     check_in_started = Column(Boolean, default=False)
@@ -81,10 +121,21 @@ class Event(Base):
     check_in_qr_code = Column(String(500), unique=True, default=generate_uuid)
     check_out_qr_code = Column(String(500), unique=True, default=generate_uuid)
     
-    # Analytics fields
-    views_count = Column(Integer, default=0)
-    likes_count = Column(Integer, default=0)
-    shares_count = Column(Integer, default=0)
+    # Analytics fields (read-only sums over event_counters)
+    views_count = counter_total(EventCounter.views_count, id)
+    likes_count = counter_total(EventCounter.likes_count, id)
+    shares_count = counter_total(EventCounter.shares_count, id)
+    
+    # Comment/rating aggregates, loaded together on first access
+    comments_count = counter_total(EventCounter.comments_count, id, group="comments")
+    rating_sum = counter_total(EventCounter.rating_sum, id, group="comments")
+    rating_count = counter_total(EventCounter.rating_count, id, group="comments")
+    
+    # Row version, bumped by the ORM on every write (drives ETags)
+    version = Column(Integer, nullable=False, default=1)
+    
+    # Delta sync position, advanced by the events_track_change trigger
+    change_seq = Column(BigInteger, event_change_seq, nullable=True, index=True)
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -98,6 +149,21 @@ class Event(Base):
     likes = relationship("EventLike", back_populates="event", cascade="all, delete-orphan")
     comments = relationship("EventComment", back_populates="event", cascade="all, delete-orphan")
     certificates = relationship("Certificate", back_populates="event", cascade="all, delete-orphan")
+    
+    __mapper_args__ = {"version_id_col": version}
+    
+    __table_args__ = (
+        # Follow backfill (newest published first), and feed reads of events not fanned out
+        Index("ix_events_organizer_published", "organizer_id", "published_at"),
+        Index("ix_events_feed_on_read", "organizer_id", "published_at", postgresql_where=text("feed_on_read")),
+        # "This and following" edits are a range of one series
+        Index("ix_events_series", "series_id", "series_index"),
+    )
+    
+    @property
+    def average_rating(self):
+        """Mean comment rating from the maintained aggregates (None when unrated)"""
+        return self.rating_sum / self.rating_count if self.rating_count else None
 
 class EventRegistration(Base):
     __tablename__ = "event_registrations"
@@ -125,6 +191,12 @@ class EventRegistration(Base):
     # Relationships
     event = relationship("Event", back_populates="registrations")
     user = relationship("User", back_populates="event_registrations")
+    
+    __table_args__ = (
+        UniqueConstraint("event_id", "user_id", name="uq_event_registrations_event_user"),
+        # Waitlist in FIFO order (oldest first) without scanning the event's registrations
+        Index("ix_event_registrations_event_status_date", "event_id", "status", "registration_date", "id"),
+    )
 
 class EventLike(Base):
     __tablename__ = "event_likes"
@@ -137,6 +209,10 @@ class EventLike(Base):
     # Relationships
     event = relationship("Event", back_populates="likes")
     user = relationship("User", back_populates="event_likes")
+    
+    __table_args__ = (
+        UniqueConstraint("event_id", "user_id", name="uq_event_likes_event_user"),
+    )
 
 class EventComment(Base):
     __tablename__ = "event_comments"
@@ -157,6 +233,28 @@ class EventComment(Base):
     # Relationships
     event = relationship("Event", back_populates="comments")
     user = relationship("User", back_populates="event_comments")
+    
+    # Keyset pagination of an event's comments (newest first)
+    __table_args__ = (
+        Index("ix_event_comments_event_id_id", "event_id", "id"),
+    )
+
+class EventViewSketch(Base):
+    __tablename__ = "event_view_sketches"
+    
+    # HyperLogLog registers of viewer ids; period is "total" or an ISO date
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True)
+    period = Column(String(10), primary_key=True)
+    registers = Column(LargeBinary, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class EventTrendingScore(Base):
+    __tablename__ = "event_trending_scores"
+    
+    # Time-decayed interaction score as of updated_at (halves every half-life)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True)
+    score = Column(Float, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
 class Attendance(Base):
     __tablename__ = "attendances"
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, BigInteger, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+class OrganizerFollow(Base):
+    __tablename__ = "organizer_follows"
+
+    follower_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    organizer_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class OrganizerFollowerCount(Base):
+    __tablename__ = "organizer_follower_counts"
+
+    # Maintained with follow/unfollow; decides fan-out on write vs on read
+    organizer_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    followers_count = Column(BigInteger, nullable=False, server_default="0")
+
+class UserTimelineEntry(Base):
+    __tablename__ = "user_timelines"
+
+    # Events fanned out to followers when published; read newest first
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True)
+    organizer_id = Column(Integer, nullable=False)
+    published_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_user_timelines_user_published", "user_id", "published_at", "event_id"),
+    )
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, text
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+class Notification(Base):
+    __tablename__ = "notifications"
+
+    # Outbox: written in the transaction that causes the notification,
+    # delivered later by the notification worker
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String(50), nullable=False)  # waitlist_promoted
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=True)
+    registration_id = Column(Integer, nullable=True)
+
+    # Delivery
+    attempts = Column(Integer, nullable=False, server_default="0")
+    last_error = Column(String(255), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_notifications_unsent", "id", postgresql_where=text("sent_at IS NULL")),
+    )
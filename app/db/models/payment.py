@@ -0,0 +1,26 @@
+from sqlalchemy import Column, BigInteger, Integer, String, Text, DateTime, UniqueConstraint, Index, text
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+class PaymentWebhookEvent(Base):
+    __tablename__ = "payment_webhook_events"
+
+    # Append-only inbox of verified provider webhooks, stored as received and
+    # applied to registrations by a background worker in id order
+    id = Column(BigInteger, primary_key=True)
+    provider = Column(String(50), nullable=False)
+    provider_event_id = Column(String(255), nullable=False)
+    event_type = Column(String(100), nullable=False)
+    registration_id = Column(Integer, nullable=True)  # no FK: webhooks may name unknown registrations
+    payload = Column(Text, nullable=False)
+    received_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Set once applied
+    processed_at = Column(DateTime(timezone=True), nullable=True)
+    outcome = Column(String(20), nullable=True)  # applied, skipped, ignored, unknown_registration
+
+    __table_args__ = (
+        # Providers redeliver; a provider event is stored once
+        UniqueConstraint("provider", "provider_event_id", name="uq_payment_webhook_events_provider_event"),
+        Index("ix_payment_webhook_events_unprocessed", "id", postgresql_where=text("processed_at IS NULL")),
+    )
@@ -0,0 +1,43 @@
+from sqlalchemy import Column, Integer, BigInteger, Float, DateTime
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+# Derived data for similar events, rebuilt in bulk from likes, registrations
+# and attendances. No foreign keys so a rebuild is a plain bulk insert;
+# readers join events, so rows of deleted events are simply never returned.
+
+class PendingInteraction(Base):
+    __tablename__ = "pending_interactions"
+
+    # Append-only log of interactions written by request transactions and
+    # folded into the matrix by the refresh job, so writers never lock cells
+    id = Column(BigInteger, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    event_id = Column(Integer, nullable=False)
+
+class UserEventInteraction(Base):
+    __tablename__ = "user_event_interactions"
+
+    # Distinct (user, event) pairs from likes, registrations and attendances
+    user_id = Column(Integer, primary_key=True)
+    event_id = Column(Integer, primary_key=True, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class EventCooccurrence(Base):
+    __tablename__ = "event_cooccurrences"
+
+    # Sparse event x event matrix: users who interacted with both (stored both
+    # ways); the diagonal (event_id = other_event_id) is users of the event
+    event_id = Column(Integer, primary_key=True)
+    other_event_id = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
+
+class EventNeighbor(Base):
+    __tablename__ = "event_neighbors"
+
+    # Precomputed top-K similar events per event (cosine over co-occurrence)
+    event_id = Column(Integer, primary_key=True)
+    rank = Column(Integer, primary_key=True)
+    neighbor_id = Column(Integer, nullable=False)
+    score = Column(Float, nullable=False)
@@ -0,0 +1,46 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, LargeBinary, UniqueConstraint, Index, text
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+class SeatSection(Base):
+    __tablename__ = "seat_sections"
+
+    # A block of rows x seats_per_row seats. Seat (row, seat) is bit
+    # (row - 1) * seats_per_row + (seat - 1) of the bitmaps, little-endian;
+    # a set bit in `available` is a seat that can still be held
+    id = Column(Integer, primary_key=True, index=True)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    name = Column(String(50), nullable=False)
+    rows = Column(Integer, nullable=False)
+    seats_per_row = Column(Integer, nullable=False)
+    price = Column(Float, nullable=False, default=0.0)
+    seat_count = Column(Integer, nullable=False)  # sellable seats (blocked seats excluded)
+    available = Column(LargeBinary, nullable=False)
+    version = Column(Integer, nullable=False, default=1)  # bumped on every bitmap write
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("event_id", "name", name="uq_seat_sections_event_name"),
+    )
+
+class SeatHold(Base):
+    __tablename__ = "seat_holds"
+
+    # Seats taken out of a section's bitmap for one user: held until
+    # expires_at, then either confirmed into a registration or released
+    id = Column(Integer, primary_key=True, index=True)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    section_id = Column(Integer, ForeignKey("seat_sections.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    seats = Column(LargeBinary, nullable=False)  # same layout as the section bitmap
+    seat_count = Column(Integer, nullable=False)
+    status = Column(String(20), nullable=False, default="held")  # held, confirmed, released, expired
+    registration_id = Column(Integer, ForeignKey("event_registrations.id", ondelete="SET NULL"), nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Expiry sweeps only look at live holds
+        Index("ix_seat_holds_held_expires", "expires_at", postgresql_where=text("status = 'held'")),
+        Index("ix_seat_holds_registration_id", "registration_id"),
+    )
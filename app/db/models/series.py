@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+class EventSeries(Base):
+    __tablename__ = "event_series"
+
+    # Recurrence rule of a series; occurrences are ordinary events rows
+    # pointing back here with their position in the series
+    id = Column(Integer, primary_key=True, index=True)
+    organizer_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    frequency = Column(String(10), nullable=False)  # daily, weekly, monthly
+    interval = Column(Integer, nullable=False, default=1)
+    weekdays = Column(String(20), nullable=True)  # weekly only: comma separated, 0 = Monday
+    starts_on = Column(Date, nullable=False)
+    until = Column(Date, nullable=True)
+    count = Column(Integer, nullable=True)
+    occurrences_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
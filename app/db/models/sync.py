@@ -0,0 +1,87 @@
+from sqlalchemy import Column, Integer, BigInteger, DateTime, DDL, event
+from sqlalchemy.sql import func
+from app.db.database import Base
+from app.db.models.event import event_change_seq
+
+class EventTombstone(Base):
+    __tablename__ = "event_tombstones"
+
+    # Written by the events delete trigger below
+    event_id = Column(Integer, primary_key=True)
+    change_seq = Column(BigInteger, event_change_seq, nullable=False, index=True)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now())
+
+# Maintain change_seq/updated_at in the database so every write path (ORM,
+# bulk UPDATE, raw SQL) is seen by delta sync. Engagement counters live in
+# event_counters, so they never mark an event as changed.
+#
+# Sequence values are taken when a statement runs, not at commit, so a
+# transaction can commit a lower change_seq after a higher one is visible.
+# Each writing transaction therefore holds a shared advisory lock (single
+# bigint key space) on the sequence position it started from until it ends,
+# and readers only serve changes below the oldest such claim.
+event_change_trigger = DDL("""
+CREATE OR REPLACE FUNCTION events_next_change_seq() RETURNS bigint AS $$
+BEGIN
+    IF current_setting('events.change_claim', true) IS DISTINCT FROM txid_current()::text THEN
+        PERFORM pg_advisory_xact_lock_shared((SELECT last_value FROM event_change_seq));
+        PERFORM set_config('events.change_claim', txid_current()::text, true);
+    END IF;
+    RETURN nextval('event_change_seq');
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION events_change_horizon() RETURNS bigint AS $$
+DECLARE
+    horizon bigint;
+BEGIN
+    -- Read the sequence before the claims: a writer missing from pg_locks
+    -- claimed after this point, so all its values are above horizon
+    SELECT last_value + 1 INTO horizon FROM event_change_seq;
+    RETURN LEAST(horizon, (
+        SELECT min((classid::bigint << 32) | objid::bigint) FROM pg_locks
+        WHERE locktype = 'advisory' AND objsubid = 1
+          AND database = (SELECT oid FROM pg_database WHERE datname = current_database())
+          AND pid <> pg_backend_pid()
+    ));
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION events_track_change() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        NEW.change_seq := events_next_change_seq();
+    ELSIF (to_jsonb(NEW) - 'version' - 'updated_at' - 'change_seq')
+       IS DISTINCT FROM
+       (to_jsonb(OLD) - 'version' - 'updated_at' - 'change_seq') THEN
+        NEW.updated_at := now();
+        NEW.change_seq := events_next_change_seq();
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS events_track_change ON events;
+CREATE TRIGGER events_track_change BEFORE INSERT OR UPDATE ON events
+    FOR EACH ROW EXECUTE FUNCTION events_track_change();
+""")
+
+event_tombstone_trigger = DDL("""
+CREATE OR REPLACE FUNCTION events_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO event_tombstones (event_id, change_seq, deleted_at)
+    VALUES (OLD.id, events_next_change_seq(), now())
+    ON CONFLICT (event_id) DO UPDATE SET change_seq = EXCLUDED.change_seq, deleted_at = EXCLUDED.deleted_at;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS events_tombstone ON events;
+CREATE TRIGGER events_tombstone AFTER DELETE ON events
+    FOR EACH ROW EXECUTE FUNCTION events_tombstone();
+""")
+
+# Registered on the metadata so both tables exist before the triggers are created;
+# after_create fires on every create_all, so the DDL must be safe to re-run
+event.listen(Base.metadata, "after_create", event_change_trigger.execute_if(dialect="postgresql"))
+event.listen(Base.metadata, "after_create", event_tombstone_trigger.execute_if(dialect="postgresql"))
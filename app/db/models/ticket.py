@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+class TicketTier(Base):
+    __tablename__ = "ticket_tiers"
+
+    id = Column(Integer, primary_key=True, index=True)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    name = Column(String(50), nullable=False)  # early_bird, regular, vip (matched by registration ticket_type)
+    price = Column(Float, nullable=False, default=0.0)
+    capacity = Column(Integer, nullable=True)  # None = unlimited
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("event_id", "name", name="uq_ticket_tiers_event_name"),
+    )
+
+class TicketTierInventory(Base):
+    __tablename__ = "ticket_tier_inventory"
+
+    # Remaining tickets of a tier split over shard rows, so buyers of one tier
+    # rarely wait on each other and never on other tiers (no rows when unlimited)
+    tier_id = Column(Integer, ForeignKey("ticket_tiers.id", ondelete="CASCADE"), primary_key=True)
+    shard = Column(Integer, primary_key=True)
+    remaining = Column(Integer, nullable=False)
@@ -1,6 +1,17 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.v1.endpoints import auth, user, attendance, event, certificate
+from app.api.v1.endpoints import auth, user, attendance, event, certificate, payment
+from app.services.view_counter import view_counter
+from app.services.unique_viewers import unique_viewer_service
+from app.services.counter_service import counter_service
+from app.services.reconciliation_service import reconciliation_service
+from app.services.trending_service import trending_service
+from app.services.recommendation_service import recommendation_service
+from app.services.admission_queue import admission_queue
+from app.services.notification import notification_service
+from app.services.seating_service import seating_service
+from app.services.payment_webhooks import payment_webhooks
+from app.core.idempotency import IdempotencyMiddleware
 
 app = FastAPI(
     title="Event Organizer API",
@@ -8,6 +19,9 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Replay retried registration/like/scan POSTs sent with an Idempotency-Key
+app.add_middleware(IdempotencyMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -23,6 +37,34 @@ app.include_router(user.router, prefix="/api/v1")
 app.include_router(attendance.router, prefix="/api/v1")
 app.include_router(event.router, prefix="/api/v1")
 app.include_router(certificate.router, prefix="/api/v1")
+app.include_router(payment.router, prefix="/api/v1")
+
+@app.on_event("startup")
+def start_background_workers():
+    view_counter.start()
+    unique_viewer_service.start()
+    counter_service.start()
+    reconciliation_service.start()
+    trending_service.start()
+    recommendation_service.start()
+    admission_queue.start()
+    notification_service.start()
+    seating_service.start()
+    payment_webhooks.start()
+
+@app.on_event("shutdown")
+def stop_background_workers():
+    # Flush buffered view counts, viewer sketches and trending scores before the worker exits
+    view_counter.stop()
+    unique_viewer_service.stop()
+    counter_service.stop()
+    reconciliation_service.stop()
+    trending_service.stop()
+    recommendation_service.stop()
+    admission_queue.stop()
+    notification_service.stop()
+    seating_service.stop()
+    payment_webhooks.stop()
 
 @app.get("/")
 def read_root():
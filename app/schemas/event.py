@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, EmailStr, Field
 from datetime import date, time, datetime
 from typing import Optional, List
 from enum import Enum
@@ -10,6 +10,11 @@ class EventStatus(str, Enum):
     COMPLETED = "completed"
     CANCELLED = "cancelled"
 
+class SeriesFrequency(str, Enum):
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+
 class EventCategory(str, Enum):
     BUSINESS = "business"
     ENTERTAINMENT = "entertainment"
@@ -49,6 +54,7 @@ class EventBase(BaseModel):
     is_featured: bool = False
     allow_waitlist: bool = True
     require_approval: bool = False
+    use_admission_queue: bool = False
 
 class EventCreate(EventBase):
     pass
@@ -82,11 +88,13 @@ class EventUpdate(BaseModel):
     is_featured: Optional[bool] = None
     allow_waitlist: Optional[bool] = None
     require_approval: Optional[bool] = None
+    use_admission_queue: Optional[bool] = None
 
 class EventOut(EventBase):
     id: int
     status: EventStatus
     organizer_id: int
+    series_id: Optional[int] = None
     current_registrations: int
     is_active: bool
     views_count: int
@@ -99,6 +107,9 @@ class EventOut(EventBase):
     class Config:
         from_attributes = True
 
+# Fields selectable through the sparse fieldset (fields=) parameter
+EVENT_OUT_FIELDS = list(EventOut.model_fields)
+
 class EventList(BaseModel):
     id: int
     title: str
@@ -119,18 +130,71 @@ class EventList(BaseModel):
     views_count: int
     likes_count: int
     created_at: datetime
+    series_id: Optional[int] = None
+    series_occurrences: Optional[int] = None  # matching occurrences when a series is collapsed into one card
     
     class Config:
         from_attributes = True
 
+class EventListWithState(EventList):
+    liked_by_me: Optional[bool] = None
+    registered_by_me: Optional[bool] = None
+    my_registration_status: Optional[str] = None
+
+class TrendingEvent(EventList):
+    trending_score: float
+
+class SimilarEvent(EventList):
+    similarity: float
+
+class EventFeed(BaseModel):
+    events: List[EventList]
+    next_cursor: Optional[str] = None
+
+class EventChanges(BaseModel):
+    changes: List[EventList]
+    deleted: List[int]
+    cursor: int
+    has_more: bool
+
+# Series Schemas
+class SeriesRecurrence(BaseModel):
+    frequency: SeriesFrequency
+    interval: int = Field(1, ge=1, le=52)
+    weekdays: Optional[List[int]] = None  # weekly only, 0 = Monday; defaults to the first date's weekday
+    count: Optional[int] = Field(None, ge=1)
+    until: Optional[date] = None  # inclusive; count or until is required
+
+class EventSeriesCreate(EventCreate):
+    recurrence: SeriesRecurrence  # start_date/end_date describe the first occurrence
+
+class EventSeriesOut(BaseModel):
+    id: int
+    organizer_id: int
+    frequency: SeriesFrequency
+    interval: int
+    weekdays: Optional[List[int]]
+    starts_on: date
+    until: Optional[date]
+    count: Optional[int]
+    occurrences: List[EventList]
+
+class SeriesUpdateResult(BaseModel):
+    series_id: int
+    updated_event_ids: List[int]
+
 # Registration Schemas
 class EventRegistrationCreate(BaseModel):
-    event_id: int
+    event_id: Optional[int] = None  # taken from the path
     ticket_type: Optional[str] = Field(None, max_length=50)
     special_requirements: Optional[str] = None
     dietary_restrictions: Optional[str] = Field(None, max_length=255)
     emergency_contact: Optional[str] = Field(None, max_length=255)
 
+class RegistrationImportRow(EventRegistrationCreate):
+    email: EmailStr
+    full_name: Optional[str] = Field(None, max_length=255)  # used when the user is created
+
 class EventRegistrationUpdate(BaseModel):
     status: Optional[str] = Field(None, max_length=20)
     ticket_type: Optional[str] = Field(None, max_length=50)
@@ -157,6 +221,86 @@ class EventRegistrationOut(BaseModel):
     class Config:
         from_attributes = True
 
+class RegistrationTicketOut(BaseModel):
+    id: int
+    event_id: int
+    status: str  # pending, confirmed, waitlisted, rejected
+    position: Optional[int] = None  # pending requests ahead, while pending
+    waitlist_position: Optional[int] = None
+    registration_id: Optional[int] = None
+    detail: Optional[str] = None
+    created_at: datetime
+    processed_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+# Ticket Tier Schemas
+class TicketTierCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=50)
+    price: float = Field(0.0, ge=0)
+    capacity: Optional[int] = Field(None, ge=1)
+
+class TicketTierUpdate(BaseModel):
+    price: Optional[float] = Field(None, ge=0)
+    capacity: Optional[int] = Field(None, ge=1)
+
+class TicketTierOut(BaseModel):
+    id: int
+    event_id: int
+    name: str
+    price: float
+    capacity: Optional[int]
+    remaining: Optional[int]
+    sold_out: bool
+
+# Seating Schemas
+class SeatRef(BaseModel):
+    row: int = Field(..., ge=1)
+    seat: int = Field(..., ge=1)
+
+class SeatSectionCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=50)
+    rows: int = Field(..., ge=1, le=500)
+    seats_per_row: int = Field(..., ge=1, le=500)
+    price: float = Field(0.0, ge=0)
+    blocked: List[SeatRef] = []  # aisles and missing seats, never sold
+
+class SeatMapCreate(BaseModel):
+    sections: List[SeatSectionCreate] = Field(..., min_length=1)
+
+class SeatSectionOut(BaseModel):
+    id: int
+    name: str
+    rows: int
+    seats_per_row: int
+    price: float
+    seat_count: int
+    available_count: int
+    available: str  # base64 bitmap, bit (row - 1) * seats_per_row + (seat - 1), little-endian
+
+class SeatMapOut(BaseModel):
+    event_id: int
+    sections: List[SeatSectionOut]
+
+class SeatHoldCreate(BaseModel):
+    section_id: Optional[int] = None  # best available over all sections when omitted
+    quantity: Optional[int] = Field(None, ge=1)  # adjacent seats, picked by the server
+    seats: Optional[List[SeatRef]] = None  # exact seats in section_id
+
+class SeatSelection(BaseModel):
+    section_id: int
+    section_name: str
+    seats: List[SeatRef]
+    price: float  # total for the seats
+
+class SeatHoldOut(SeatSelection):
+    id: int
+    event_id: int
+    status: str  # held, confirmed, released, expired
+    registration_id: Optional[int] = None
+    expires_at: datetime
+
 # Like & Comment Schemas
 class EventLikeCreate(BaseModel):
     event_id: int
@@ -172,7 +316,7 @@ class EventLikeOut(BaseModel):
         from_attributes = True
 
 class EventCommentCreate(BaseModel):
-    event_id: int
+    event_id: Optional[int] = None  # taken from the path
     content: str = Field(..., min_length=1)
     rating: Optional[int] = Field(None, ge=1, le=5)
 
@@ -194,11 +338,36 @@ class EventCommentOut(BaseModel):
     class Config:
         from_attributes = True
 
+class EventCommentPage(BaseModel):
+    comments: List[EventCommentOut]
+    next_cursor: Optional[int] = None
+    comments_count: int
+    rating_count: int
+    average_rating: Optional[float] = None
+
+class OrganizerSummary(BaseModel):
+    id: int
+    name: Optional[str]
+    published_events: int
+    followers_count: int
+    followed_by_me: bool
+
+class EventPage(BaseModel):
+    event: EventOut
+    organizer: OrganizerSummary
+    liked_by_me: bool
+    registered_by_me: bool
+    my_registration_status: Optional[str] = None
+    comments: EventCommentPage  # first page; continue with /events/{id}/comments?cursor=
+
 # Analytics Schemas
 class EventAnalytics(BaseModel):
     event_id: int
     event_title: str
     total_views: int
+    unique_viewers: Optional[int] = None
+    unique_viewers_today: Optional[int] = None
+    unique_viewers_error: Optional[float] = None  # relative standard error
     total_likes: int
     total_shares: int
     total_registrations: int
@@ -224,6 +393,14 @@ class EventSearchParams(BaseModel):
     limit: int = Field(10, ge=1, le=100)
     sort_by: str = "created_at"
     sort_order: str = "desc"
+    collapse_series: bool = False
+
+class EventFacets(BaseModel):
+    total: int
+    category: List[dict]
+    city: List[dict]
+    is_online: List[dict]
+    is_free: List[dict]
 
 class EventStats(BaseModel):
     total_events: int
@@ -0,0 +1,267 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update, func, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.db.database import SessionLocal
+from app.db.models import Event, EventStatus, EventCounter, EventRegistration, RegistrationRequest
+from app.core.config import settings
+from app.services.background import PeriodicWorker
+from app.services.counter_service import counter_service
+from app.services.trending_service import trending_service
+from app.services.recommendation_service import recommendation_service
+from app.services.ticket_service import ticket_service
+from app.services.seating_service import seating_service
+from collections import Counter
+from typing import Any, Dict, Mapping, Optional, Sequence
+import logging
+
+logger = logging.getLogger(__name__)
+
+# First key of the per-event advisory lock held by the queue consumer
+ADMISSION_LOCK_KEY = 42001
+
+REGISTRATION_DETAIL_FIELDS = ("ticket_type", "special_requirements", "dietary_restrictions", "emergency_contact")
+
+class AdmissionQueueService:
+    """Admission queue for registrations to high-demand events
+
+    For events with use_admission_queue, a registration is a single INSERT
+    into registration_requests (no shared row is touched) and the id is
+    returned as a ticket. A consumer drains each event's queue in id
+    (FIFO) order, `batch_size` requests at a time: it locks the event's
+    seat count once, assigns seats and waitlist positions in Python and
+    writes all registrations with one multi-row INSERT. A per-event
+    advisory lock keeps a single consumer per event across workers.
+    """
+
+    def __init__(self, batch_size: int, interval: float):
+        self.batch_size = batch_size
+        self._worker = PeriodicWorker("admission-queue", interval, self.drain, run_on_stop=False)
+
+    def enqueue(self, db: Session, event_id: int, user_id: int, registration_data: dict) -> Optional[RegistrationRequest]:
+        """Queue a registration if the event uses the admission queue, else return None"""
+        requests = RegistrationRequest.__table__
+        details = {field: registration_data.get(field) for field in REGISTRATION_DETAIL_FIELDS}
+        ticket_id = db.execute(pg_insert(requests).from_select(
+            ["event_id", "user_id", "status", *details],
+            select(Event.id, literal(user_id), literal("pending"), *(literal(value) for value in details.values())).where(
+                Event.id == event_id,
+                Event.status == EventStatus.PUBLISHED,
+                Event.use_admission_queue == True,
+                ~seating_service.is_seated(Event.id)
+            )
+        ).returning(requests.c.id)).scalar()
+
+        if ticket_id is None:
+            db.rollback()
+            return None
+
+        db.commit()
+        self._worker.wake()
+        return db.get(RegistrationRequest, ticket_id)
+
+    def get_ticket(self, db: Session, ticket_id: int, user_id: int) -> Optional[RegistrationRequest]:
+        """Get a user's queued registration"""
+        return db.query(RegistrationRequest).filter(
+            RegistrationRequest.id == ticket_id,
+            RegistrationRequest.user_id == user_id
+        ).first()
+
+    def position(self, db: Session, ticket: RegistrationRequest) -> Optional[int]:
+        """Pending requests ahead of a ticket (None once processed)"""
+        if ticket.status != "pending":
+            return None
+        return db.query(func.count(RegistrationRequest.id)).filter(
+            RegistrationRequest.event_id == ticket.event_id,
+            RegistrationRequest.status == "pending",
+            RegistrationRequest.id < ticket.id
+        ).scalar()
+
+    def admit(self, db: Session, event_id: int, pending: Sequence[Mapping[str, Any]]) -> Dict[Any, Dict]:
+        """Register a batch of requests set-wise in list order, without committing
+
+        Each request maps id, user_id and the registration detail fields;
+        returns an outcome (status, and registration_id, waitlist_position
+        or detail) per request id.
+        """
+        event = db.query(Event.max_capacity, Event.allow_waitlist).filter(
+            Event.id == event_id,
+            Event.status == EventStatus.PUBLISHED
+        ).first()
+
+        registered_users = select(EventRegistration.user_id).where(
+            EventRegistration.event_id == event_id,
+            EventRegistration.user_id.in_({request["user_id"] for request in pending}),
+            EventRegistration.status != "cancelled"
+        )
+        registered = set(db.execute(registered_users).scalars())
+
+        # Lock order shared with direct registrations and cancellations: tier tickets,
+        # then the event's seat row, then registrations. Tickets for the whole batch
+        # are taken up front; unused ones are given back below
+        tiers = ticket_service.get_tiers(db, event_id) if event else {}
+        demand = Counter(
+            request["ticket_type"] for request in pending
+            if request["ticket_type"] in tiers and request["user_id"] not in registered
+        )
+        tickets = {name: ticket_service.take(db, tiers[name], quantity) for name, quantity in demand.items()}
+
+        # Lock the seat count for the batch; direct registrations and cancellations
+        # wait on the same row, so the registrations read below stay settled
+        counters = EventCounter.__table__
+        db.execute(pg_insert(counters).values(event_id=event_id, shard=0).on_conflict_do_nothing())
+        taken = db.execute(
+            select(counters.c.registrations_count).where(
+                counters.c.event_id == event_id,
+                counters.c.shard == 0
+            ).with_for_update()
+        ).scalar()
+        # Read again under the lock; the first read only sized the ticket demand
+        registered = set(db.execute(registered_users).scalars())
+        waiting = db.query(func.count(EventRegistration.id)).filter(
+            EventRegistration.event_id == event_id,
+            EventRegistration.status == "waitlisted"
+        ).scalar()
+
+        # Seats first, then waitlist positions, in ticket order
+        seats = None if not event or event.max_capacity is None else max(0, event.max_capacity - taken)
+        outcomes: Dict[int, Dict] = {}
+        admitted = []
+        for request in pending:
+            if not event:
+                outcome = {"status": "rejected", "detail": "Event not available"}
+            elif request["user_id"] in registered:
+                outcome = {"status": "rejected", "detail": "Already registered"}
+            elif tiers and request["ticket_type"] not in tiers:
+                outcome = {"status": "rejected", "detail": "Unknown ticket tier"}
+            elif tiers and not tickets.get(request["ticket_type"]):
+                outcome = {"status": "rejected", "detail": "Ticket tier sold out"}
+            elif seats is None or seats > 0:
+                outcome = {"status": "confirmed"}
+                seats = seats - 1 if seats is not None else None
+            elif event.allow_waitlist:
+                waiting += 1
+                outcome = {"status": "waitlisted", "waitlist_position": waiting}
+            else:
+                outcome = {"status": "rejected", "detail": "Event is full"}
+            outcomes[request["id"]] = outcome
+            if outcome["status"] != "rejected":
+                registered.add(request["user_id"])
+                admitted.append(request)
+                if tiers:
+                    tickets[request["ticket_type"]] -= 1
+
+        registration_ids = {}
+        if admitted:
+            registrations = EventRegistration.__table__
+            stmt = pg_insert(registrations)
+            # Cancelled registrations are reused, as in EventService.register_for_event;
+            # executemany keeps one cached statement whatever the batch size
+            rows = db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[registrations.c.event_id, registrations.c.user_id],
+                    set_={
+                        "status": stmt.excluded.status,
+                        "registration_date": func.now(),
+                        "price_paid": stmt.excluded.price_paid,
+                        **{field: stmt.excluded[field] for field in REGISTRATION_DETAIL_FIELDS}
+                    },
+                    where=registrations.c.status == "cancelled"
+                ).returning(registrations.c.id, registrations.c.user_id),
+                [{
+                    "event_id": event_id,
+                    "user_id": request["user_id"],
+                    "status": outcomes[request["id"]]["status"],
+                    "price_paid": tiers[request["ticket_type"]].price if tiers else None,
+                    **{field: request[field] for field in REGISTRATION_DETAIL_FIELDS}
+                } for request in admitted]
+            ).all()
+            registration_ids = {user_id: registration_id for registration_id, user_id in rows}
+
+        confirmed = 0
+        for request in admitted:
+            outcome = outcomes[request["id"]]
+            registration_id = registration_ids.get(request["user_id"])
+            if registration_id is None:
+                # Not expected with the seat row locked; kept as a safety net
+                outcomes[request["id"]] = {"status": "rejected", "detail": "Already registered"}
+                if tiers:
+                    tickets[request["ticket_type"]] += 1
+                continue
+            outcome["registration_id"] = registration_id
+            confirmed += outcome["status"] == "confirmed"
+
+        for name, unused in tickets.items():
+            ticket_service.give_back(db, tiers[name], unused)
+
+        if confirmed:
+            counter_service.increment(db, event_id, shard=0, registrations_count=confirmed)
+
+        recommendation_service.record_interactions(db, event_id, list(registration_ids))
+        if registration_ids:
+            trending_service.record(event_id, "registration", len(registration_ids))
+        return outcomes
+
+    def _admit_batch(self, db: Session, event_id: int) -> int:
+        """Admit the oldest pending requests of an event, without committing; returns requests processed"""
+        if not db.execute(select(func.pg_try_advisory_xact_lock(ADMISSION_LOCK_KEY, event_id))).scalar():
+            return 0
+
+        requests = RegistrationRequest.__table__
+        pending = db.execute(
+            select(requests).where(
+                requests.c.event_id == event_id,
+                requests.c.status == "pending"
+            ).order_by(requests.c.id).limit(self.batch_size)
+        ).mappings().all()
+        if not pending:
+            return 0
+
+        outcomes = self.admit(db, event_id, pending)
+        processed_at = db.execute(select(func.now())).scalar()
+        db.execute(update(RegistrationRequest), [{
+            "id": request_id,
+            "status": outcome["status"],
+            "registration_id": outcome.get("registration_id"),
+            "waitlist_position": outcome.get("waitlist_position"),
+            "detail": outcome.get("detail"),
+            "processed_at": processed_at
+        } for request_id, outcome in outcomes.items()])
+        return len(pending)
+
+    def drain_event(self, db: Session, event_id: int) -> int:
+        """Admit an event's pending requests batch by batch, returning requests processed"""
+        processed = 0
+        while True:
+            try:
+                batch = self._admit_batch(db, event_id)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Failed to admit registrations for event {event_id}: {str(e)}")
+                return processed
+            if not batch:
+                return processed
+            processed += batch
+
+    def drain(self) -> int:
+        """Drain every event queue with pending requests"""
+        db = SessionLocal()
+        try:
+            event_ids = db.execute(
+                select(RegistrationRequest.event_id).where(RegistrationRequest.status == "pending").distinct()
+            ).scalars().all()
+            db.commit()
+            return sum(self.drain_event(db, event_id) for event_id in event_ids)
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        """Start the queue consumer"""
+        self._worker.start()
+
+    def stop(self) -> None:
+        """Stop the queue consumer"""
+        self._worker.stop()
+
+# Create service instance
+admission_queue = AdmissionQueueService(settings.ADMISSION_QUEUE_BATCH_SIZE, settings.ADMISSION_QUEUE_INTERVAL_SECONDS)
@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
 from app.db.models import Event, Attendance, User
 from app.services.qr_service import qr_service
+from app.services.trending_service import trending_service
+from app.services.recommendation_service import recommendation_service
 from datetime import datetime
 from typing import List, Optional
 import uuid
@@ -142,7 +144,9 @@ class AttendanceService:
         # Record check-in
         attendance.check_in_time = datetime.utcnow()
         attendance.check_in_qr_scanned = True
+        recommendation_service.record_interaction(db, user_id, event_id)
         db.commit()
+        trending_service.record(event_id, "check_in")
         
         return {
             "message": "Check-in successful",
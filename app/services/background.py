@@ -0,0 +1,48 @@
+from typing import Callable, Optional
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+class PeriodicWorker:
+    """Daemon thread that runs a task every interval, or earlier when woken"""
+
+    def __init__(self, name: str, interval: float, task: Callable[[], object], run_on_stop: bool = True):
+        self.name = name
+        self.interval = interval
+        self.task = task
+        self.run_on_stop = run_on_stop
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            try:
+                self.task()
+            except Exception as e:
+                logger.error(f"Background task {self.name} failed: {str(e)}")
+
+    def wake(self) -> None:
+        """Run the task as soon as possible"""
+        self._wakeup.set()
+
+    def start(self) -> None:
+        """Start the worker thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the worker thread, then run the task one last time if run_on_stop"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 5)
+            self._thread = None
+        if self.run_on_stop:
+            self.task()
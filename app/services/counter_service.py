@@ -0,0 +1,127 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, delete, func, literal, values, column as column_, Integer, BigInteger
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.db.database import SessionLocal
+from app.db.models import Event, EventCounter
+from app.core.config import settings
+from app.services.background import PeriodicWorker
+from typing import Dict, List, Optional, Set
+import random
+import logging
+
+logger = logging.getLogger(__name__)
+
+COUNTER_COLUMNS = (
+    "views_count", "likes_count", "shares_count", "registrations_count",
+    "comments_count", "rating_sum", "rating_count"
+)
+
+class CounterService:
+    """Sharded event counters in event_counters
+
+    Increments are upserts into one of `shards` rows per event, so writers on
+    a popular event rarely wait on each other and never touch the events row.
+    Reads sum the shards (see Event.views_count etc.); a periodic compaction
+    folds the extra shards back into shard 0.
+    """
+
+    def __init__(self, shards: int, compact_interval: float):
+        self.shards = max(1, shards)
+        self._worker = PeriodicWorker("event-counters-compact", compact_interval, self.compact)
+
+    def pick_shard(self) -> int:
+        return random.randrange(self.shards)
+
+    def upsert_statement(self, rows: List[Dict[str, int]]):
+        """INSERT ... ON CONFLICT that adds the given deltas to counter rows"""
+        table = EventCounter.__table__
+        columns = sorted({column for row in rows for column in row if column in COUNTER_COLUMNS})
+        stmt = pg_insert(table).values([
+            {"event_id": row["event_id"], "shard": row.get("shard", 0), **{c: row.get(c, 0) for c in columns}}
+            for row in rows
+        ])
+        return stmt.on_conflict_do_update(
+            index_elements=[table.c.event_id, table.c.shard],
+            set_={column: table.c[column] + stmt.excluded[column] for column in columns}
+        )
+
+    def increment_from(self, source, column: str, delta: int, shard: Optional[int] = None):
+        """Upsert adding delta for every event_id produced by a CTE (e.g. INSERT ... RETURNING)"""
+        table = EventCounter.__table__
+        shard = self.pick_shard() if shard is None else shard
+        stmt = pg_insert(table).from_select(
+            ["event_id", "shard", column],
+            select(source.c.event_id, literal(shard), literal(delta))
+        )
+        return stmt.on_conflict_do_update(
+            index_elements=[table.c.event_id, table.c.shard],
+            set_={column: table.c[column] + stmt.excluded[column]}
+        ).returning(table.c.event_id).add_cte(source)
+
+    def increment(self, db: Session, event_id: int, shard: Optional[int] = None, **deltas: int) -> None:
+        """Add deltas (e.g. likes_count=1) to an event's counters, without committing"""
+        row = {"event_id": event_id, "shard": self.pick_shard() if shard is None else shard, **deltas}
+        db.execute(self.upsert_statement([row]))
+
+    def increment_many(self, db: Session, column: str, deltas: Dict[int, int], shard: Optional[int] = None) -> Set[int]:
+        """Add per-event deltas to one counter in a single upsert, without committing; returns event ids written
+
+        Deltas for events that no longer exist are skipped by the join on events.
+        """
+        if not deltas:
+            return set()
+        table = EventCounter.__table__
+        shard = self.pick_shard() if shard is None else shard
+        rows = values(
+            column_("event_id", Integer), column_("delta", BigInteger), name="deltas"
+        ).data(sorted(deltas.items()))
+        stmt = pg_insert(table).from_select(
+            ["event_id", "shard", column],
+            select(rows.c.event_id, literal(shard), rows.c.delta).join(Event, Event.id == rows.c.event_id)
+        )
+        return set(db.execute(stmt.on_conflict_do_update(
+            index_elements=[table.c.event_id, table.c.shard],
+            set_={column: table.c[column] + stmt.excluded[column]}
+        ).returning(table.c.event_id)).scalars().all())
+
+    def compact(self) -> int:
+        """Fold shards > 0 into shard 0 in one statement, returning events compacted"""
+        table = EventCounter.__table__
+        db = SessionLocal()
+        try:
+            moved = delete(table).where(table.c.shard > 0).returning(
+                table.c.event_id, *[table.c[column] for column in COUNTER_COLUMNS]
+            ).cte("moved")
+
+            totals = select(
+                moved.c.event_id,
+                literal(0).label("shard"),
+                *[func.sum(moved.c[column]).label(column) for column in COUNTER_COLUMNS]
+            ).group_by(moved.c.event_id)
+
+            stmt = pg_insert(table).from_select(["event_id", "shard", *COUNTER_COLUMNS], totals)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.event_id, table.c.shard],
+                set_={column: table.c[column] + stmt.excluded[column] for column in COUNTER_COLUMNS}
+            ).returning(table.c.event_id).add_cte(moved)
+
+            compacted = len(db.execute(stmt).all())
+            db.commit()
+            return compacted
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to compact event counters: {str(e)}")
+            return 0
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        """Start the periodic compaction"""
+        self._worker.start()
+
+    def stop(self) -> None:
+        """Stop the periodic compaction"""
+        self._worker.stop()
+
+# Create service instance
+counter_service = CounterService(settings.COUNTER_SHARDS, settings.COUNTER_COMPACT_INTERVAL_SECONDS)
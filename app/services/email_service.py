@@ -139,4 +139,39 @@ class EmailService:
             logger.error(f"Failed to send welcome email to {to_email}: {str(e)}")
             return False
 
+    def send_waitlist_promotion_email(self, to_email: str, event_title: str, user_name: str = None):
+        """Send a seat confirmation to a user promoted from an event waitlist"""
+        try:
+            msg = MIMEMultipart()
+            msg['From'] = self.from_email
+            msg['To'] = to_email
+            msg['Subject'] = f"You're in: {event_title}"
+
+            html_body = f"""
+            <html>
+            <body>
+                <h2>A seat opened up!</h2>
+                <p>Hello {user_name or 'there'},</p>
+                <p>A seat became available for <strong>{event_title}</strong> and your registration has been moved from the waitlist to confirmed.</p>
+                <p>If you can no longer attend, please cancel your registration so the next person on the waitlist can take your seat.</p>
+                <br>
+                <p>Best regards,<br>Event Organizer Team</p>
+            </body>
+            </html>
+            """
+
+            msg.attach(MIMEText(html_body, 'html'))
+
+            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
+                server.starttls()
+                server.login(self.smtp_username, self.smtp_password)
+                server.send_message(msg)
+
+            logger.info(f"Waitlist promotion email sent to {to_email}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to send waitlist promotion email to {to_email}: {str(e)}")
+            return False
+
 email_service = EmailService() 
\ No newline at end of file
@@ -0,0 +1,106 @@
+from pydantic import TypeAdapter
+from app.core.config import settings
+from app.core.http_cache import weak_etag
+from app.schemas.event import EventList
+from datetime import datetime, date, time, timedelta
+from typing import Dict, List, NamedTuple, Optional, Tuple, Any
+import threading
+
+event_list_adapter = TypeAdapter(List[EventList])
+
+class CachedList(NamedTuple):
+    body: bytes
+    etag: str
+    items: List[EventList]
+
+class EventListCache:
+    """In-memory cache of serialized event list responses (per worker)"""
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, int], Tuple[CachedList, datetime]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _next_date_boundary(self) -> datetime:
+        """Entries expire at midnight, when upcoming events may cross their start date"""
+        return datetime.combine(date.today() + timedelta(days=1), time.min)
+
+    def get(self, name: str, limit: int) -> Optional[CachedList]:
+        """Get the cached list (body, ETag, items), or None on miss"""
+        key = (name, limit)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > datetime.now():
+                self.hits += 1
+                return entry[0]
+            if entry:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, name: str, limit: int, items: List[EventList]) -> CachedList:
+        """Serialize and store a list, returning the cache entry"""
+        body = event_list_adapter.dump_json(items)
+        cached = CachedList(body, weak_etag(body), items)
+        with self._lock:
+            self._entries[(name, limit)] = (cached, self._next_date_boundary())
+        return cached
+
+    def invalidate(self) -> None:
+        """Drop all cached lists after an event write"""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit ratio statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+class TTLCache:
+    """Small in-memory cache whose entries expire after a fixed number of seconds"""
+
+    def __init__(self, ttl_seconds: int, max_entries: int = 1024):
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.max_entries = max_entries
+        self._entries: Dict[Any, Tuple[Any, datetime]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Get a cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > datetime.now():
+                return entry[0]
+            self._entries.pop(key, None)
+            return None
+
+    def set(self, key: Any, value: Any) -> None:
+        """Store a value, evicting the oldest entry when full"""
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (value, datetime.now() + self.ttl)
+
+    def delete(self, key: Any) -> None:
+        """Drop one entry"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+
+# Create cache instances
+event_list_cache = EventListCache()
+facet_cache = TTLCache(settings.FACET_CACHE_TTL_SECONDS)
@@ -1,9 +1,21 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc, asc
-from app.db.models import Event, EventRegistration, EventLike, EventComment, User, EventStatus, EventCategory
-from app.schemas.event import EventCreate, EventUpdate, EventSearchParams
+from sqlalchemy.orm import Session, undefer_group
+from sqlalchemy import and_, or_, func, desc, asc, tuple_, delete, update, select, case
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from app.db.models import Event, EventRegistration, EventLike, EventComment, User, EventStatus, EventCategory, EventTombstone, EventCounter, SeatSection, OrganizerFollow, OrganizerFollowerCount
+from app.schemas.event import EventCreate, EventUpdate, EventSearchParams, EventCommentCreate, EventCommentUpdate, EVENT_OUT_FIELDS
+from app.services.event_cache import event_list_cache, facet_cache
+from app.services.view_counter import view_counter
+from app.services.unique_viewers import unique_viewer_service
+from app.services.counter_service import counter_service
+from app.services.trending_service import trending_service
+from app.services.recommendation_service import recommendation_service
+from app.services.feed_service import feed_service
+from app.services.notification import notification_service
+from app.services.ticket_service import ticket_service
+from app.services.seating_service import seating_service
 from datetime import datetime, date, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import json
 
 class EventService:
@@ -31,17 +43,42 @@ class EventService:
         db.add(event)
         db.commit()
         db.refresh(event)
+        event_list_cache.invalidate()
         return event
     
     def get_event(self, db: Session, event_id: int) -> Optional[Event]:
         """Get event by ID"""
         return db.query(Event).filter(Event.id == event_id).first()
     
-    def get_events(self, db: Session, params: EventSearchParams) -> Dict[str, Any]:
-        """Get events with filtering and pagination"""
-        query = db.query(Event)
+    def parse_fields(self, fields: Optional[str]) -> Optional[List[str]]:
+        """Parse a comma separated sparse fieldset, always including id"""
+        if not fields:
+            return None
+        
+        requested = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in requested if f not in EVENT_OUT_FIELDS]
+        if unknown:
+            raise Exception(f"Unknown fields: {', '.join(unknown)}")
         
-        # Apply filters
+        return ["id"] + [f for f in dict.fromkeys(requested) if f != "id"]
+    
+    def get_events_by_ids(self, db: Session, event_ids: List[int], fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Get many events in one query, selecting only the requested columns"""
+        columns = [getattr(Event, f) for f in (fields or EVENT_OUT_FIELDS)]
+        rows = db.query(*columns).filter(Event.id.in_(event_ids)).all()
+        
+        events = {}
+        for row in rows:
+            data = dict(row._mapping)
+            if "gallery_urls" in data:
+                data["gallery_urls"] = data["gallery_urls"].split(',') if data["gallery_urls"] else None
+            events[data["id"]] = data
+        
+        # Keep the caller's ordering
+        return [events[event_id] for event_id in event_ids if event_id in events]
+    
+    def _apply_filters(self, query, params: EventSearchParams):
+        """Apply search filters shared by the listing and facet queries"""
         if params.search:
             search_term = f"%{params.search}%"
             query = query.filter(
@@ -76,6 +113,52 @@ class EventService:
         if params.organizer_id:
             query = query.filter(Event.organizer_id == params.organizer_id)
         
+        return query
+    
+    def get_user_event_state(self, db: Session, user_id: int, event_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Get the user's like/registration flags for many events (one query per relation)"""
+        states = {
+            event_id: {"liked_by_me": False, "registered_by_me": False, "my_registration_status": None}
+            for event_id in event_ids
+        }
+        if not event_ids:
+            return states
+        
+        liked = db.query(EventLike.event_id).filter(
+            EventLike.user_id == user_id,
+            EventLike.event_id.in_(event_ids)
+        ).all()
+        for (event_id,) in liked:
+            states[event_id]["liked_by_me"] = True
+        
+        # Latest registration wins when a user re-registered after cancelling
+        registrations = db.query(EventRegistration.event_id, EventRegistration.status).filter(
+            EventRegistration.user_id == user_id,
+            EventRegistration.event_id.in_(event_ids)
+        ).order_by(EventRegistration.id).all()
+        for event_id, registration_status in registrations:
+            states[event_id]["registered_by_me"] = registration_status != "cancelled"
+            states[event_id]["my_registration_status"] = registration_status
+        
+        return states
+    
+    def get_events(self, db: Session, params: EventSearchParams) -> Dict[str, Any]:
+        """Get events with filtering and pagination"""
+        query = self._apply_filters(db.query(Event), params)
+        
+        # One card per series: its first matching occurrence, ranked by window functions
+        series_occurrences = {}
+        if params.collapse_series:
+            card = case((Event.series_id.is_(None), -Event.id), else_=Event.series_id)
+            ranked = self._apply_filters(db.query(
+                Event.id,
+                func.row_number().over(
+                    partition_by=card, order_by=(Event.start_date, Event.start_time, Event.id)
+                ).label("occurrence_rank"),
+                func.count().over(partition_by=card).label("occurrences")
+            ), params).subquery()
+            query = db.query(Event, ranked.c.occurrences).join(ranked, ranked.c.id == Event.id).filter(ranked.c.occurrence_rank == 1)
+        
         # Apply sorting
         if params.sort_order.lower() == "desc":
             query = query.order_by(desc(getattr(Event, params.sort_by)))
@@ -89,14 +172,85 @@ class EventService:
         offset = (params.page - 1) * params.limit
         events = query.offset(offset).limit(params.limit).all()
         
+        if params.collapse_series:
+            series_occurrences = {event.id: occurrences for event, occurrences in events if event.series_id is not None}
+            events = [event for event, _ in events]
+        
         return {
             "events": events,
+            "series_occurrences": series_occurrences,
             "total": total,
             "page": params.page,
             "limit": params.limit,
             "pages": (total + params.limit - 1) // params.limit
         }
     
+    def get_changes(self, db: Session, since: int, limit: int = 500) -> Dict[str, Any]:
+        """Get events changed or deleted after a change_seq cursor, in change order"""
+        # Stop below changes of still-running transactions, which may commit lower
+        # sequence values than ones already visible (events_change_horizon)
+        horizon = db.execute(select(func.events_change_horizon())).scalar()
+        updated = db.query(Event).filter(
+            Event.change_seq > since,
+            Event.change_seq < horizon
+        ).order_by(Event.change_seq).limit(limit + 1).all()
+        
+        deleted = db.query(EventTombstone.event_id, EventTombstone.change_seq).filter(
+            EventTombstone.change_seq > since,
+            EventTombstone.change_seq < horizon
+        ).order_by(EventTombstone.change_seq).limit(limit + 1).all()
+        
+        # Merge both streams by sequence and cut at the page size
+        merged = sorted(
+            [(e.change_seq, e) for e in updated] + [(t.change_seq, t.event_id) for t in deleted],
+            key=lambda item: item[0]
+        )
+        page = merged[:limit]
+        
+        return {
+            "changes": [item for _, item in page if isinstance(item, Event)],
+            "deleted": [item for _, item in page if not isinstance(item, Event)],
+            "cursor": page[-1][0] if page else since,
+            "has_more": len(merged) > limit
+        }
+    
+    def get_facets(self, db: Session, params: EventSearchParams) -> Dict[str, Any]:
+        """Get category/city/online/free counts for a filter set in one grouped query"""
+        signature = params.model_dump_json(exclude={"page", "limit", "sort_by", "sort_order"})
+        cached = facet_cache.get(signature)
+        if cached is not None:
+            return cached
+        
+        facet_columns = [Event.category, Event.city, Event.is_online, Event.is_free]
+        query = db.query(
+            *facet_columns,
+            *[func.grouping(column).label(f"g_{column.key}") for column in facet_columns],
+            func.count(Event.id).label("count")
+        )
+        query = self._apply_filters(query, params).group_by(
+            func.grouping_sets(*[column for column in facet_columns], tuple_())
+        )
+        
+        facets = {"total": 0, "category": [], "city": [], "is_online": [], "is_free": []}
+        for row in query.all():
+            grouped = [name for name in ("category", "city", "is_online", "is_free") if getattr(row, f"g_{name}") == 0]
+            if not grouped:
+                facets["total"] = row.count
+                continue
+            
+            name = grouped[0]
+            value = getattr(row, name)
+            facets[name].append({
+                "value": value.value if isinstance(value, EventCategory) else value,
+                "count": row.count
+            })
+        
+        for name in ("category", "city", "is_online", "is_free"):
+            facets[name].sort(key=lambda item: item["count"], reverse=True)
+        
+        facet_cache.set(signature, facets)
+        return facets
+    
     def update_event(self, db: Session, event_id: int, event_data: EventUpdate, user_id: int) -> Optional[Event]:
         """Update event"""
         event = db.query(Event).filter(
@@ -112,16 +266,29 @@ class EventService:
         if 'gallery_urls' in update_data and update_data['gallery_urls']:
             update_data['gallery_urls'] = json.dumps(update_data['gallery_urls'])
         
+        # Set published_at if status changes to published
+        publishing = update_data.get('status') == EventStatus.PUBLISHED and event.status != EventStatus.PUBLISHED
+        
+        # Promote waitlisted registrations if capacity grows
+        capacity_grows = 'max_capacity' in update_data and event.max_capacity is not None and (
+            update_data['max_capacity'] is None or update_data['max_capacity'] > event.max_capacity
+        )
+        
         # Update fields
         for field, value in update_data.items():
             setattr(event, field, value)
         
-        # Set published_at if status changes to published
-        if update_data.get('status') == EventStatus.PUBLISHED and event.status != EventStatus.PUBLISHED:
+        if publishing:
             event.published_at = datetime.utcnow()
+            feed_service.fan_out(db, event)
+        
+        if capacity_grows:
+            db.flush()
+            self.promote_waitlisted(db, event_id)
         
         db.commit()
         db.refresh(event)
+        event_list_cache.invalidate()
         return event
     
     def delete_event(self, db: Session, event_id: int, user_id: int) -> bool:
@@ -136,6 +303,7 @@ class EventService:
         
         db.delete(event)
         db.commit()
+        event_list_cache.invalidate()
         return True
     
     def publish_event(self, db: Session, event_id: int, user_id: int) -> Optional[Event]:
@@ -148,70 +316,308 @@ class EventService:
         if not event:
             return None
         
+        # Publishing again keeps published_at, which orders timelines and feeds
+        if event.status == EventStatus.PUBLISHED:
+            return event
+        
         event.status = EventStatus.PUBLISHED
         event.published_at = datetime.utcnow()
+        feed_service.fan_out(db, event)
         
         db.commit()
         db.refresh(event)
+        event_list_cache.invalidate()
         return event
     
-    def increment_views(self, db: Session, event_id: int) -> bool:
-        """Increment event views count"""
-        event = db.query(Event).filter(Event.id == event_id).first()
-        if not event:
+    def event_revision(self, event) -> str:
+        """Revision of an event (or row) for ETags: version plus non-view counters"""
+        return f"{event.version}.{event.likes_count}.{event.shares_count}.{event.current_registrations}"
+    
+    def get_event_revision(self, db: Session, event_id: int) -> Optional[str]:
+        """Get event revision without loading the event"""
+        row = db.query(
+            Event.version, Event.likes_count, Event.shares_count, Event.current_registrations
+        ).filter(Event.id == event_id).first()
+        return self.event_revision(row) if row else None
+    
+    def increment_views(self, db: Session, event_id: int, user_id: Optional[int] = None) -> bool:
+        """Increment event views count (buffered, written in batches by view_counter)"""
+        view_counter.record(event_id)
+        trending_service.record(event_id, "view")
+        if user_id is not None:
+            unique_viewer_service.record(event_id, user_id)
+        return True
+    
+    def like_event(self, db: Session, event_id: int, user_id: int) -> bool:
+        """Like an event (insert and counter update in one statement)"""
+        likes = EventLike.__table__
+        inserted = pg_insert(likes).values(
+            event_id=event_id,
+            user_id=user_id
+        ).on_conflict_do_nothing(
+            index_elements=[likes.c.event_id, likes.c.user_id]
+        ).returning(likes.c.event_id).cte("inserted")
+        
+        # Only counts when the like was actually inserted
+        try:
+            result = db.execute(counter_service.increment_from(inserted, "likes_count", 1)).first()
+            if result is not None:
+                recommendation_service.record_interaction(db, user_id, event_id)
+        except IntegrityError:
+            # Event does not exist
+            db.rollback()
             return False
         
-        event.views_count += 1
         db.commit()
-        return True
+        if result is not None:
+            trending_service.record(event_id, "like")
+        return result is not None
     
-    def like_event(self, db: Session, event_id: int, user_id: int) -> bool:
-        """Like an event"""
-        # Check if already liked
-        existing_like = db.query(EventLike).filter(
-            EventLike.event_id == event_id,
-            EventLike.user_id == user_id
+    def unlike_event(self, db: Session, event_id: int, user_id: int) -> bool:
+        """Unlike an event (delete and counter update in one statement)"""
+        likes = EventLike.__table__
+        deleted = delete(likes).where(
+            likes.c.event_id == event_id,
+            likes.c.user_id == user_id
+        ).returning(likes.c.event_id).cte("deleted")
+        
+        result = db.execute(counter_service.increment_from(deleted, "likes_count", -1)).first()
+        db.commit()
+        if result is not None:
+            trending_service.record(event_id, "like", -1)
+        return result is not None
+    
+    def reserve_seat(self, db: Session, event_id: int, seats: int = 1) -> bool:
+        """Take seats if the event has capacity left (one conditional UPDATE, without committing)"""
+        counters = EventCounter.__table__
+        events = Event.__table__
+        # Registrations are counted on shard 0 only, so that row is the seat count
+        db.execute(pg_insert(counters).values(event_id=event_id, shard=0).on_conflict_do_nothing())
+        reserved = db.execute(
+            update(counters).values(
+                registrations_count=counters.c.registrations_count + seats
+            ).where(
+                counters.c.event_id == event_id,
+                counters.c.shard == 0,
+                events.c.id == counters.c.event_id,
+                or_(events.c.max_capacity.is_(None), counters.c.registrations_count + seats <= events.c.max_capacity)
+            ).returning(counters.c.registrations_count)
+        ).first()
+        return reserved is not None
+    
+    def _lock_seat_row(self, db: Session, event_id: int) -> None:
+        """Lock the event's seat count row (creating it if needed), without committing"""
+        counters = EventCounter.__table__
+        db.execute(pg_insert(counters).values(event_id=event_id, shard=0).on_conflict_do_nothing())
+        db.execute(select(counters.c.event_id).where(
+            counters.c.event_id == event_id,
+            counters.c.shard == 0
+        ).with_for_update())
+    
+    def _insert_registration(self, db: Session, event_id: int, user_id: int, registration_data: dict, status: str = "confirmed") -> Optional[int]:
+        """Insert a registration (confirmed by default), returning its id (None if already registered)"""
+        # Duplicates are rejected by the (event_id, user_id) unique constraint;
+        # a cancelled registration is reused (and joins the back of the waitlist)
+        registrations = EventRegistration.__table__
+        stmt = pg_insert(registrations).values(
+            event_id=event_id,
+            user_id=user_id,
+            status=status,
+            **registration_data
+        )
+        return db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[registrations.c.event_id, registrations.c.user_id],
+                set_={
+                    "status": stmt.excluded.status,
+                    "registration_date": func.now(),
+                    **{field: stmt.excluded[field] for field in registration_data}
+                },
+                where=registrations.c.status == "cancelled"
+            ).returning(registrations.c.id)
+        ).scalar()
+    
+    def register_for_event(self, db: Session, event_id: int, user_id: int, registration_data: dict) -> Optional[EventRegistration]:
+        """Register user for an event (confirmed while seats last, then waitlisted)"""
+        # Check if event exists and is published; seated events register through seat holds
+        event = db.query(Event.id, Event.allow_waitlist).filter(
+            Event.id == event_id,
+            Event.status == EventStatus.PUBLISHED,
+            ~seating_service.is_seated(Event.id)
         ).first()
         
-        if existing_like:
-            return False
+        if not event:
+            return None
         
-        # Create like
-        like = EventLike(event_id=event_id, user_id=user_id)
-        db.add(like)
+        # Events with ticket tiers sell per tier: ticket_type must name one
+        tier = None
+        tiers = ticket_service.get_tiers(db, event_id)
+        if tiers:
+            tier = tiers.get(registration_data.get("ticket_type"))
+            if not tier:
+                return None
+            registration_data = {**registration_data, "price_paid": tier.price}
         
-        # Increment likes count
-        event = db.query(Event).filter(Event.id == event_id).first()
-        if event:
-            event.likes_count += 1
+        # Repeated submits are turned away before touching shared rows; the insert below decides
+        if db.query(EventRegistration.id).filter(
+            EventRegistration.event_id == event_id,
+            EventRegistration.user_id == user_id,
+            EventRegistration.status != "cancelled"
+        ).first():
+            return None
+        
+        # Lock order shared with admission batches and cancellations: tier ticket,
+        # then the event's seat row, then the registration. A sold-out tier never
+        # touches the seat row, and batches holding the seat row see a settled list
+        if tier and not ticket_service.take(db, tier):
+            db.rollback()
+            return None
+        
+        self._lock_seat_row(db, event_id)
+        status = "confirmed"
+        if not self.reserve_seat(db, event_id):
+            if not event.allow_waitlist:
+                db.rollback()
+                return None
+            status = "waitlisted"
+        
+        registration_id = self._insert_registration(db, event_id, user_id, registration_data, status)
+        if registration_id is None:
+            db.rollback()
+            return None
+        recommendation_service.record_interaction(db, user_id, event_id)
         
         db.commit()
-        return True
+        trending_service.record(event_id, "registration")
+        return db.get(EventRegistration, registration_id)
     
-    def unlike_event(self, db: Session, event_id: int, user_id: int) -> bool:
-        """Unlike an event"""
-        like = db.query(EventLike).filter(
-            EventLike.event_id == event_id,
-            EventLike.user_id == user_id
+    def confirm_seat_hold(self, db: Session, hold_id: int, user_id: int, registration_data: dict) -> Optional[EventRegistration]:
+        """Turn a user's live seat hold into a confirmed registration for its seats"""
+        hold = seating_service.lock_live_hold(db, hold_id, user_id)
+        if not hold:
+            return None
+        
+        section = db.get(SeatSection, hold.section_id)
+        registration_data = {
+            **registration_data,
+            "ticket_type": registration_data.get("ticket_type") or section.name,
+            "price_paid": section.price * hold.seat_count
+        }
+        # Seated events count seats, so capacity (the seat count) matches the map;
+        # the seat row is taken before the registration, as in register_for_event
+        if not self.reserve_seat(db, hold.event_id, hold.seat_count):
+            db.rollback()
+            return None
+        registration_id = self._insert_registration(db, hold.event_id, user_id, registration_data)
+        if registration_id is None:
+            db.rollback()
+            return None
+        hold.status = "confirmed"
+        hold.registration_id = registration_id
+        recommendation_service.record_interaction(db, user_id, hold.event_id)
+        
+        db.commit()
+        trending_service.record(hold.event_id, "registration")
+        return db.get(EventRegistration, registration_id)
+    
+    def promote_waitlisted(self, db: Session, event_id: int) -> int:
+        """Confirm the oldest waitlisted registrations while seats are free, without committing"""
+        counters = EventCounter.__table__
+        registrations = EventRegistration.__table__
+        
+        # Lock the seat count so concurrent registrations and promotions wait
+        db.execute(pg_insert(counters).values(event_id=event_id, shard=0).on_conflict_do_nothing())
+        seats = db.execute(
+            select(counters.c.registrations_count, Event.max_capacity).join(
+                Event, Event.id == counters.c.event_id
+            ).where(
+                counters.c.event_id == event_id,
+                counters.c.shard == 0
+            ).with_for_update(of=counters)
+        ).first()
+        if not seats:
+            return 0
+        free = None if seats.max_capacity is None else seats.max_capacity - seats.registrations_count
+        if free is not None and free <= 0:
+            return 0
+        
+        # Index range scan of the waitlist in (registration_date, id) order
+        picked = select(registrations.c.id).where(
+            registrations.c.event_id == event_id,
+            registrations.c.status == "waitlisted"
+        ).order_by(
+            registrations.c.registration_date, registrations.c.id
+        ).limit(free).with_for_update(skip_locked=True).cte("picked")
+        
+        promoted = update(registrations).where(
+            registrations.c.id.in_(select(picked.c.id))
+        ).values(status="confirmed").returning(
+            registrations.c.id, registrations.c.user_id, registrations.c.event_id
+        ).cte("promoted")
+        
+        # Notifications are queued in the same transaction and sent by the outbox worker
+        promoted_count = len(db.execute(
+            notification_service.enqueue_from(promoted, "waitlist_promoted").add_cte(picked)
+        ).all())
+        if promoted_count:
+            counter_service.increment(db, event_id, shard=0, registrations_count=promoted_count)
+            notification_service.wake()
+        return promoted_count
+    
+    def cancel_registration(self, db: Session, event_id: int, user_id: int) -> Optional[Tuple[EventRegistration, int]]:
+        """Cancel a registration, promoting from the waitlist if a seat was freed; returns (registration, promoted)"""
+        ticket_type = db.query(EventRegistration.ticket_type).filter(
+            EventRegistration.event_id == event_id,
+            EventRegistration.user_id == user_id,
+            EventRegistration.status.in_(("confirmed", "waitlisted"))
         ).first()
         
-        if not like:
-            return False
+        if not ticket_type:
+            return None
         
-        db.delete(like)
+        # Same lock order as registering: the tier ticket (held while registered,
+        # also when waitlisted), then the event's seat row, then the registration
+        tier = ticket_service.get_tiers(db, event_id).get(ticket_type.ticket_type)
+        if tier:
+            ticket_service.give_back(db, tier)
+        self._lock_seat_row(db, event_id)
         
-        # Decrement likes count
-        event = db.query(Event).filter(Event.id == event_id).first()
-        if event and event.likes_count > 0:
-            event.likes_count -= 1
+        registration = db.query(EventRegistration).filter(
+            EventRegistration.event_id == event_id,
+            EventRegistration.user_id == user_id,
+            EventRegistration.status.in_(("confirmed", "waitlisted"))
+        ).populate_existing().with_for_update().first()
+        
+        # Cancelled (or its ticket changed) concurrently
+        if not registration or registration.ticket_type != ticket_type.ticket_type:
+            db.rollback()
+            return None
+        
+        # Reserved seats go back to the seat map
+        seats = 1
+        hold = seating_service.get_registration_hold(db, registration.id)
+        if hold:
+            seating_service.release(db, hold)
+            seats = hold.seat_count
+        
+        promoted = 0
+        if registration.status == "confirmed":
+            counter_service.increment(db, event_id, shard=0, registrations_count=-seats)
+            promoted = self.promote_waitlisted(db, event_id)
+        registration.status = "cancelled"
         
         db.commit()
-        return True
+        return registration, promoted
     
-    def register_for_event(self, db: Session, event_id: int, user_id: int, registration_data: dict) -> Optional[EventRegistration]:
-        """Register user for an event"""
-        # Check if event exists and is published
-        event = db.query(Event).filter(
+    def _rating_deltas(self, old_rating: Optional[int], new_rating: Optional[int]) -> Dict[str, int]:
+        return {
+            "rating_sum": (new_rating or 0) - (old_rating or 0),
+            "rating_count": (new_rating is not None) - (old_rating is not None)
+        }
+    
+    def add_comment(self, db: Session, event_id: int, user_id: int, comment_data: EventCommentCreate) -> Optional[EventComment]:
+        """Add a comment (aggregates updated in the same transaction)"""
+        event = db.query(Event.id).filter(
             Event.id == event_id,
             Event.status == EventStatus.PUBLISHED
         ).first()
@@ -219,37 +625,135 @@ class EventService:
         if not event:
             return None
         
-        # Check if already registered
-        existing_registration = db.query(EventRegistration).filter(
-            EventRegistration.event_id == event_id,
-            EventRegistration.user_id == user_id
-        ).first()
+        comment = EventComment(
+            event_id=event_id,
+            user_id=user_id,
+            **comment_data.model_dump(exclude={"event_id"})
+        )
+        db.add(comment)
+        counter_service.increment(db, event_id, comments_count=1, **self._rating_deltas(None, comment.rating))
         
-        if existing_registration:
+        db.commit()
+        db.refresh(comment)
+        return comment
+    
+    def update_comment(self, db: Session, comment_id: int, user_id: int, comment_data: EventCommentUpdate) -> Optional[EventComment]:
+        """Update own comment (rating change applied to the aggregates atomically)"""
+        comment = db.query(EventComment).filter(
+            EventComment.id == comment_id,
+            EventComment.user_id == user_id
+        ).with_for_update().first()
+        
+        if not comment:
             return None
         
-        # Check capacity
-        if event.max_capacity and event.current_registrations >= event.max_capacity:
-            if not event.allow_waitlist:
-                return None
-            registration_data['status'] = 'waitlisted'
+        old_rating = comment.rating
+        for field, value in comment_data.model_dump(exclude_unset=True).items():
+            setattr(comment, field, value)
         
-        # Create registration
-        registration = EventRegistration(
-            event_id=event_id,
-            user_id=user_id,
-            **registration_data
+        if comment.rating != old_rating:
+            counter_service.increment(db, comment.event_id, **self._rating_deltas(old_rating, comment.rating))
+        
+        db.commit()
+        db.refresh(comment)
+        return comment
+    
+    def delete_comment(self, db: Session, comment_id: int, user_id: int) -> bool:
+        """Delete own comment (aggregates updated in the same transaction)"""
+        comment = db.query(EventComment).filter(
+            EventComment.id == comment_id,
+            EventComment.user_id == user_id
+        ).with_for_update().first()
+        
+        if not comment:
+            return False
+        
+        counter_service.increment(db, comment.event_id, comments_count=-1, **self._rating_deltas(comment.rating, None))
+        db.delete(comment)
+        db.commit()
+        return True
+    
+    def get_comments(self, db: Session, event_id: int, limit: int = 20, cursor: Optional[int] = None) -> Tuple[List[Tuple[EventComment, str]], Optional[int]]:
+        """Get approved comments newest first, keyset-paginated on id"""
+        query = db.query(EventComment, User.full_name).join(
+            User, User.id == EventComment.user_id
+        ).filter(
+            EventComment.event_id == event_id,
+            EventComment.is_approved == True
         )
+        if cursor is not None:
+            query = query.filter(EventComment.id < cursor)
         
-        db.add(registration)
+        rows = query.order_by(desc(EventComment.id)).limit(limit + 1).all()
+        next_cursor = rows[limit - 1][0].id if len(rows) > limit else None
+        return rows[:limit], next_cursor
+    
+    def get_comment_stats(self, db: Session, event_id: int) -> Optional[Dict[str, Any]]:
+        """Get comment count and average rating from the maintained aggregates"""
+        row = db.query(Event.comments_count, Event.rating_sum, Event.rating_count).filter(
+            Event.id == event_id
+        ).first()
         
-        # Update event registration count
-        if registration.status == 'confirmed':
-            event.current_registrations += 1
+        if not row:
+            return None
         
-        db.commit()
-        db.refresh(registration)
-        return registration
+        return {
+            "comments_count": row.comments_count,
+            "rating_count": row.rating_count,
+            "average_rating": round(row.rating_sum / row.rating_count, 2) if row.rating_count else None
+        }
+    
+    def get_event_page(self, db: Session, event_id: int, user_id: int, comments_limit: int = 10) -> Optional[Dict[str, Any]]:
+        """Everything the event detail screen shows, in two queries (event with state, then comments)"""
+        my_registration_status = select(EventRegistration.status).where(
+            EventRegistration.event_id == Event.id,
+            EventRegistration.user_id == user_id
+        ).order_by(desc(EventRegistration.id)).limit(1).scalar_subquery()
+        organizer_events = select(func.count(Event.id)).where(
+            Event.organizer_id == User.id,
+            Event.status == EventStatus.PUBLISHED
+        ).correlate(User).scalar_subquery()
+        
+        row = db.query(
+            Event,
+            User.full_name.label("organizer_full_name"),
+            func.coalesce(OrganizerFollowerCount.followers_count, 0).label("followers_count"),
+            organizer_events.label("organizer_events"),
+            select(OrganizerFollow.follower_id).where(
+                OrganizerFollow.organizer_id == Event.organizer_id,
+                OrganizerFollow.follower_id == user_id
+            ).exists().label("following"),
+            select(EventLike.id).where(
+                EventLike.event_id == Event.id,
+                EventLike.user_id == user_id
+            ).exists().label("liked"),
+            my_registration_status.label("registration_status")
+        ).join(
+            User, User.id == Event.organizer_id
+        ).outerjoin(
+            OrganizerFollowerCount, OrganizerFollowerCount.organizer_id == Event.organizer_id
+        ).options(undefer_group("comments")).filter(Event.id == event_id).first()
+        
+        if not row:
+            return None
+        
+        event = row.Event
+        comments, next_cursor = self.get_comments(db, event_id, comments_limit)
+        return {
+            "event": event,
+            "organizer": {
+                "id": event.organizer_id,
+                "name": event.organizer_name or row.organizer_full_name,
+                "published_events": row.organizer_events,
+                "followers_count": row.followers_count,
+                "followed_by_me": row.following
+            },
+            "liked_by_me": row.liked,
+            "registered_by_me": row.registration_status is not None and row.registration_status != "cancelled",
+            "my_registration_status": row.registration_status,
+            "comments": comments,
+            "next_cursor": next_cursor
+        }
     
     def get_event_analytics(self, db: Session, event_id: int) -> Dict[str, Any]:
         """Get comprehensive analytics for an event"""
@@ -267,16 +771,8 @@ class EventService:
         attendances = db.query(Event).filter(Event.id == event_id).first().attendances
         total_attendances = len([a for a in attendances if a.check_in_qr_scanned])
         
-        # Get rating stats
-        comments = db.query(EventComment).filter(
-            EventComment.event_id == event_id,
-            EventComment.rating.isnot(None)
-        ).all()
-        
-        average_rating = None
-        if comments:
-            total_rating = sum(c.rating for c in comments)
-            average_rating = total_rating / len(comments)
+        # Get rating stats (maintained aggregates)
+        average_rating = event.average_rating
         
         # Calculate rates
         registration_rate = 0
@@ -293,7 +789,8 @@ class EventService:
         return {
             "event_id": event_id,
             "event_title": event.title,
-            "total_views": event.views_count,
+            "total_views": event.views_count + view_counter.pending(event_id),
+            **unique_viewer_service.get_event_stats(db, event_id),
             "total_likes": event.likes_count,
             "total_shares": event.shares_count,
             "total_registrations": total_registrations,
@@ -303,7 +800,7 @@ class EventService:
             "registration_rate": round(registration_rate, 2),
             "attendance_rate": round(attendance_rate, 2),
             "average_rating": round(average_rating, 2) if average_rating else None,
-            "total_comments": len(comments),
+            "total_comments": event.comments_count,
             "revenue": revenue,
             "created_at": event.created_at
         }
@@ -328,16 +825,15 @@ class EventService:
         # Revenue stats
         total_revenue = sum(e.price * e.current_registrations for e in events if not e.is_free)
         
-        # Rating stats
-        all_comments = db.query(EventComment).filter(EventComment.rating.isnot(None))
+        # Rating stats (maintained aggregates)
+        rating_totals = db.query(func.sum(EventCounter.rating_sum), func.sum(EventCounter.rating_count))
         if user_id:
-            all_comments = all_comments.join(Event).filter(Event.organizer_id == user_id)
+            rating_totals = rating_totals.join(Event, Event.id == EventCounter.event_id).filter(Event.organizer_id == user_id)
         
-        comments = all_comments.all()
+        rating_sum, rating_count = rating_totals.one()
         average_rating = None
-        if comments:
-            total_rating = sum(c.rating for c in comments)
-            average_rating = total_rating / len(comments)
+        if rating_count:
+            average_rating = float(rating_sum) / float(rating_count)
         
         # Category stats
         category_counts = {}
@@ -378,6 +874,20 @@ class EventService:
             Event.is_active == True
         ).order_by(desc(Event.views_count)).limit(limit).all()
     
+    def get_trending_events(self, db: Session, limit: int = 50) -> List[Tuple[Event, float]]:
+        """Get trending events with their scores, in ranking order"""
+        # Over-fetch so unpublished events in the ranking don't shorten the page
+        ranked = trending_service.top(limit * 2)
+        events = {
+            event.id: event
+            for event in db.query(Event).filter(
+                Event.id.in_([event_id for event_id, _ in ranked]),
+                Event.status == EventStatus.PUBLISHED,
+                Event.is_active == True
+            )
+        }
+        return [(events[event_id], score) for event_id, score in ranked if event_id in events][:limit]
+    
     def get_upcoming_events(self, db: Session, limit: int = 10) -> List[Event]:
         """Get upcoming events"""
         today = date.today()
@@ -0,0 +1,167 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, delete, update, literal, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.db.models import Event, EventStatus, User, OrganizerFollow, OrganizerFollowerCount, UserTimelineEntry
+from app.core.config import settings
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+class FeedService:
+    """Follow-organizer feeds
+
+    Publishing an event copies it into every follower's timeline
+    (fan-out on write), so reading a feed is one range scan of
+    user_timelines. Events of organizers with more than
+    `fanout_max_followers` followers are skipped at publish time and merged
+    in at read time from the events index instead (fan-out on read). The
+    mode is recorded on the event when it is published, so an organizer
+    crossing the threshold later does not hide events published before.
+    """
+
+    def __init__(self, fanout_max_followers: int, backfill_events: int):
+        self.fanout_max_followers = fanout_max_followers
+        self.backfill_events = backfill_events
+
+    def _followers_count(self, db: Session, organizer_id: int) -> int:
+        return db.query(OrganizerFollowerCount.followers_count).filter(
+            OrganizerFollowerCount.organizer_id == organizer_id
+        ).scalar() or 0
+
+    def is_fan_out_on_read(self, db: Session, organizer_id: int) -> bool:
+        """Whether an organizer's events are read on demand instead of fanned out"""
+        return self._followers_count(db, organizer_id) > self.fanout_max_followers
+
+    def _add_followers(self, db: Session, organizer_id: int, delta: int) -> None:
+        counts = OrganizerFollowerCount.__table__
+        stmt = pg_insert(counts).values(organizer_id=organizer_id, followers_count=delta)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[counts.c.organizer_id],
+            set_={"followers_count": counts.c.followers_count + stmt.excluded.followers_count}
+        ))
+
+    def _timeline_rows(self, rows):
+        """INSERT ... SELECT of timeline rows, ignoring ones already present"""
+        timelines = UserTimelineEntry.__table__
+        return pg_insert(timelines).from_select(
+            ["user_id", "event_id", "organizer_id", "published_at"],
+            rows
+        ).on_conflict_do_nothing(index_elements=[timelines.c.user_id, timelines.c.event_id])
+
+    def follow(self, db: Session, follower_id: int, organizer_id: int) -> bool:
+        """Follow an organizer and backfill their recent events into the timeline"""
+        if follower_id == organizer_id or not db.query(User.id).filter(User.id == organizer_id).first():
+            return False
+
+        follows = OrganizerFollow.__table__
+        inserted = db.execute(
+            pg_insert(follows).values(follower_id=follower_id, organizer_id=organizer_id)
+            .on_conflict_do_nothing().returning(follows.c.follower_id)
+        ).first()
+        if not inserted:
+            return False
+
+        self._add_followers(db, organizer_id, 1)
+        # Events read on demand reach the feed without a timeline row
+        recent = select(
+            literal(follower_id), Event.id, Event.organizer_id, Event.published_at
+        ).where(
+            Event.organizer_id == organizer_id,
+            Event.status == EventStatus.PUBLISHED,
+            Event.published_at.isnot(None),
+            Event.feed_on_read == False
+        ).order_by(Event.published_at.desc()).limit(self.backfill_events)
+        db.execute(self._timeline_rows(recent))
+
+        db.commit()
+        return True
+
+    def unfollow(self, db: Session, follower_id: int, organizer_id: int) -> bool:
+        """Unfollow an organizer and drop their events from the timeline"""
+        deleted = db.execute(
+            delete(OrganizerFollow.__table__).where(
+                OrganizerFollow.follower_id == follower_id,
+                OrganizerFollow.organizer_id == organizer_id
+            ).returning(OrganizerFollow.follower_id)
+        ).first()
+        if not deleted:
+            return False
+
+        self._add_followers(db, organizer_id, -1)
+        db.execute(delete(UserTimelineEntry.__table__).where(
+            UserTimelineEntry.user_id == follower_id,
+            UserTimelineEntry.organizer_id == organizer_id
+        ))
+        db.commit()
+        return True
+
+    def fan_out(self, db: Session, event: Event) -> int:
+        """Copy a just-published event into followers' timelines (or mark it read on demand), without committing"""
+        if event.published_at is None:
+            return 0
+        event.feed_on_read = self.is_fan_out_on_read(db, event.organizer_id)
+        if event.feed_on_read:
+            return 0
+
+        db.flush()
+        followers = select(
+            OrganizerFollow.follower_id, Event.id, Event.organizer_id, Event.published_at
+        ).join(Event, Event.organizer_id == OrganizerFollow.organizer_id).where(Event.id == event.id)
+        return db.execute(self._timeline_rows(followers)).rowcount
+
+    def fan_out_many(self, db: Session, organizer_id: int, event_ids: List[int]) -> int:
+        """Copy many just-published events of one organizer into followers' timelines (or mark them read on demand), without committing"""
+        if not event_ids:
+            return 0
+        on_read = self.is_fan_out_on_read(db, organizer_id)
+        db.execute(update(Event).where(Event.id.in_(event_ids)).values(
+            feed_on_read=on_read
+        ).execution_options(synchronize_session=False))
+        if on_read:
+            return 0
+
+        followers = select(
+            OrganizerFollow.follower_id, Event.id, Event.organizer_id, Event.published_at
+        ).join(Event, Event.organizer_id == OrganizerFollow.organizer_id).where(
+            Event.id.in_(event_ids),
+            Event.published_at.isnot(None)
+        )
+        return db.execute(self._timeline_rows(followers)).rowcount
+
+    def get_feed(self, db: Session, user_id: int, limit: int = 20,
+                 before: Optional[Tuple[datetime, int]] = None) -> Tuple[List[Event], Optional[Tuple[datetime, int]]]:
+        """Get published events from followed organizers, newest first, keyset-paginated"""
+        timeline = db.query(Event, UserTimelineEntry.published_at).join(
+            UserTimelineEntry, UserTimelineEntry.event_id == Event.id
+        ).filter(
+            UserTimelineEntry.user_id == user_id,
+            Event.status == EventStatus.PUBLISHED
+        )
+        if before:
+            timeline = timeline.filter(tuple_(UserTimelineEntry.published_at, UserTimelineEntry.event_id) < before)
+        rows = timeline.order_by(
+            UserTimelineEntry.published_at.desc(), UserTimelineEntry.event_id.desc()
+        ).limit(limit + 1).all()
+
+        # Events of followed organizers that were not fanned out when published
+        followed = select(OrganizerFollow.organizer_id).where(OrganizerFollow.follower_id == user_id)
+        pulled = db.query(Event, Event.published_at).filter(
+            Event.organizer_id.in_(followed),
+            Event.feed_on_read == True,
+            Event.status == EventStatus.PUBLISHED,
+            Event.published_at.isnot(None)
+        )
+        if before:
+            pulled = pulled.filter(tuple_(Event.published_at, Event.id) < before)
+        pulled = pulled.order_by(Event.published_at.desc(), Event.id.desc()).limit(limit + 1).all()
+        if pulled:
+            merged = {event.id: (event, published_at) for event, published_at in rows + pulled}
+            rows = sorted(merged.values(), key=lambda row: (row[1], row[0].id), reverse=True)[:limit + 1]
+
+        next_before = None
+        if len(rows) > limit:
+            event, published_at = rows[limit - 1]
+            next_before = (published_at, event.id)
+        return [event for event, _ in rows[:limit]], next_before
+
+# Create service instance
+feed_service = FeedService(settings.FEED_FANOUT_MAX_FOLLOWERS, settings.FEED_BACKFILL_EVENTS)
@@ -0,0 +1,91 @@
+from sqlalchemy import select, func, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.db.database import SessionLocal
+from app.db.models import Notification, User, Event
+from app.core.config import settings
+from app.services.background import PeriodicWorker
+from app.services.email_service import email_service
+import logging
+
+logger = logging.getLogger(__name__)
+
+class NotificationService:
+    """Outbox of user notifications
+
+    Notifications are inserted in the transaction that causes them, so
+    they exist exactly when the change commits, and a background worker
+    delivers them in batches. Failed deliveries are retried up to
+    `max_attempts` times.
+    """
+
+    def __init__(self, batch_size: int, interval: float, max_attempts: int):
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self._worker = PeriodicWorker("notifications", interval, self.deliver, run_on_stop=False)
+
+    def enqueue_from(self, source, kind: str):
+        """INSERT ... SELECT queueing a notification per (user_id, event_id, registration_id) row of a CTE"""
+        notifications = Notification.__table__
+        return pg_insert(notifications).from_select(
+            ["user_id", "kind", "event_id", "registration_id"],
+            select(source.c.user_id, literal(kind), source.c.event_id, source.c.id)
+        ).returning(notifications.c.registration_id).add_cte(source)
+
+    def _send(self, notification: Notification, user: User, event: Event) -> bool:
+        if notification.kind == "waitlist_promoted":
+            return email_service.send_waitlist_promotion_email(user.email, event.title, user.full_name)
+        raise ValueError(f"Unknown notification kind: {notification.kind}")
+
+    def deliver(self) -> int:
+        """Send a batch of pending notifications, returning how many were sent"""
+        db = SessionLocal()
+        sent = 0
+        try:
+            rows = db.query(Notification, User, Event).join(
+                User, User.id == Notification.user_id
+            ).outerjoin(
+                Event, Event.id == Notification.event_id
+            ).filter(
+                Notification.sent_at.is_(None),
+                Notification.attempts < self.max_attempts
+            ).order_by(Notification.id).limit(self.batch_size).with_for_update(of=Notification, skip_locked=True).all()
+
+            for notification, user, event in rows:
+                try:
+                    delivered = self._send(notification, user, event)
+                    error = None if delivered else "Delivery failed"
+                except Exception as e:
+                    delivered, error = False, str(e)[:255]
+                if delivered:
+                    notification.sent_at = func.now()
+                    sent += 1
+                else:
+                    notification.attempts += 1
+                    notification.last_error = error
+            db.commit()
+            return sent
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to deliver notifications: {str(e)}")
+            return 0
+        finally:
+            db.close()
+
+    def wake(self) -> None:
+        """Deliver pending notifications as soon as possible"""
+        self._worker.wake()
+
+    def start(self) -> None:
+        """Start the delivery worker"""
+        self._worker.start()
+
+    def stop(self) -> None:
+        """Stop the delivery worker"""
+        self._worker.stop()
+
+# Create service instance
+notification_service = NotificationService(
+    settings.NOTIFICATION_BATCH_SIZE,
+    settings.NOTIFICATION_INTERVAL_SECONDS,
+    settings.NOTIFICATION_MAX_ATTEMPTS
+)
@@ -0,0 +1,173 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.db.database import SessionLocal
+from app.db.models import EventRegistration, PaymentWebhookEvent
+from app.core.config import settings
+from app.services.background import PeriodicWorker
+from typing import Any, Dict, Optional
+import hashlib
+import hmac
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Provider event types and the payment status they move a registration to
+PAYMENT_EVENT_STATUSES = {
+    "payment.succeeded": "paid",
+    "payment.failed": "failed",
+}
+
+# payment_status a registration may move from, per target status (paid is final)
+ALLOWED_TRANSITIONS = {
+    "paid": ("pending", "failed"),
+    "failed": ("pending",),
+}
+
+def sign_webhook(secret: str, timestamp: str, body: bytes) -> str:
+    """Signature of a webhook: hex HMAC-SHA256 of "<timestamp>.<body>" """
+    return hmac.new(secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256).hexdigest()
+
+class PaymentWebhookService:
+    """Payment webhook inbox
+
+    Webhooks are verified (HMAC over timestamp and raw body, per-provider
+    secret), stored with one INSERT that skips provider event ids already
+    seen, and acknowledged at once, so bursts after a sale opens cost one
+    indexed insert each. A worker applies the inbox in id order,
+    `batch_size` events at a time: one read and one bulk UPDATE of the
+    registrations named in the batch, then one bulk UPDATE of the inbox.
+    """
+
+    def __init__(self, secrets: Dict[str, str], tolerance: int, batch_size: int, interval: float):
+        self.secrets = secrets
+        self.tolerance = tolerance
+        self.batch_size = batch_size
+        self._worker = PeriodicWorker("payment-webhooks", interval, self.apply, run_on_stop=False)
+
+    def verify(self, provider: str, body: bytes, timestamp: Optional[str], signature: Optional[str]) -> bool:
+        """Check a webhook's signature and that it was signed recently"""
+        secret = self.secrets.get(provider)
+        if not secret or not timestamp or not signature:
+            return False
+        try:
+            signed_at = int(timestamp)
+        except ValueError:
+            return False
+        if abs(time.time() - signed_at) > self.tolerance:
+            return False
+        expected = sign_webhook(secret, timestamp, body)
+        return hmac.compare_digest(expected, signature.split("=", 1)[-1])
+
+    def receive(self, db: Session, provider: str, body: bytes) -> bool:
+        """Store a verified webhook, returning False if the provider event was already stored"""
+        payload = json.loads(body)
+        if not isinstance(payload, dict) or not payload.get("id") or not payload.get("type"):
+            raise ValueError("Webhook payload needs an id and a type")
+        registration_id = (payload.get("data") or {}).get("registration_id")
+
+        inbox = PaymentWebhookEvent.__table__
+        stored = db.execute(
+            pg_insert(inbox).values(
+                provider=provider,
+                provider_event_id=str(payload["id"])[:255],
+                event_type=str(payload["type"])[:100],
+                registration_id=registration_id if isinstance(registration_id, int) else None,
+                payload=body.decode()
+            ).on_conflict_do_nothing(
+                index_elements=[inbox.c.provider, inbox.c.provider_event_id]
+            ).returning(inbox.c.id)
+        ).scalar()
+        db.commit()
+        return stored is not None
+
+    def _apply_batch(self, db: Session) -> int:
+        """Apply the oldest unprocessed webhooks, without committing; returns events processed"""
+        events = db.query(
+            PaymentWebhookEvent.id, PaymentWebhookEvent.event_type, PaymentWebhookEvent.registration_id
+        ).filter(
+            PaymentWebhookEvent.processed_at.is_(None)
+        ).order_by(PaymentWebhookEvent.id).limit(self.batch_size).with_for_update(skip_locked=True).all()
+        if not events:
+            return 0
+
+        # Final status per registration for the batch; paid wins over failed
+        targets: Dict[int, str] = {}
+        for event in events:
+            status = PAYMENT_EVENT_STATUSES.get(event.event_type)
+            if status and event.registration_id is not None and targets.get(event.registration_id) != "paid":
+                targets[event.registration_id] = status
+
+        current = dict(db.execute(
+            select(EventRegistration.id, EventRegistration.payment_status).where(
+                EventRegistration.id.in_(targets)
+            ).order_by(EventRegistration.id).with_for_update()
+        ).all()) if targets else {}
+        changed = {
+            registration_id: status for registration_id, status in targets.items()
+            if registration_id in current and current[registration_id] in ALLOWED_TRANSITIONS[status]
+        }
+        if changed:
+            db.execute(update(EventRegistration), [
+                {"id": registration_id, "payment_status": status} for registration_id, status in changed.items()
+            ])
+
+        processed_at = db.execute(select(func.now())).scalar()
+        outcomes = []
+        for event in events:
+            status = PAYMENT_EVENT_STATUSES.get(event.event_type)
+            if not status:
+                outcome = "ignored"
+            elif event.registration_id not in current:
+                outcome = "unknown_registration"
+            elif changed.get(event.registration_id) == status:
+                outcome = "applied"
+            else:
+                outcome = "skipped"
+            outcomes.append({"id": event.id, "processed_at": processed_at, "outcome": outcome})
+        db.execute(update(PaymentWebhookEvent), outcomes)
+        return len(events)
+
+    def apply(self) -> int:
+        """Apply all pending webhooks batch by batch, returning how many were processed"""
+        db = SessionLocal()
+        processed = 0
+        try:
+            while True:
+                batch = self._apply_batch(db)
+                db.commit()
+                if not batch:
+                    return processed
+                processed += batch
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to apply payment webhooks: {str(e)}")
+            return processed
+        finally:
+            db.close()
+
+    def get_stats(self, db: Session) -> Dict[str, Any]:
+        """Inbox backlog: unprocessed events and the age of the oldest one"""
+        pending, oldest = db.query(
+            func.count(PaymentWebhookEvent.id), func.min(PaymentWebhookEvent.received_at)
+        ).filter(PaymentWebhookEvent.processed_at.is_(None)).one()
+        lag = db.query(func.extract("epoch", func.now() - oldest)).scalar() if oldest else None
+        return {"pending": pending, "oldest_pending_seconds": round(float(lag), 3) if lag is not None else None}
+
+    def start(self) -> None:
+        """Start the inbox worker"""
+        self._worker.start()
+
+    def stop(self) -> None:
+        """Stop the inbox worker"""
+        self._worker.stop()
+
+# Create service instance
+payment_webhooks = PaymentWebhookService(
+    settings.PAYMENT_WEBHOOK_SECRETS,
+    settings.PAYMENT_WEBHOOK_TOLERANCE_SECONDS,
+    settings.PAYMENT_WEBHOOK_BATCH_SIZE,
+    settings.PAYMENT_WEBHOOK_INTERVAL_SECONDS
+)
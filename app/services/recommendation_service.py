@@ -0,0 +1,263 @@
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import select, insert, delete, union, union_all, func, Float
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.db.database import SessionLocal, engine
+from app.db.models import (
+    Event, EventStatus, EventLike, EventRegistration, Attendance,
+    PendingInteraction, UserEventInteraction, EventCooccurrence, EventNeighbor
+)
+from app.core.config import settings
+from app.services.background import PeriodicWorker
+from datetime import datetime, timedelta
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Re-check rows written slightly before the last refresh (long-running writers)
+REFRESH_OVERLAP = timedelta(minutes=1)
+
+# Advisory lock held while the matrix or neighbors are written, so workers never
+# refresh concurrently; two-key form, ignored by the delta sync horizon
+SIMILAR_EVENTS_LOCK_KEY = (42003, 0)
+
+class RecommendationService:
+    """Similar-event recommendations from a sparse event x event co-occurrence matrix
+
+    The matrix lives in event_cooccurrences (only non-zero cells); its
+    diagonal c_ii is the number of users of event i. Request transactions
+    only append (user, event) rows to pending_interactions, so a popular
+    event's cells are never locked by its registrations. A periodic job
+    folds the pending rows into the matrix (a first interaction adds 1 to
+    the event's diagonal and to the cells pairing it with the user's other
+    events), rescores the rows of events touched since its last run
+    (cosine: c_ij / sqrt(c_ii * c_jj)) and stores the top K per event in
+    event_neighbors, so reads are a lookup.
+
+    Folding only adds: unlikes and cancellations are not taken out of the
+    matrix, so between rebuilds (run every rebuild_interval) scores still
+    count retracted interactions and are approximate.
+    """
+
+    def __init__(self, top_k: int, refresh_interval: float, fold_batch_size: int, rebuild_interval: float):
+        self.top_k = top_k
+        self.fold_batch_size = fold_batch_size
+        self._refreshed_at: Optional[datetime] = None
+        self._worker = PeriodicWorker("similar-events-refresh", refresh_interval, self.refresh_neighbors, run_on_stop=False)
+        self._rebuild_worker = PeriodicWorker("similar-events-rebuild", rebuild_interval, self.rebuild, run_on_stop=False)
+
+    def record_interaction(self, db: Session, user_id: int, event_id: int) -> None:
+        """Queue a user's interaction with an event for the matrix, without committing"""
+        self.record_interactions(db, event_id, [user_id])
+
+    def record_interactions(self, db: Session, event_id: int, user_ids: List[int]) -> None:
+        """Queue several users' interactions with one event in one insert, without committing"""
+        if not user_ids:
+            return
+        db.execute(insert(PendingInteraction.__table__).values([
+            {"user_id": user_id, "event_id": event_id} for user_id in user_ids
+        ]))
+
+    @contextmanager
+    def _exclusive(self, wait: bool) -> Iterator[bool]:
+        """Hold the refresh lock on its own connection (runs commit per step); yields False if busy"""
+        with engine.connect() as lock:
+            acquire = func.pg_advisory_lock if wait else func.pg_try_advisory_lock
+            acquired = lock.execute(select(acquire(*SIMILAR_EVENTS_LOCK_KEY))).scalar() is not False
+            lock.commit()
+            if not acquired:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                lock.execute(select(func.pg_advisory_unlock(*SIMILAR_EVENTS_LOCK_KEY)))
+                lock.commit()
+
+    def _fold_batch(self, db: Session) -> int:
+        """Move the oldest pending interactions into the matrix in one statement; returns rows taken"""
+        pending = PendingInteraction.__table__
+        interactions = UserEventInteraction.__table__
+        cooccurrences = EventCooccurrence.__table__
+
+        taken = delete(pending).where(pending.c.id.in_(
+            select(pending.c.id).order_by(pending.c.id).limit(self.fold_batch_size)
+        )).returning(pending.c.user_id, pending.c.event_id).cte("taken")
+
+        # Only a first interaction with the event changes the matrix
+        new = pg_insert(interactions).from_select(
+            ["user_id", "event_id"],
+            select(taken.c.user_id, taken.c.event_id).distinct()
+        ).on_conflict_do_nothing().returning(interactions.c.user_id, interactions.c.event_id).cte("new")
+
+        # New rows are not visible to this statement: pair them with the stored
+        # interactions (both ways) and with each other (each ordered pair once,
+        # which includes the diagonal)
+        stored, others = aliased(interactions), new.alias("others")
+        cells = union_all(
+            select(new.c.event_id.label("event_id"), stored.c.event_id.label("other_event_id")).join(stored, stored.c.user_id == new.c.user_id),
+            select(stored.c.event_id, new.c.event_id).join(stored, stored.c.user_id == new.c.user_id),
+            select(new.c.event_id, others.c.event_id).join(others, others.c.user_id == new.c.user_id)
+        ).subquery()
+
+        folded = pg_insert(cooccurrences).from_select(
+            ["event_id", "other_event_id", "count"],
+            select(cells.c.event_id, cells.c.other_event_id, func.count())
+            .group_by(cells.c.event_id, cells.c.other_event_id)
+        )
+        folded = folded.on_conflict_do_update(
+            index_elements=[cooccurrences.c.event_id, cooccurrences.c.other_event_id],
+            set_={"count": cooccurrences.c.count + folded.excluded.count, "updated_at": func.now()}
+        ).returning(cooccurrences.c.event_id).cte("folded")
+
+        return db.execute(select(func.count()).select_from(taken).add_cte(new).add_cte(folded)).scalar()
+
+    def _fold_interactions(self) -> int:
+        """Fold all pending interactions, committing per batch; returns rows folded"""
+        folded = 0
+        db = SessionLocal()
+        try:
+            while True:
+                taken = self._fold_batch(db)
+                db.commit()
+                folded += taken
+                if taken < self.fold_batch_size:
+                    return folded
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def rebuild(self) -> int:
+        """Rebuild interactions, co-occurrences and neighbors from the source tables"""
+        interactions = UserEventInteraction.__table__
+        cooccurrences = EventCooccurrence.__table__
+        with self._exclusive(wait=True):
+            db = SessionLocal()
+            try:
+                # Pending rows deleted here are read again from the source tables below
+                db.execute(delete(PendingInteraction.__table__))
+                db.execute(delete(cooccurrences))
+                db.execute(delete(interactions))
+                db.execute(pg_insert(interactions).from_select(["user_id", "event_id"], union(
+                    select(EventLike.user_id, EventLike.event_id),
+                    select(EventRegistration.user_id, EventRegistration.event_id).where(EventRegistration.status != "cancelled"),
+                    select(Attendance.user_id, Attendance.event_id)
+                )).on_conflict_do_nothing())
+
+                a, b = aliased(interactions), aliased(interactions)
+                db.execute(pg_insert(cooccurrences).from_select(
+                    ["event_id", "other_event_id", "count"],
+                    select(a.c.event_id, b.c.event_id, func.count())
+                    .join(b, b.c.user_id == a.c.user_id)
+                    .group_by(a.c.event_id, b.c.event_id)
+                ))
+                cells = db.execute(select(func.count()).select_from(cooccurrences)).scalar()
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+
+            self._refreshed_at = None
+            self._rescore()
+        return cells
+
+    def refresh_neighbors(self) -> int:
+        """Fold pending interactions, then recompute top-K neighbors of events whose row changed since the last run"""
+        with self._exclusive(wait=False) as acquired:
+            if not acquired:
+                logger.info("Similar events refresh already running in another worker, skipping")
+                return 0
+            try:
+                self._fold_interactions()
+            except Exception as e:
+                logger.error(f"Failed to fold interactions into similar events: {str(e)}")
+                return 0
+            return self._rescore()
+
+    def _rescore(self) -> int:
+        """Recompute top-K neighbors of dirty events (caller holds the refresh lock)"""
+        cooccurrences = EventCooccurrence.__table__
+        neighbors = EventNeighbor.__table__
+
+        db = SessionLocal()
+        try:
+            started = db.execute(select(func.now())).scalar()
+            dirty = select(cooccurrences.c.event_id).distinct()
+            if self._refreshed_at is not None:
+                # Every changed cell comes with a change of its event's diagonal c_jj,
+                # which rescales each row i with a c_ij cell: those are the events in
+                # row j (the matrix is symmetric), read through the primary key
+                changed = select(cooccurrences.c.event_id).where(
+                    cooccurrences.c.event_id == cooccurrences.c.other_event_id,
+                    cooccurrences.c.updated_at >= self._refreshed_at - REFRESH_OVERLAP
+                )
+                dirty = select(cooccurrences.c.other_event_id.label("event_id")).distinct().where(
+                    cooccurrences.c.event_id.in_(changed)
+                )
+            dirty = dirty.cte("dirty")
+
+            users_a, users_b = cooccurrences.alias("users_a"), cooccurrences.alias("users_b")
+            score = cooccurrences.c.count.cast(Float) / func.sqrt(users_a.c.count * users_b.c.count, type_=Float)
+            scored = select(
+                cooccurrences.c.event_id,
+                cooccurrences.c.other_event_id,
+                score.label("score"),
+                func.row_number().over(
+                    partition_by=cooccurrences.c.event_id,
+                    order_by=(score.desc(), cooccurrences.c.other_event_id)
+                ).label("rank")
+            ).join(dirty, dirty.c.event_id == cooccurrences.c.event_id).join(
+                users_a, (users_a.c.event_id == cooccurrences.c.event_id) & (users_a.c.other_event_id == cooccurrences.c.event_id)
+            ).join(
+                users_b, (users_b.c.event_id == cooccurrences.c.other_event_id) & (users_b.c.other_event_id == cooccurrences.c.other_event_id)
+            ).where(cooccurrences.c.other_event_id != cooccurrences.c.event_id).subquery()
+
+            db.execute(delete(neighbors).where(neighbors.c.event_id.in_(select(dirty.c.event_id))))
+            refreshed = db.execute(pg_insert(neighbors).from_select(
+                ["event_id", "rank", "neighbor_id", "score"],
+                select(scored.c.event_id, scored.c.rank, scored.c.other_event_id, scored.c.score)
+                .where(scored.c.rank <= self.top_k)
+            ).add_cte(dirty)).rowcount
+            db.commit()
+            self._refreshed_at = started
+            return refreshed
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to refresh similar events: {str(e)}")
+            return 0
+        finally:
+            db.close()
+
+    def get_similar_events(self, db: Session, event_id: int, limit: int = 10) -> List[Tuple[Event, float]]:
+        """Get published events similar to an event with their scores, best first"""
+        rows = db.query(Event, EventNeighbor.score).join(
+            EventNeighbor, EventNeighbor.neighbor_id == Event.id
+        ).filter(
+            EventNeighbor.event_id == event_id,
+            Event.status == EventStatus.PUBLISHED,
+            Event.is_active == True
+        ).order_by(EventNeighbor.rank).limit(limit).all()
+        return [(event, score) for event, score in rows]
+
+    def start(self) -> None:
+        """Start the periodic neighbor refresh and rebuild"""
+        self._worker.start()
+        self._rebuild_worker.start()
+
+    def stop(self) -> None:
+        """Stop the periodic neighbor refresh and rebuild"""
+        self._worker.stop()
+        self._rebuild_worker.stop()
+
+# Create service instance
+recommendation_service = RecommendationService(
+    settings.SIMILAR_EVENTS_TOP_K,
+    settings.SIMILAR_EVENTS_REFRESH_INTERVAL_SECONDS,
+    settings.SIMILAR_EVENTS_FOLD_BATCH_SIZE,
+    settings.SIMILAR_EVENTS_REBUILD_INTERVAL_SECONDS
+)
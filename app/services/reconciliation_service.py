@@ -0,0 +1,221 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update, func, literal, BigInteger
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.db.database import SessionLocal, engine
+from app.db.models import Event, EventCounter, EventRegistration, EventLike, EventComment, Certificate, CertificateTemplate, SeatHold
+from app.core.config import settings
+from app.services.background import PeriodicWorker
+from datetime import datetime
+from functools import partial
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Registration statuses that hold a seat
+COUNTED_REGISTRATION_STATUSES = ("confirmed",)
+
+RECONCILED_COUNTERS = (
+    "registrations_count", "likes_count", "comments_count", "rating_sum", "rating_count", "usage_count"
+)
+
+# Corrections kept in a report; totals are always complete
+MAX_REPORTED_CORRECTIONS = 100
+
+# Advisory lock held for a whole run, so workers never reconcile concurrently; two-key
+# form, so the delta sync horizon (which reads single-key advisory locks) ignores it
+RECONCILE_LOCK_KEY = (42002, 0)
+
+class CounterReconciliationService:
+    """Recompute denormalized counters from their source tables and fix drift
+
+    Each counter is checked in batches of ids: one grouped count over the
+    source rows and one grouped read of the stored value, compared and
+    corrected in a single statement per batch. Corrections are applied as
+    deltas, so increments committed while a batch runs are not lost.
+    """
+
+    def __init__(self, batch_size: int, interval: float):
+        self.batch_size = batch_size
+        self.last_report: Optional[Dict[str, Any]] = None
+        self._worker = PeriodicWorker("counter-reconciliation", interval, self.run, run_on_stop=False)
+
+    def _batches(self, db: Session, id_column) -> Iterator[Tuple[int, int]]:
+        """Yield (first, last) id bounds of consecutive batches"""
+        last = 0
+        while True:
+            ids = select(id_column.label("id")).where(id_column > last).order_by(id_column).limit(self.batch_size).subquery()
+            first, last_in_batch = db.execute(select(func.min(ids.c.id), func.max(ids.c.id))).one()
+            if first is None:
+                return
+            yield first, last_in_batch
+            last = last_in_batch
+
+    def _fix_event_counter(self, db: Session, column: str, actual, first: int, last: int) -> List[Dict[str, Any]]:
+        """Correct one event_counters column for events in [first, last] from a grouped count"""
+        events = Event.__table__
+        counters = EventCounter.__table__
+        stored = select(
+            counters.c.event_id,
+            func.sum(counters.c[column]).cast(BigInteger).label("stored")
+        ).where(counters.c.event_id.between(first, last)).group_by(counters.c.event_id).subquery()
+
+        stored_value = func.coalesce(stored.c.stored, 0)
+        actual_value = func.coalesce(actual.c.actual, 0)
+        diffs = select(
+            events.c.id.label("id"),
+            stored_value.label("stored"),
+            actual_value.label("actual")
+        ).select_from(
+            events.outerjoin(stored, stored.c.event_id == events.c.id)
+            .outerjoin(actual, actual.c.event_id == events.c.id)
+        ).where(
+            events.c.id.between(first, last),
+            stored_value != actual_value
+        ).cte("diffs")
+
+        # Registrations live on shard 0 only, so the delta goes there for every counter
+        fixed = pg_insert(counters).from_select(
+            ["event_id", "shard", column],
+            select(diffs.c.id, literal(0), diffs.c.actual - diffs.c.stored)
+        )
+        fixed = fixed.on_conflict_do_update(
+            index_elements=[counters.c.event_id, counters.c.shard],
+            set_={column: counters.c[column] + fixed.excluded[column]}
+        ).returning(counters.c.event_id).cte("fixed")
+
+        return [dict(row) for row in db.execute(select(diffs).add_cte(fixed)).mappings()]
+
+    def reconcile_registrations(self, db: Session, first: int, last: int) -> List[Dict[str, Any]]:
+        """Fix registrations_count for events in [first, last]"""
+        # Seated registrations reserve their hold's seats; others reserve one
+        actual = select(
+            EventRegistration.event_id,
+            func.sum(func.coalesce(SeatHold.seat_count, 1)).cast(BigInteger).label("actual")
+        ).outerjoin(
+            SeatHold, (SeatHold.registration_id == EventRegistration.id) & (SeatHold.status == "confirmed")
+        ).where(
+            EventRegistration.event_id.between(first, last),
+            EventRegistration.status.in_(COUNTED_REGISTRATION_STATUSES)
+        ).group_by(EventRegistration.event_id).subquery()
+        return self._fix_event_counter(db, "registrations_count", actual, first, last)
+
+    def reconcile_likes(self, db: Session, first: int, last: int) -> List[Dict[str, Any]]:
+        """Fix likes_count for events in [first, last]"""
+        actual = select(
+            EventLike.event_id,
+            func.count().label("actual")
+        ).where(EventLike.event_id.between(first, last)).group_by(EventLike.event_id).subquery()
+        return self._fix_event_counter(db, "likes_count", actual, first, last)
+
+    def reconcile_comments(self, db: Session, first: int, last: int, column: str) -> List[Dict[str, Any]]:
+        """Fix comments_count, rating_sum or rating_count for events in [first, last]"""
+        aggregate = {
+            "comments_count": func.count(),
+            "rating_sum": func.coalesce(func.sum(EventComment.rating), 0),
+            "rating_count": func.count(EventComment.rating)
+        }[column]
+        actual = select(
+            EventComment.event_id,
+            aggregate.label("actual")
+        ).where(EventComment.event_id.between(first, last)).group_by(EventComment.event_id).subquery()
+        return self._fix_event_counter(db, column, actual, first, last)
+
+    def reconcile_template_usage(self, db: Session, first: int, last: int) -> List[Dict[str, Any]]:
+        """Fix usage_count for certificate templates in [first, last]"""
+        templates = CertificateTemplate.__table__
+        actual = select(
+            Certificate.template_id,
+            func.count().label("actual")
+        ).where(Certificate.template_id.between(first, last)).group_by(Certificate.template_id).subquery()
+
+        stored_value = func.coalesce(templates.c.usage_count, 0)
+        actual_value = func.coalesce(actual.c.actual, 0)
+        diffs = select(
+            templates.c.id.label("id"),
+            stored_value.label("stored"),
+            actual_value.label("actual")
+        ).select_from(
+            templates.outerjoin(actual, actual.c.template_id == templates.c.id)
+        ).where(
+            templates.c.id.between(first, last),
+            stored_value != actual_value
+        ).cte("diffs")
+
+        fixed = update(templates).where(templates.c.id == diffs.c.id).values(
+            usage_count=func.coalesce(templates.c.usage_count, 0) + diffs.c.actual - diffs.c.stored
+        ).returning(templates.c.id).cte("fixed")
+
+        return [dict(row) for row in db.execute(select(diffs).add_cte(fixed)).mappings()]
+
+    def run(self) -> Optional[Dict[str, Any]]:
+        """Reconcile all counters and return a report, or None if another worker is already running"""
+        # Batches commit as they go, so the lock is a session lock on its own connection
+        with engine.connect() as lock:
+            if not lock.execute(select(func.pg_try_advisory_lock(*RECONCILE_LOCK_KEY))).scalar():
+                logger.info("Counter reconciliation already running in another worker, skipping")
+                return None
+            lock.commit()
+            try:
+                return self._run()
+            finally:
+                lock.execute(select(func.pg_advisory_unlock(*RECONCILE_LOCK_KEY)))
+                lock.commit()
+
+    def _run(self) -> Dict[str, Any]:
+        """Reconcile all counters, committing per batch, and return a report of corrections"""
+        started = time.monotonic()
+        report: Dict[str, Any] = {
+            "started_at": datetime.utcnow(),
+            "batches": {counter: 0 for counter in RECONCILED_COUNTERS},
+            "corrected": {counter: 0 for counter in RECONCILED_COUNTERS},
+            "corrections": []
+        }
+        jobs = [
+            ("registrations_count", Event.id, self.reconcile_registrations),
+            ("likes_count", Event.id, self.reconcile_likes),
+            ("comments_count", Event.id, partial(self.reconcile_comments, column="comments_count")),
+            ("rating_sum", Event.id, partial(self.reconcile_comments, column="rating_sum")),
+            ("rating_count", Event.id, partial(self.reconcile_comments, column="rating_count")),
+            ("usage_count", CertificateTemplate.id, self.reconcile_template_usage),
+        ]
+
+        db = SessionLocal()
+        try:
+            for counter, id_column, reconcile in jobs:
+                for first, last in self._batches(db, id_column):
+                    try:
+                        corrections = reconcile(db, first, last)
+                        db.commit()
+                    except Exception as e:
+                        db.rollback()
+                        logger.error(f"Failed to reconcile {counter} for ids {first}-{last}: {str(e)}")
+                        continue
+
+                    report["batches"][counter] += 1
+                    report["corrected"][counter] += len(corrections)
+                    for correction in corrections:
+                        logger.warning(
+                            f"Corrected {counter} for id {correction['id']}: "
+                            f"{correction['stored']} -> {correction['actual']}"
+                        )
+                        if len(report["corrections"]) < MAX_REPORTED_CORRECTIONS:
+                            report["corrections"].append({"counter": counter, **correction})
+        finally:
+            db.close()
+
+        report["duration_ms"] = round((time.monotonic() - started) * 1000, 1)
+        self.last_report = report
+        return report
+
+    def start(self) -> None:
+        """Start the periodic reconciliation"""
+        self._worker.start()
+
+    def stop(self) -> None:
+        """Stop the periodic reconciliation"""
+        self._worker.stop()
+
+# Create service instance
+reconciliation_service = CounterReconciliationService(settings.RECONCILE_BATCH_SIZE, settings.RECONCILE_INTERVAL_SECONDS)
@@ -0,0 +1,167 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from pydantic import ValidationError
+from app.db.models import Event, User, Role
+from app.schemas.event import RegistrationImportRow
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.services.admission_queue import admission_queue, ADMISSION_LOCK_KEY, REGISTRATION_DETAIL_FIELDS
+from app.services.seating_service import seating_service
+from collections import Counter
+from itertools import islice
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Set, TextIO, Tuple
+import csv
+import io
+import json
+import secrets
+import logging
+
+logger = logging.getLogger(__name__)
+
+class RegistrationImportService:
+    """Bulk registration of attendee lists (CSV or NDJSON)
+
+    The file is read row by row and handled `batch_size` rows at a time:
+    emails are resolved to users with one query, missing users are created
+    with one multi-row INSERT, and registrations go through the admission
+    queue's set-wise admit (seats in file order, then the waitlist). Each
+    batch commits on its own and writes one report line per row; a batch
+    that fails stops the import with an error line, keeping the report of
+    the batches before it.
+    """
+
+    def __init__(self, batch_size: int):
+        self.batch_size = batch_size
+
+    def read_rows(self, stream: BinaryIO, fmt: str) -> Iterator[Dict[str, Any]]:
+        """Yield the rows of a CSV (with a header) or NDJSON file without reading it whole"""
+        text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+        if fmt == "csv":
+            yield from csv.DictReader(text)
+            return
+        for line in text:
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield row if isinstance(row, dict) else {"email": None, "_error": "Invalid JSON line"}
+
+    def _resolve_users(self, db: Session, rows: List[RegistrationImportRow], password_hash: str) -> Tuple[Dict[str, int], Set[str]]:
+        """Map emails to user ids, creating missing users; returns (user ids, created emails)"""
+        emails = {row.email for row in rows}
+        users = dict(db.execute(select(User.email, User.id).where(User.email.in_(emails))).all())
+
+        missing = {row.email: row for row in rows if row.email not in users}
+        created: Set[str] = set()
+        if missing:
+            role_id = db.query(Role.id).filter(Role.name == "user").scalar()
+            # Imported users get an unknown password and set their own through password reset
+            users_table = User.__table__
+            inserted = db.execute(
+                pg_insert(users_table).on_conflict_do_nothing(
+                    index_elements=[users_table.c.email]
+                ).returning(users_table.c.email, users_table.c.id),
+                [{
+                    "email": email,
+                    "full_name": row.full_name,
+                    "hashed_password": password_hash,
+                    "role_id": role_id,
+                    "is_active": True,
+                    "is_verified": False
+                } for email, row in missing.items()]
+            ).all()
+            created = {email for email, _ in inserted}
+            users.update(inserted)
+
+            # Created concurrently by someone else
+            raced = set(missing) - created
+            if raced:
+                users.update(db.execute(select(User.email, User.id).where(User.email.in_(raced))).all())
+        return users, created
+
+    def _import_batch(self, db: Session, event_id: int, batch: List[Tuple[int, Dict[str, Any]]], password_hash: str) -> List[Dict[str, Any]]:
+        """Register one batch of rows and commit; returns a report line per row"""
+        report: Dict[int, Dict[str, Any]] = {}
+        valid: Dict[int, RegistrationImportRow] = {}
+        seen: Dict[str, int] = {}
+        for number, raw in batch:
+            line = report[number] = {"row": number, "email": raw.get("email")}
+            if raw.get("_error"):
+                line.update(status="invalid", detail=raw["_error"])
+                continue
+            try:
+                row = RegistrationImportRow.model_validate({key: value for key, value in raw.items() if isinstance(key, str) and value not in ("", None)})
+            except ValidationError as e:
+                error = e.errors()[0]
+                line.update(status="invalid", detail=f"{'.'.join(map(str, error['loc']))}: {error['msg']}")
+                continue
+            if row.email in seen:
+                line.update(status="duplicate", detail=f"Same email as row {seen[row.email]}")
+                continue
+            seen[row.email] = number
+            valid[number] = row
+
+        if valid:
+            users, created = self._resolve_users(db, list(valid.values()), password_hash)
+            # One admitter per event at a time: waits for a queue consumer's batch to commit
+            db.execute(select(func.pg_advisory_xact_lock(ADMISSION_LOCK_KEY, event_id)))
+            outcomes = admission_queue.admit(db, event_id, [{
+                "id": number,
+                "user_id": users[row.email],
+                **{field: getattr(row, field) for field in REGISTRATION_DETAIL_FIELDS}
+            } for number, row in valid.items()])
+            db.commit()
+
+            for number, row in valid.items():
+                report[number].update(
+                    user_id=users[row.email],
+                    user_created=row.email in created,
+                    **outcomes[number]
+                )
+        return list(report.values())
+
+    def import_registrations(self, db: Session, event_id: int, organizer_id: int, stream: BinaryIO, fmt: str, report: TextIO) -> Optional[Dict[str, int]]:
+        """Import an attendee file into an organizer's event, writing NDJSON report lines and a summary; returns counts per status"""
+        event = db.query(Event.id, seating_service.is_seated(Event.id).label("seated")).filter(
+            Event.id == event_id,
+            Event.organizer_id == organizer_id
+        ).first()
+
+        if not event:
+            return None
+        if event.seated:
+            raise ValueError("Events with a seat map register through seat holds")
+
+        # One hash for the whole import; bcrypt per created user would dominate
+        password_hash = get_password_hash(secrets.token_urlsafe(32))
+        summary: Counter = Counter()
+        rows = enumerate(self.read_rows(stream, fmt), start=1)
+        imported = 0
+        while True:
+            try:
+                batch = list(islice(rows, self.batch_size))
+                if not batch:
+                    break
+                lines = self._import_batch(db, event_id, batch, password_hash)
+            except Exception as e:
+                # Earlier batches are committed; report where the import stopped instead of losing the report
+                db.rollback()
+                logger.error(f"Registration import for event {event_id} stopped at row {imported + 1}: {str(e)}")
+                report.write(json.dumps({
+                    "row": imported + 1,
+                    "error": f"Import stopped; this and later rows were not imported: {str(e)}"
+                }) + "\n")
+                break
+            for line in lines:
+                summary[line["status"]] += 1
+                report.write(json.dumps(line, default=str) + "\n")
+            imported = batch[-1][0]
+
+        report.write(json.dumps({"summary": dict(summary)}) + "\n")
+        return dict(summary)
+
+# Create service instance
+registration_import = RegistrationImportService(settings.REGISTRATION_IMPORT_BATCH_SIZE)
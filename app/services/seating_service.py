@@ -0,0 +1,361 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from app.db.database import SessionLocal
+from app.db.models import Event, EventStatus, EventRegistration, SeatSection, SeatHold
+from app.schemas.event import SeatMapCreate, SeatHoldCreate
+from app.core.config import settings
+from app.services.background import PeriodicWorker
+from app.services.event_cache import event_list_cache
+from datetime import timedelta
+from itertools import groupby
+from typing import Any, Dict, List, Optional
+import base64
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Expired holds released per sweep transaction
+EXPIRY_BATCH_SIZE = 500
+
+class SeatingService:
+    """Reserved seating on per-section seat bitmaps
+
+    Each section keeps its available seats as a bitmap (one bit per seat,
+    row after row). Lookups decode it into a Python int, so "best N
+    adjacent seats" is a handful of shifts and ANDs instead of a scan of
+    seat rows. Holding seats locks the section row, checks and clears the
+    bits and writes the bitmap back in the same transaction, so two buyers
+    can never hold the same seat. Holds expire after `hold_ttl` seconds
+    and a background sweep puts their seats back; a confirmed hold becomes
+    the seats of a registration.
+    """
+
+    def __init__(self, hold_ttl: int, interval: float, max_seats: int):
+        self.hold_ttl = hold_ttl
+        self.max_seats = max_seats
+        self._worker = PeriodicWorker("seat-holds", interval, self.expire_holds, run_on_stop=False)
+
+    # Bitmaps
+
+    def _decode(self, data: bytes) -> int:
+        return int.from_bytes(data, "little")
+
+    def _encode(self, section: SeatSection, bits: int) -> bytes:
+        return bits.to_bytes((section.rows * section.seats_per_row + 7) // 8, "little")
+
+    def _seat_bits(self, section: SeatSection, seats: List[Dict[str, int]]) -> int:
+        """Bitmap of (row, seat) pairs, rejecting seats outside the section"""
+        bits = 0
+        for seat in seats:
+            if seat["row"] > section.rows or seat["seat"] > section.seats_per_row:
+                raise ValueError(f"Seat {seat['row']}-{seat['seat']} is not in section {section.name}")
+            bits |= 1 << ((seat["row"] - 1) * section.seats_per_row + seat["seat"] - 1)
+        return bits
+
+    def _seat_refs(self, section: SeatSection, bits: int) -> List[Dict[str, int]]:
+        """(row, seat) pairs of the set bits, in seat order"""
+        seats = []
+        while bits:
+            index = (bits & -bits).bit_length() - 1
+            seats.append({"row": index // section.seats_per_row + 1, "seat": index % section.seats_per_row + 1})
+            bits &= bits - 1
+        return seats
+
+    def best_adjacent(self, bits: int, rows: int, width: int, quantity: int) -> int:
+        """Bitmap of the best `quantity` adjacent free seats in one row (front row, then closest to centre), or 0"""
+        if quantity > width:
+            return 0
+        # Bit i of runs is set when seats i .. i + quantity - 1 are all free
+        runs = bits
+        for offset in range(1, quantity):
+            runs &= bits >> offset
+        # ... and the run does not wrap into the next row
+        row_starts = (1 << (width - quantity + 1)) - 1
+        runs &= row_starts * (((1 << (rows * width)) - 1) // ((1 << width) - 1))
+        if not runs:
+            return 0
+
+        row = ((runs & -runs).bit_length() - 1) // width
+        starts = (runs >> (row * width)) & row_starts
+        centre = (width - quantity) // 2
+        candidates = []
+        right = starts >> centre
+        if right:
+            candidates.append(centre + (right & -right).bit_length() - 1)
+        left = starts & ((1 << centre) - 1)
+        if left:
+            candidates.append(left.bit_length() - 1)
+        start = min(candidates, key=lambda candidate: abs(candidate - centre))
+        return ((1 << quantity) - 1) << (row * width + start)
+
+    # Seat maps
+
+    def set_seat_map(self, db: Session, event_id: int, organizer_id: int, map_data: SeatMapCreate) -> Optional[List[SeatSection]]:
+        """Replace an event's seat map (capacity becomes its seat count)"""
+        # Locking the event also blocks new holds, which reference it
+        event = db.query(Event).filter(
+            Event.id == event_id,
+            Event.organizer_id == organizer_id
+        ).with_for_update().first()
+
+        if not event:
+            return None
+
+        live = db.query(SeatHold.id).filter(
+            SeatHold.event_id == event_id,
+            SeatHold.status.in_(("held", "confirmed"))
+        ).first()
+        if live:
+            raise ValueError("Seat map cannot change while seats are held or sold")
+
+        names = [section.name for section in map_data.sections]
+        if len(set(names)) != len(names):
+            raise ValueError("Section names must be unique")
+
+        db.query(SeatSection).filter(SeatSection.event_id == event_id).delete(synchronize_session=False)
+        sections = []
+        for section_data in map_data.sections:
+            section = SeatSection(
+                event_id=event_id,
+                name=section_data.name,
+                rows=section_data.rows,
+                seats_per_row=section_data.seats_per_row,
+                price=section_data.price
+            )
+            seats = (1 << (section.rows * section.seats_per_row)) - 1
+            seats &= ~self._seat_bits(section, [seat.model_dump() for seat in section_data.blocked])
+            section.seat_count = bin(seats).count("1")
+            section.available = self._encode(section, seats)
+            sections.append(section)
+        db.add_all(sections)
+
+        # A fully blocked map has no seats (None would mean unlimited)
+        event.max_capacity = sum(section.seat_count for section in sections)
+        db.commit()
+        event_list_cache.invalidate()
+        return self.get_sections(db, event_id)
+
+    def get_sections(self, db: Session, event_id: int) -> List[SeatSection]:
+        """Get an event's seat sections in map order"""
+        return db.query(SeatSection).filter(SeatSection.event_id == event_id).order_by(SeatSection.id).all()
+
+    def is_seated(self, event_id_column):
+        """EXISTS clause: the event has a seat map"""
+        return select(SeatSection.id).where(SeatSection.event_id == event_id_column).exists()
+
+    def section_out(self, section: SeatSection) -> Dict[str, Any]:
+        return {
+            "id": section.id,
+            "name": section.name,
+            "rows": section.rows,
+            "seats_per_row": section.seats_per_row,
+            "price": section.price,
+            "seat_count": section.seat_count,
+            "available_count": bin(self._decode(section.available)).count("1"),
+            "available": base64.b64encode(section.available).decode()
+        }
+
+    def selection_out(self, section: SeatSection, bits: int) -> Dict[str, Any]:
+        seats = self._seat_refs(section, bits)
+        return {
+            "section_id": section.id,
+            "section_name": section.name,
+            "seats": seats,
+            "price": section.price * len(seats)
+        }
+
+    def hold_out(self, db: Session, hold: SeatHold) -> Dict[str, Any]:
+        section = db.get(SeatSection, hold.section_id)
+        return {
+            **self.selection_out(section, self._decode(hold.seats)),
+            "id": hold.id,
+            "event_id": hold.event_id,
+            "status": hold.status,
+            "registration_id": hold.registration_id,
+            "expires_at": hold.expires_at
+        }
+
+    # Holds
+
+    def _pick(self, section: SeatSection, hold_data: SeatHoldCreate) -> int:
+        """Seats of a hold request that are free in the section (0 if they are not)"""
+        bits = self._decode(section.available)
+        if hold_data.seats:
+            wanted = self._seat_bits(section, [seat.model_dump() for seat in hold_data.seats])
+            return wanted if bits & wanted == wanted else 0
+        return self.best_adjacent(bits, section.rows, section.seats_per_row, hold_data.quantity)
+
+    def _candidates(self, db: Session, event_id: int, hold_data: SeatHoldCreate) -> List[SeatSection]:
+        if hold_data.seats:
+            if hold_data.section_id is None:
+                raise ValueError("section_id is required when picking seats")
+            if len(hold_data.seats) > self.max_seats:
+                raise ValueError(f"At most {self.max_seats} seats can be held at once")
+        elif not hold_data.quantity or hold_data.quantity > self.max_seats:
+            raise ValueError(f"quantity must be between 1 and {self.max_seats}")
+
+        query = db.query(SeatSection).filter(SeatSection.event_id == event_id)
+        if hold_data.section_id is not None:
+            query = query.filter(SeatSection.id == hold_data.section_id)
+        return query.order_by(SeatSection.id).all()
+
+    def find_seats(self, db: Session, event_id: int, hold_data: SeatHoldCreate) -> Optional[Dict[str, Any]]:
+        """Best available seats for a hold request, without holding them"""
+        for section in self._candidates(db, event_id, hold_data):
+            picked = self._pick(section, hold_data)
+            if picked:
+                return self.selection_out(section, picked)
+        return None
+
+    def hold_seats(self, db: Session, event_id: int, user_id: int, hold_data: SeatHoldCreate) -> Optional[SeatHold]:
+        """Hold seats for a user until the hold expires (best available when no seats are named)"""
+        event = db.query(Event.id).filter(
+            Event.id == event_id,
+            Event.status == EventStatus.PUBLISHED
+        ).first()
+
+        if not event:
+            return None
+
+        if db.query(SeatHold.id).filter(
+            SeatHold.event_id == event_id,
+            SeatHold.user_id == user_id,
+            SeatHold.status == "held"
+        ).first():
+            raise ValueError("You already hold seats for this event")
+        if db.query(EventRegistration.id).filter(
+            EventRegistration.event_id == event_id,
+            EventRegistration.user_id == user_id,
+            EventRegistration.status != "cancelled"
+        ).first():
+            raise ValueError("Already registered for this event")
+
+        for candidate in self._candidates(db, event_id, hold_data):
+            # Sections that look full are skipped without locking them
+            if not self._pick(candidate, hold_data):
+                continue
+
+            savepoint = db.begin_nested()
+            section = db.query(SeatSection).filter(
+                SeatSection.id == candidate.id
+            ).populate_existing().with_for_update().first()
+            picked = self._pick(section, hold_data) if section else 0
+            if not picked:
+                # Taken meanwhile: release the section and try the next one
+                savepoint.rollback()
+                continue
+
+            section.available = self._encode(section, self._decode(section.available) & ~picked)
+            section.version += 1
+            hold = SeatHold(
+                event_id=event_id,
+                section_id=section.id,
+                user_id=user_id,
+                seats=self._encode(section, picked),
+                seat_count=bin(picked).count("1"),
+                status="held",
+                expires_at=func.now() + timedelta(seconds=self.hold_ttl)
+            )
+            db.add(hold)
+            savepoint.commit()
+            db.commit()
+            db.refresh(hold)
+            return hold
+
+        raise ValueError("Requested seats are not available")
+
+    def get_hold(self, db: Session, hold_id: int, user_id: int) -> Optional[SeatHold]:
+        """Get a user's seat hold"""
+        return db.query(SeatHold).filter(
+            SeatHold.id == hold_id,
+            SeatHold.user_id == user_id
+        ).first()
+
+    def get_registration_hold(self, db: Session, registration_id: int) -> Optional[SeatHold]:
+        """Get the confirmed hold holding a registration's seats (locked)"""
+        return db.query(SeatHold).filter(
+            SeatHold.registration_id == registration_id,
+            SeatHold.status == "confirmed"
+        ).with_for_update().first()
+
+    def lock_live_hold(self, db: Session, hold_id: int, user_id: int) -> Optional[SeatHold]:
+        """Lock a user's hold if it is still held and not expired"""
+        return db.query(SeatHold).filter(
+            SeatHold.id == hold_id,
+            SeatHold.user_id == user_id,
+            SeatHold.status == "held",
+            SeatHold.expires_at > func.now()
+        ).with_for_update().first()
+
+    def _release(self, db: Session, section_id: int, holds: List[SeatHold], status: str) -> None:
+        """Put the seats of locked holds of one section back, without committing"""
+        section = db.query(SeatSection).filter(
+            SeatSection.id == section_id
+        ).populate_existing().with_for_update().first()
+        if section:
+            bits = self._decode(section.available)
+            for hold in holds:
+                bits |= self._decode(hold.seats)
+            section.available = self._encode(section, bits)
+            section.version += 1
+        for hold in holds:
+            hold.status = status
+
+    def release(self, db: Session, hold: SeatHold, status: str = "released") -> None:
+        """Put a locked hold's seats back, without committing"""
+        self._release(db, hold.section_id, [hold], status)
+
+    def release_hold(self, db: Session, hold_id: int, user_id: int) -> bool:
+        """Give up a user's held seats before the hold expires"""
+        hold = db.query(SeatHold).filter(
+            SeatHold.id == hold_id,
+            SeatHold.user_id == user_id,
+            SeatHold.status == "held"
+        ).with_for_update().first()
+
+        if not hold:
+            return False
+
+        self.release(db, hold)
+        db.commit()
+        return True
+
+    def expire_holds(self) -> int:
+        """Release expired holds batch by batch, returning how many expired"""
+        db = SessionLocal()
+        expired = 0
+        try:
+            while True:
+                holds = db.query(SeatHold).filter(
+                    SeatHold.status == "held",
+                    SeatHold.expires_at <= func.now()
+                ).order_by(SeatHold.section_id, SeatHold.id).limit(EXPIRY_BATCH_SIZE).with_for_update(skip_locked=True).all()
+                if not holds:
+                    return expired
+
+                # Sections in id order, one bitmap write each
+                for section_id, section_holds in groupby(holds, key=lambda hold: hold.section_id):
+                    self._release(db, section_id, list(section_holds), "expired")
+                db.commit()
+                expired += len(holds)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to expire seat holds: {str(e)}")
+            return expired
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        """Start the hold expiry worker"""
+        self._worker.start()
+
+    def stop(self) -> None:
+        """Stop the hold expiry worker"""
+        self._worker.stop()
+
+# Create service instance
+seating_service = SeatingService(
+    settings.SEAT_HOLD_TTL_SECONDS,
+    settings.SEAT_HOLD_EXPIRY_INTERVAL_SECONDS,
+    settings.SEAT_HOLD_MAX_SEATS
+)
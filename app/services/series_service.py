@@ -0,0 +1,194 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import insert, update, case
+from app.db.models import Event, EventSeries, EventRegistration, EventStatus, EventCategory
+from app.schemas.event import EventSeriesCreate, EventUpdate, SeriesRecurrence, SeriesFrequency
+from app.core.config import settings
+from app.services.event_cache import event_list_cache
+from app.services.event_service import event_service
+from app.services.feed_service import feed_service
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import calendar
+import json
+
+def iter_recurrence(start: date, rule: SeriesRecurrence) -> Iterator[date]:
+    """Dates of a recurrence rule from its first date on, in order (unbounded unless count/until)"""
+    produced = 0
+    period = 0
+    if rule.frequency == SeriesFrequency.WEEKLY:
+        weekdays = sorted(set(rule.weekdays or [start.weekday()]))
+        week_start = start - timedelta(days=start.weekday())
+    while True:
+        if rule.frequency == SeriesFrequency.DAILY:
+            candidates = [start + timedelta(days=period * rule.interval)]
+        elif rule.frequency == SeriesFrequency.WEEKLY:
+            week = week_start + timedelta(weeks=period * rule.interval)
+            candidates = [week + timedelta(days=weekday) for weekday in weekdays]
+        else:
+            # Same day of the month; months without that day are skipped (as RRULE does)
+            month_index = start.month - 1 + period * rule.interval
+            year, month = start.year + month_index // 12, month_index % 12 + 1
+            candidates = [date(year, month, start.day)] if start.day <= calendar.monthrange(year, month)[1] else []
+        for occurrence in candidates:
+            if occurrence < start:
+                continue
+            if rule.until and occurrence > rule.until:
+                return
+            yield occurrence
+            produced += 1
+            if rule.count and produced >= rule.count:
+                return
+        period += 1
+
+def db_enums(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Swap API enum values for the model enums the columns bind (matched by name)"""
+    for field, model_enum in (("category", EventCategory), ("status", EventStatus)):
+        if data.get(field) is not None:
+            data[field] = model_enum[data[field].name]
+    return data
+
+class SeriesService:
+    """Recurring event series
+
+    A series stores its recurrence rule; occurrences are ordinary events
+    carrying series_id and series_index, created together with one
+    multi-row INSERT. "This and following" edits are one UPDATE over the
+    (series_id, series_index) range, with date changes applied as a shift
+    of every selected occurrence.
+    """
+
+    def __init__(self, max_occurrences: int):
+        self.max_occurrences = max_occurrences
+
+    def occurrence_dates(self, start: date, rule: SeriesRecurrence) -> List[date]:
+        """Expand a recurrence rule, rejecting unbounded or oversized series"""
+        if not rule.count and not rule.until:
+            raise ValueError("Recurrence needs a count or an until date")
+        if rule.weekdays and rule.frequency != SeriesFrequency.WEEKLY:
+            raise ValueError("Weekdays only apply to weekly recurrence")
+        if rule.weekdays and not all(0 <= weekday <= 6 for weekday in rule.weekdays):
+            raise ValueError("Weekdays are 0 (Monday) to 6 (Sunday)")
+
+        dates = []
+        for occurrence in iter_recurrence(start, rule):
+            if len(dates) == self.max_occurrences:
+                raise ValueError(f"A series has at most {self.max_occurrences} occurrences")
+            dates.append(occurrence)
+        if not dates:
+            raise ValueError("Recurrence produces no occurrences")
+        return dates
+
+    def create_series(self, db: Session, series_data: EventSeriesCreate, organizer_id: int) -> Tuple[EventSeries, List[int]]:
+        """Create a series and all its occurrences as draft events; returns (series, event ids)"""
+        rule = series_data.recurrence
+        dates = self.occurrence_dates(series_data.start_date, rule)
+        duration = series_data.end_date - series_data.start_date
+
+        series = EventSeries(
+            organizer_id=organizer_id,
+            frequency=rule.frequency.value,
+            interval=rule.interval,
+            weekdays=",".join(map(str, sorted(set(rule.weekdays)))) if rule.weekdays else None,
+            starts_on=dates[0],
+            until=rule.until,
+            count=rule.count,
+            occurrences_count=len(dates)
+        )
+        db.add(series)
+        db.flush()
+
+        template = db_enums(series_data.model_dump(exclude={"recurrence"}))
+        if template["gallery_urls"]:
+            template["gallery_urls"] = json.dumps(template["gallery_urls"])
+        events = Event.__table__
+        event_ids = db.execute(
+            insert(events).returning(events.c.id, sort_by_parameter_order=True),
+            [{
+                **template,
+                "start_date": occurrence,
+                "end_date": occurrence + duration,
+                "organizer_id": organizer_id,
+                "status": EventStatus.DRAFT,
+                "series_id": series.id,
+                "series_index": index
+            } for index, occurrence in enumerate(dates)]
+        ).scalars().all()
+
+        db.commit()
+        db.refresh(series)
+        event_list_cache.invalidate()
+        return series, event_ids
+
+    def get_series(self, db: Session, series_id: int) -> Optional[Tuple[EventSeries, List[Event]]]:
+        """Get a series with its occurrences in date order"""
+        series = db.query(EventSeries).filter(EventSeries.id == series_id).first()
+        if not series:
+            return None
+
+        occurrences = db.query(Event).filter(Event.series_id == series_id).order_by(Event.series_index).all()
+        return series, occurrences
+
+    def update_following(self, db: Session, event_id: int, user_id: int, event_data: EventUpdate) -> Optional[Tuple[int, List[int]]]:
+        """Apply an update to an occurrence and every later one of its series; returns (series id, event ids)"""
+        anchor = db.query(Event.series_id, Event.series_index, Event.start_date, Event.end_date).filter(
+            Event.id == event_id,
+            Event.organizer_id == user_id,
+            Event.series_id.isnot(None)
+        ).first()
+
+        if not anchor:
+            return None
+
+        update_data = db_enums(event_data.model_dump(exclude_unset=True))
+        if not update_data:
+            raise ValueError("Nothing to update")
+        if 'gallery_urls' in update_data and update_data['gallery_urls']:
+            update_data['gallery_urls'] = json.dumps(update_data['gallery_urls'])
+
+        # New dates on the anchor shift the whole tail by the same number of days
+        start_shift = (update_data.pop('start_date') - anchor.start_date).days if 'start_date' in update_data else 0
+        end_shift = (update_data.pop('end_date') - anchor.end_date).days if 'end_date' in update_data else start_shift
+        values: Dict[str, Any] = dict(update_data)
+        if start_shift:
+            values['start_date'] = Event.start_date + start_shift
+        if end_shift:
+            values['end_date'] = Event.end_date + end_shift
+
+        publishing = update_data.get('status') == EventStatus.PUBLISHED
+        if publishing:
+            values['published_at'] = case(
+                (Event.status == EventStatus.PUBLISHED, Event.published_at),
+                else_=datetime.utcnow()
+            )
+
+        # Core UPDATE bypasses the ORM version counter, so bump it here for ETags
+        values['version'] = Event.version + 1
+        updated = db.execute(
+            update(Event).where(
+                Event.series_id == anchor.series_id,
+                Event.series_index >= anchor.series_index
+            ).values(values).returning(Event.id, Event.start_date, Event.end_date).execution_options(synchronize_session=False)
+        ).all()
+        if any(row.end_date < row.start_date for row in updated):
+            db.rollback()
+            raise ValueError("End date is before start date")
+
+        event_ids = [row.id for row in updated]
+        if publishing:
+            feed_service.fan_out_many(db, user_id, event_ids)
+
+        # More seats may free the waitlists of the updated occurrences
+        if 'max_capacity' in update_data:
+            waitlisted = db.query(EventRegistration.event_id).filter(
+                EventRegistration.event_id.in_(event_ids),
+                EventRegistration.status == "waitlisted"
+            ).distinct().order_by(EventRegistration.event_id).all()
+            for (waitlisted_event_id,) in waitlisted:
+                event_service.promote_waitlisted(db, waitlisted_event_id)
+
+        db.commit()
+        event_list_cache.invalidate()
+        return anchor.series_id, event_ids
+
+# Create service instance
+series_service = SeriesService(settings.SERIES_MAX_OCCURRENCES)
@@ -0,0 +1,213 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update, delete, insert, func
+from app.db.models import Event, EventRegistration, TicketTier, TicketTierInventory
+from app.schemas.event import TicketTierCreate, TicketTierUpdate
+from app.services.event_cache import TTLCache
+from app.core.config import settings
+from typing import Any, Dict, List, Optional
+import random
+
+class TicketService:
+    """Per-tier ticket inventory (early bird, regular, VIP, ...)
+
+    A tier's remaining tickets are split over `shards` rows of
+    ticket_tier_inventory. Taking a ticket is one conditional UPDATE of a
+    random shard that still has stock, skipping shards other buyers hold
+    locked, so a rush on one tier contends on its own rows only and never
+    on other tiers. Registrations hold their tier ticket (also while
+    waitlisted) until cancelled.
+    """
+
+    def __init__(self, shards: int, cache_ttl: int):
+        self.shards = max(1, shards)
+        self.availability_cache = TTLCache(cache_ttl)
+
+    def pick_shard(self) -> int:
+        return random.randrange(self.shards)
+
+    def _split(self, remaining: int) -> List[Dict[str, int]]:
+        shards = min(self.shards, max(1, remaining))
+        return [
+            {"shard": shard, "remaining": remaining // shards + (shard < remaining % shards)}
+            for shard in range(shards)
+        ]
+
+    def get_tiers(self, db: Session, event_id: int) -> Dict[str, TicketTier]:
+        """Get an event's tiers by name"""
+        return {tier.name: tier for tier in db.query(TicketTier).filter(TicketTier.event_id == event_id)}
+
+    def get_availability(self, db: Session, event_id: int) -> List[Dict[str, Any]]:
+        """Get an event's tiers with remaining tickets (cached for a few seconds)"""
+        cached = self.availability_cache.get(event_id)
+        if cached is not None:
+            return cached
+
+        remaining = func.sum(TicketTierInventory.remaining)
+        rows = db.query(TicketTier, remaining).outerjoin(
+            TicketTierInventory, TicketTierInventory.tier_id == TicketTier.id
+        ).filter(
+            TicketTier.event_id == event_id
+        ).group_by(TicketTier.id).order_by(TicketTier.price, TicketTier.id).all()
+
+        availability = [{
+            "id": tier.id,
+            "event_id": tier.event_id,
+            "name": tier.name,
+            "price": tier.price,
+            "capacity": tier.capacity,
+            "remaining": None if tier.capacity is None else int(left or 0),
+            "sold_out": tier.capacity is not None and not left
+        } for tier, left in rows]
+        self.availability_cache.set(event_id, availability)
+        return availability
+
+    def _rotation(self, shard_column):
+        """Order shards starting from a random one, spreading buyers over rows"""
+        return (shard_column + self.shards - self.pick_shard()) % self.shards
+
+    def _take_unlocked(self, db: Session, tier_id: int, quantity: int) -> Optional[int]:
+        """Take up to quantity tickets from a shard with stock no other buyer holds (None if there is none)"""
+        inventory = TicketTierInventory.__table__
+        picked = select(inventory.c.tier_id, inventory.c.shard, inventory.c.remaining).where(
+            inventory.c.tier_id == tier_id,
+            inventory.c.remaining > 0
+        ).order_by(self._rotation(inventory.c.shard)).limit(1).with_for_update(skip_locked=True).subquery()
+
+        taken = func.least(picked.c.remaining, quantity)
+        return db.execute(
+            update(inventory).values(remaining=inventory.c.remaining - taken).where(
+                inventory.c.tier_id == picked.c.tier_id,
+                inventory.c.shard == picked.c.shard
+            ).returning(taken)
+        ).scalar()
+
+    def _take_waiting(self, db: Session, tier_id: int, quantity: int) -> Optional[int]:
+        """Wait for one shard with stock and take from it (None when no shard has stock)"""
+        inventory = TicketTierInventory.__table__
+        shard = db.execute(
+            select(inventory.c.shard).where(
+                inventory.c.tier_id == tier_id,
+                inventory.c.remaining > 0
+            ).order_by(self._rotation(inventory.c.shard)).limit(1)
+        ).scalar()
+        if shard is None:
+            return None
+
+        # Only this row is waited on; if another buyer emptied it, rolling back
+        # the savepoint releases it so no lock is held while waiting on the next
+        savepoint = db.begin_nested()
+        row = (inventory.c.tier_id == tier_id) & (inventory.c.shard == shard)
+        remaining = db.execute(select(inventory.c.remaining).where(row).with_for_update()).scalar()
+        if not remaining:
+            savepoint.rollback()
+            return 0
+        taken = min(remaining, quantity)
+        db.execute(update(inventory).values(remaining=inventory.c.remaining - taken).where(row))
+        savepoint.commit()
+        return taken
+
+    def take(self, db: Session, tier: TicketTier, quantity: int = 1) -> int:
+        """Take up to quantity tickets of a tier, returning how many were granted (without committing)"""
+        if tier.capacity is None:
+            return quantity
+
+        granted = 0
+        while granted < quantity:
+            taken = self._take_unlocked(db, tier.id, quantity - granted)
+            if taken is None:
+                # Every shard with stock is held by other buyers
+                taken = self._take_waiting(db, tier.id, quantity - granted)
+            if taken is None:
+                break
+            granted += taken
+
+        if granted < quantity:
+            # Sold out: don't keep listing the tier as available
+            self.availability_cache.delete(tier.event_id)
+        return granted
+
+    def give_back(self, db: Session, tier: TicketTier, quantity: int = 1) -> None:
+        """Return tickets of a tier to its inventory (without committing)"""
+        if tier.capacity is None or quantity <= 0:
+            return
+        inventory = TicketTierInventory.__table__
+        for skip_locked in (True, False):
+            # Prefer a shard no other buyer holds (or one this transaction already holds),
+            # so returning tickets after taking the event's seat row never waits
+            picked = select(inventory.c.tier_id, inventory.c.shard).where(
+                inventory.c.tier_id == tier.id
+            ).order_by(func.random()).limit(1).with_for_update(skip_locked=skip_locked).subquery()
+            returned = db.execute(
+                update(inventory).values(remaining=inventory.c.remaining + quantity).where(
+                    inventory.c.tier_id == picked.c.tier_id,
+                    inventory.c.shard == picked.c.shard
+                ).returning(inventory.c.shard)
+            ).first()
+            if returned:
+                return
+
+    def _set_capacity(self, db: Session, tier: TicketTier, capacity: Optional[int]) -> None:
+        """Re-split a tier's inventory for a new capacity, keeping tickets already sold"""
+        inventory = TicketTierInventory.__table__
+        rows = db.execute(
+            select(inventory.c.remaining).where(inventory.c.tier_id == tier.id).with_for_update()
+        ).scalars().all()
+        if tier.capacity is None:
+            sold = db.query(func.count(EventRegistration.id)).filter(
+                EventRegistration.event_id == tier.event_id,
+                EventRegistration.ticket_type == tier.name,
+                EventRegistration.status != "cancelled"
+            ).scalar()
+        else:
+            sold = tier.capacity - sum(rows)
+
+        if capacity is not None and capacity < sold:
+            raise ValueError(f"Capacity cannot be lower than the {sold} tickets already sold")
+
+        db.execute(delete(inventory).where(inventory.c.tier_id == tier.id))
+        if capacity is not None:
+            db.execute(insert(inventory), [{"tier_id": tier.id, **row} for row in self._split(capacity - sold)])
+        tier.capacity = capacity
+
+    def create_tier(self, db: Session, event_id: int, organizer_id: int, tier_data: TicketTierCreate) -> Optional[TicketTier]:
+        """Add a ticket tier to an organizer's event"""
+        event = db.query(Event.id).filter(
+            Event.id == event_id,
+            Event.organizer_id == organizer_id
+        ).first()
+
+        if not event:
+            return None
+
+        tier = TicketTier(event_id=event_id, name=tier_data.name, price=tier_data.price)
+        db.add(tier)
+        db.flush()
+        self._set_capacity(db, tier, tier_data.capacity)
+        db.commit()
+        db.refresh(tier)
+        self.availability_cache.delete(event_id)
+        return tier
+
+    def update_tier(self, db: Session, tier_id: int, organizer_id: int, tier_data: TicketTierUpdate) -> Optional[TicketTier]:
+        """Change a tier's price or capacity"""
+        tier = db.query(TicketTier).join(Event, Event.id == TicketTier.event_id).filter(
+            TicketTier.id == tier_id,
+            Event.organizer_id == organizer_id
+        ).with_for_update(of=TicketTier).first()
+
+        if not tier:
+            return None
+
+        update_data = tier_data.model_dump(exclude_unset=True)
+        if "price" in update_data and update_data["price"] is not None:
+            tier.price = update_data["price"]
+        if "capacity" in update_data:
+            self._set_capacity(db, tier, update_data["capacity"])
+
+        db.commit()
+        db.refresh(tier)
+        self.availability_cache.delete(tier.event_id)
+        return tier
+
+# Create service instance
+ticket_service = TicketService(settings.TICKET_TIER_SHARDS, settings.TICKET_TIER_CACHE_TTL_SECONDS)
@@ -0,0 +1,142 @@
+from sqlalchemy import select, delete, func, values, column, Integer, Float
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.db.database import SessionLocal
+from app.db.models import Event, EventTrendingScore
+from app.core.config import settings
+from app.services.background import PeriodicWorker
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Dict, List, Tuple
+import time
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Stored scores below this are dropped from the ranking table
+MIN_TRENDING_SCORE = 0.01
+
+class TrendingService:
+    """Time-decayed trending ranking of events (per worker, periodically persisted)
+
+    Scores use forward decay: an interaction of weight w at time t adds
+    w * 2^((t - epoch) / half_life), so existing scores never need rescaling
+    and their order is the decayed order. The ranking is a sorted list of
+    (-score, event_id), so updates are a bisect and top-N is a slice.
+
+    Deltas recorded since the last flush are added to event_trending_scores
+    (decayed in SQL), then the table is reloaded, so every worker's ranking
+    converges to the interactions seen by all workers.
+    """
+
+    def __init__(self, weights: Dict[str, float], half_life_hours: float, flush_interval: float, max_events: int):
+        self.weights = weights
+        self.half_life = half_life_hours * 3600
+        self.max_events = max_events
+        self._epoch = time.time()
+        self._scores: Dict[int, float] = {}
+        self._ranking: List[Tuple[float, int]] = []
+        self._pending: Dict[int, float] = defaultdict(float)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._worker = PeriodicWorker("trending-flush", flush_interval, self.flush)
+
+    def _growth(self, epoch: float) -> float:
+        return 2 ** ((time.time() - epoch) / self.half_life)
+
+    def _set_score(self, event_id: int, score: float) -> None:
+        old = self._scores.get(event_id)
+        if old is not None:
+            del self._ranking[bisect_left(self._ranking, (-old, event_id))]
+        self._scores[event_id] = score
+        insort(self._ranking, (-score, event_id))
+
+    def record(self, event_id: int, interaction: str, count: int = 1) -> None:
+        """Add an interaction (view, like, registration, check_in) to an event's score"""
+        weight = self.weights.get(interaction, 0.0) * count
+        if not weight:
+            return
+        with self._lock:
+            delta = weight * self._growth(self._epoch)
+            self._pending[event_id] += delta
+            self._set_score(event_id, self._scores.get(event_id, 0.0) + delta)
+
+    def top(self, limit: int = 50) -> List[Tuple[int, float]]:
+        """Get the top (event_id, current score) pairs"""
+        with self._lock:
+            decay = 1 / self._growth(self._epoch)
+            return [(event_id, -score * decay) for score, event_id in self._ranking[:limit]]
+
+    def _take(self) -> Tuple[float, Dict[int, float]]:
+        with self._lock:
+            pending = self._pending
+            self._pending = defaultdict(float)
+            return self._epoch, pending
+
+    def flush(self) -> int:
+        """Persist pending deltas and reload the merged ranking, returning events written"""
+        table = EventTrendingScore.__table__
+        decayed = table.c.score * func.power(0.5, func.extract("epoch", func.now() - table.c.updated_at) / self.half_life)
+
+        with self._flush_lock:
+            epoch, pending = self._take()
+            db = SessionLocal()
+            try:
+                if pending:
+                    # Deltas as of now; events deleted meanwhile are skipped by the join
+                    decay = 1 / self._growth(epoch)
+                    deltas = values(
+                        column("event_id", Integer), column("score", Float), name="deltas"
+                    ).data([(event_id, delta * decay) for event_id, delta in pending.items()])
+                    stmt = pg_insert(table).from_select(
+                        ["event_id", "score"],
+                        select(deltas.c.event_id, deltas.c.score).join(Event, Event.id == deltas.c.event_id)
+                    )
+                    db.execute(stmt.on_conflict_do_update(
+                        index_elements=[table.c.event_id],
+                        set_={"score": decayed + stmt.excluded.score, "updated_at": func.now()}
+                    ))
+                db.execute(delete(table).where(decayed < MIN_TRENDING_SCORE))
+                stored = db.execute(
+                    select(table.c.event_id, decayed).order_by(decayed.desc()).limit(self.max_events)
+                ).all()
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Failed to persist {len(pending)} trending scores: {str(e)}")
+                # Merge back so the next flush retries them
+                with self._lock:
+                    for event_id, delta in pending.items():
+                        self._pending[event_id] += delta
+                return 0
+            finally:
+                db.close()
+
+            with self._lock:
+                # Rebase on now; interactions recorded during the flush are kept
+                decay = 1 / self._growth(self._epoch)
+                self._epoch = time.time()
+                scores = {event_id: score for event_id, score in stored}
+                for event_id, delta in self._pending.items():
+                    self._pending[event_id] = delta * decay
+                    scores[event_id] = scores.get(event_id, 0.0) + delta * decay
+                self._scores = scores
+                self._ranking = sorted((-score, event_id) for event_id, score in scores.items())
+            return len(pending)
+
+    def start(self) -> None:
+        """Load the stored ranking and start the periodic flush"""
+        self.flush()
+        self._worker.start()
+
+    def stop(self) -> None:
+        """Stop the flusher and persist remaining deltas"""
+        self._worker.stop()
+
+# Create service instance
+trending_service = TrendingService(
+    settings.TRENDING_WEIGHTS,
+    settings.TRENDING_HALF_LIFE_HOURS,
+    settings.TRENDING_FLUSH_INTERVAL_SECONDS,
+    settings.TRENDING_MAX_EVENTS
+)
@@ -0,0 +1,173 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.db.database import SessionLocal
+from app.db.models import Event, EventViewSketch
+from app.core.config import settings
+from app.services.background import PeriodicWorker
+from datetime import date
+from typing import Dict, Optional, Tuple, Any
+import hashlib
+import math
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+class HyperLogLog:
+    """HyperLogLog cardinality sketch with one byte per register"""
+
+    def __init__(self, precision: int = 12, registers: Optional[bytes] = None):
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(registers) if registers else bytearray(self.m)
+        if len(self.registers) != self.m:
+            raise ValueError("Register size does not match precision")
+
+    @property
+    def error(self) -> float:
+        """Relative standard error of the estimate"""
+        return 1.04 / math.sqrt(self.m)
+
+    def add(self, value: Any) -> None:
+        h = int.from_bytes(hashlib.blake2b(str(value).encode(), digest_size=8).digest(), "big")
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Union another sketch into this one (register-wise max)"""
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+    def count(self) -> int:
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m * self.m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.m and zeros:
+            # Small range correction (linear counting)
+            estimate = self.m * math.log(self.m / zeros)
+        return int(round(estimate))
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.registers)
+
+class UniqueViewerService:
+    """Unique viewers per event (total and per day) using HyperLogLog sketches
+
+    Sketches touched since the last flush are kept in memory and merged into
+    event_view_sketches periodically; merging is a register-wise max, so
+    several workers can persist into the same rows without double counting.
+    """
+
+    TOTAL = "total"
+
+    def __init__(self, precision: int, flush_interval: float):
+        self.precision = precision
+        self._sketches: Dict[Tuple[int, str], HyperLogLog] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._worker = PeriodicWorker("unique-viewers-flush", flush_interval, self.flush)
+
+    def record(self, event_id: int, user_id: int) -> None:
+        """Add a viewer to the event's total and today's sketch"""
+        with self._lock:
+            for period in (self.TOTAL, date.today().isoformat()):
+                key = (event_id, period)
+                if key not in self._sketches:
+                    self._sketches[key] = HyperLogLog(self.precision)
+                self._sketches[key].add(user_id)
+
+    def _take(self) -> Dict[Tuple[int, str], HyperLogLog]:
+        with self._lock:
+            sketches = self._sketches
+            self._sketches = {}
+            return sketches
+
+    def flush(self) -> int:
+        """Merge in-memory sketches into the stored ones, returning rows written"""
+        with self._flush_lock:
+            sketches = self._take()
+            if not sketches:
+                return 0
+
+            db = SessionLocal()
+            try:
+                # Events deleted since their views were recorded are dropped, not
+                # retried; the rest are key-share locked so they stay until commit
+                live = {event_id for (event_id,) in db.query(Event.id).filter(
+                    Event.id.in_({event_id for event_id, _ in sketches})
+                ).with_for_update(read=True, key_share=True).all()}
+                sketches = {key: sketch for key, sketch in sketches.items() if key[0] in live}
+                if not sketches:
+                    db.commit()
+                    return 0
+
+                table = EventViewSketch.__table__
+                inserted = set(db.execute(
+                    pg_insert(table).on_conflict_do_nothing(
+                        index_elements=[table.c.event_id, table.c.period]
+                    ).returning(table.c.event_id, table.c.period),
+                    [{"event_id": event_id, "period": period, "registers": sketch.to_bytes()}
+                     for (event_id, period), sketch in sketches.items()]
+                ).all())
+
+                # Rows that already existed are merged register-wise
+                existing = [key for key in sketches if key not in inserted]
+                if existing:
+                    for row in db.query(EventViewSketch).filter(
+                        tuple_(EventViewSketch.event_id, EventViewSketch.period).in_(existing)
+                    ).with_for_update().all():
+                        sketch = sketches[(row.event_id, row.period)]
+                        sketch.merge(HyperLogLog(self.precision, row.registers))
+                        row.registers = sketch.to_bytes()
+
+                db.commit()
+                return len(sketches)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Failed to persist {len(sketches)} viewer sketches: {str(e)}")
+                # Merge back so the next flush retries them
+                with self._lock:
+                    for key, sketch in sketches.items():
+                        if key in self._sketches:
+                            sketch.merge(self._sketches[key])
+                        self._sketches[key] = sketch
+                return 0
+            finally:
+                db.close()
+
+    def estimate(self, db: Session, event_id: int, period: str = TOTAL) -> int:
+        """Estimate unique viewers from the stored sketch plus unflushed views"""
+        sketch = HyperLogLog(self.precision)
+        row = db.query(EventViewSketch).filter(
+            EventViewSketch.event_id == event_id,
+            EventViewSketch.period == period
+        ).first()
+        if row:
+            sketch.merge(HyperLogLog(self.precision, row.registers))
+        with self._lock:
+            pending = self._sketches.get((event_id, period))
+            if pending:
+                sketch.merge(pending)
+        return sketch.count()
+
+    def get_event_stats(self, db: Session, event_id: int) -> Dict[str, Any]:
+        """Get total and today's unique viewers with the sketch error bound"""
+        return {
+            "unique_viewers": self.estimate(db, event_id),
+            "unique_viewers_today": self.estimate(db, event_id, date.today().isoformat()),
+            "unique_viewers_error": round(HyperLogLog(self.precision).error, 4)
+        }
+
+    def start(self) -> None:
+        """Start the background flusher"""
+        self._worker.start()
+
+    def stop(self) -> None:
+        """Stop the flusher and persist remaining sketches"""
+        self._worker.stop()
+
+# Create service instance
+unique_viewer_service = UniqueViewerService(settings.HLL_PRECISION, settings.HLL_FLUSH_INTERVAL_SECONDS)
@@ -0,0 +1,84 @@
+from app.db.database import SessionLocal
+from app.core.config import settings
+from app.services.background import PeriodicWorker
+from app.services.counter_service import counter_service
+from collections import Counter
+from typing import Dict
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ViewCounter:
+    """Write-behind buffer for event view counts (per worker)
+
+    Views are accumulated in memory and flushed as one multi-row
+    `views_count = views_count + n` upsert into event_counters every flush
+    interval, or as soon as the number of unflushed views reaches the loss
+    bound.
+    """
+
+    def __init__(self, flush_interval: float, max_pending: int):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Counter = Counter()
+        self._pending_total = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._worker = PeriodicWorker("view-counter-flush", flush_interval, self.flush)
+
+    def record(self, event_id: int, count: int = 1) -> None:
+        """Buffer a view; wakes the flusher when the loss bound is reached"""
+        with self._lock:
+            self._pending[event_id] += count
+            self._pending_total += count
+            if self._pending_total >= self.max_pending:
+                self._worker.wake()
+
+    def pending(self, event_id: int) -> int:
+        """Get views buffered but not yet written for an event"""
+        with self._lock:
+            return self._pending.get(event_id, 0)
+
+    def _take(self) -> Dict[int, int]:
+        with self._lock:
+            batch = dict(self._pending)
+            self._pending.clear()
+            self._pending_total = 0
+            return batch
+
+    def flush(self) -> int:
+        """Write buffered views in one batched upsert, returning events flushed"""
+        with self._flush_lock:
+            batch = self._take()
+            if not batch:
+                return 0
+
+            db = SessionLocal()
+            try:
+                written = counter_service.increment_many(db, "views_count", batch)
+                db.commit()
+                # Views of events deleted since they were recorded are dropped, not retried
+                if len(written) < len(batch):
+                    logger.info(f"Dropped views of {len(batch) - len(written)} deleted events")
+                return len(written)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Failed to flush {len(batch)} view counts: {str(e)}")
+                # Put the views back so the next flush retries them
+                for event_id, count in batch.items():
+                    self.record(event_id, count)
+                return 0
+            finally:
+                db.close()
+
+    def start(self) -> None:
+        """Start the background flusher"""
+        self._worker.start()
+
+    def stop(self) -> None:
+        """Stop the flusher and write any remaining views"""
+        self._worker.stop()
+
+# Create counter instance
+view_counter = ViewCounter(settings.VIEW_FLUSH_INTERVAL_SECONDS, settings.VIEW_MAX_PENDING)
@@ -0,0 +1,82 @@
+"""Local stand-in payment provider: replays bursts of signed webhooks for load tests
+
+Example (server running with PAYMENT_WEBHOOK_SECRETS='{"local": "dev-secret"}'):
+
+    python fake_payment_provider.py --secret dev-secret --registrations 1-5000 --events 20000
+"""
+import argparse
+import hashlib
+import hmac
+import json
+import random
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+def sign(secret, timestamp, body):
+    """Same scheme as the API: hex HMAC-SHA256 of "<timestamp>.<body>" """
+    return hmac.new(secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256).hexdigest()
+
+def make_events(registration_ids, count, failure_rate, duplicate_rate):
+    """Payment events for random registrations; some fail first, some are redelivered"""
+    events = []
+    while len(events) < count:
+        registration_id = random.choice(registration_ids)
+        if random.random() < failure_rate:
+            events.append({"id": f"evt_{uuid.uuid4().hex}", "type": "payment.failed",
+                           "data": {"registration_id": registration_id}})
+        events.append({"id": f"evt_{uuid.uuid4().hex}", "type": "payment.succeeded",
+                       "data": {"registration_id": registration_id}})
+        if random.random() < duplicate_rate:
+            events.append(events[-1])
+    return events[:count]
+
+def deliver(url, secret, event):
+    body = json.dumps(event).encode()
+    timestamp = str(int(time.time()))
+    request = urllib.request.Request(url, data=body, method="POST", headers={
+        "Content-Type": "application/json",
+        "X-Webhook-Timestamp": timestamp,
+        "X-Webhook-Signature": f"sha256={sign(secret, timestamp, body)}",
+    })
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            duplicate = json.loads(response.read()).get("duplicate")
+            status = f"{response.status} duplicate" if duplicate else str(response.status)
+    except urllib.error.HTTPError as e:
+        status = str(e.code)
+    except OSError as e:
+        status = type(e).__name__
+    return status, time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000/api/v1/payments/webhooks/local")
+    parser.add_argument("--secret", required=True)
+    parser.add_argument("--registrations", default="1-1000", help="registration id range, e.g. 1-5000")
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--failure-rate", type=float, default=0.1, help="share of payments that fail before succeeding")
+    parser.add_argument("--duplicate-rate", type=float, default=0.05, help="share of events delivered twice")
+    args = parser.parse_args()
+
+    first, last = (int(part) for part in args.registrations.split("-"))
+    events = make_events(list(range(first, last + 1)), args.events, args.failure_rate, args.duplicate_rate)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        results = list(pool.map(lambda event: deliver(args.url, args.secret, event), events))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for _, latency in results)
+    print(f"{len(results)} webhooks in {elapsed:.2f}s ({len(results) / elapsed:.0f}/s)")
+    print("responses:", dict(Counter(status for status, _ in results)))
+    for label, quantile in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+        print(f"{label}: {latencies[int(quantile * (len(latencies) - 1))] * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Fixtures for tests that run against a real PostgreSQL database
+
+The suite resets the public schema of TEST_DATABASE_URL, so point it at a
+throwaway database. Without it the tests are not collected. Benchmarks are
+marked `benchmark` and only run with RUN_BENCHMARKS=1.
+"""
+import os
+import uuid
+from datetime import date, time, timedelta
+
+import pytest
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+if not TEST_DATABASE_URL:
+    collect_ignore_glob = ["test_*.py"]
+else:
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+    os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: slow measurement, run with RUN_BENCHMARKS=1")
+
+def pytest_collection_modifyitems(config, items):
+    if os.getenv("RUN_BENCHMARKS") == "1":
+        return
+    skip = pytest.mark.skip(reason="benchmark; set RUN_BENCHMARKS=1")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+@pytest.fixture(scope="session")
+def database():
+    """Fresh schema with the default roles, users and sample events"""
+    import contextlib
+    import io
+    from sqlalchemy import text
+    from app.db.database import engine
+    from app.db.init_db import init_db
+
+    with engine.connect() as conn:
+        conn.execute(text("DROP SCHEMA public CASCADE"))
+        conn.execute(text("CREATE SCHEMA public"))
+        conn.commit()
+    with contextlib.redirect_stdout(io.StringIO()):
+        init_db()
+    return engine
+
+@pytest.fixture
+def db(database):
+    from app.db.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+@pytest.fixture(scope="session")
+def client(database):
+    # Not entered as a context manager, so the background workers stay off
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    return TestClient(app)
+
+@pytest.fixture
+def organizer(db):
+    from app.db.models import User
+
+    return db.query(User).filter(User.email == "organizer@eventorganizer.com").one()
+
+def auth_headers(user):
+    from app.core.security import create_access_token
+
+    return {"Authorization": "Bearer " + create_access_token({"sub": user.email, "user_id": user.id})}
+
+@pytest.fixture
+def make_users(db, organizer):
+    """Insert n users with one executemany; returns their ids"""
+    from sqlalchemy import insert
+    from app.db.models import User
+
+    def make(n):
+        users = User.__table__
+        prefix = uuid.uuid4().hex[:8]
+        ids = db.execute(insert(users).returning(users.c.id, sort_by_parameter_order=True), [{
+            "email": f"{prefix}-{i}@test.example",
+            "full_name": f"User {i}",
+            "hashed_password": organizer.hashed_password,
+            "role_id": organizer.role_id,
+            "is_active": True,
+            "is_verified": True
+        } for i in range(n)]).scalars().all()
+        db.commit()
+        return ids
+    return make
+
+@pytest.fixture
+def make_event(db, organizer):
+    """Create a published event owned by the sample organizer"""
+    from datetime import datetime
+    from app.db.models import Event, EventStatus
+
+    def make(**overrides):
+        start = date.today() + timedelta(days=30)
+        event = Event(**{
+            "title": f"Test event {uuid.uuid4().hex[:8]}",
+            "start_date": start,
+            "end_date": start,
+            "start_time": time(9, 0),
+            "end_time": time(17, 0),
+            "location": "Test venue",
+            "organizer_id": organizer.id,
+            "status": EventStatus.PUBLISHED,
+            "published_at": datetime.utcnow(),
+            **overrides
+        })
+        db.add(event)
+        db.commit()
+        return event
+    return make
@@ -0,0 +1,65 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.db.database import SessionLocal
+from app.db.models import Event, RegistrationRequest
+from app.services.admission_queue import admission_queue
+
+def in_session(action, *args):
+    db = SessionLocal()
+    try:
+        return action(db, *args)
+    finally:
+        db.close()
+
+def enqueue_all(event_id, users, threads):
+    with ThreadPoolExecutor(threads) as pool:
+        return list(pool.map(
+            lambda user_id: in_session(admission_queue.enqueue, event_id, user_id, {}).id, users
+        ))
+
+def drain_concurrently(event_id, drainers):
+    # Every worker runs a consumer; the advisory lock lets one drain the event at a time
+    with ThreadPoolExecutor(drainers) as pool:
+        return sum(pool.map(lambda _: in_session(admission_queue.drain_event, event_id), range(drainers)))
+
+def assert_fifo(db, event_id, capacity):
+    tickets = db.query(RegistrationRequest).filter(
+        RegistrationRequest.event_id == event_id
+    ).order_by(RegistrationRequest.id).all()
+    assert [ticket.status for ticket in tickets] == ["confirmed"] * capacity + ["waitlisted"] * (len(tickets) - capacity)
+    assert [ticket.waitlist_position for ticket in tickets[capacity:]] == list(range(1, len(tickets) - capacity + 1))
+    assert db.query(Event.current_registrations).filter(Event.id == event_id).scalar() == capacity
+
+def test_concurrent_consumers_admit_in_ticket_order(db, make_event, make_users, monkeypatch):
+    monkeypatch.setattr(admission_queue, "batch_size", 7)
+    event_id = make_event(max_capacity=20, use_admission_queue=True).id
+    enqueue_all(event_id, make_users(60), threads=8)
+
+    processed = 0
+    while processed < 60:
+        processed += drain_concurrently(event_id, drainers=4)
+    assert_fifo(db, event_id, 20)
+
+@pytest.mark.benchmark
+def test_admission_queue_throughput_and_fairness(db, make_event, make_users):
+    requests, capacity = 5000, 500
+    event_id = make_event(max_capacity=capacity, use_admission_queue=True).id
+    # Committed last, so this session holds no connection while the threads run
+    users = make_users(requests)
+
+    started = time.perf_counter()
+    enqueue_all(event_id, users, threads=15)
+    enqueued = time.perf_counter() - started
+
+    started = time.perf_counter()
+    processed = 0
+    while processed < requests:
+        processed += drain_concurrently(event_id, drainers=4)
+    drained = time.perf_counter() - started
+
+    print(f"\nadmission queue: {requests} requests, enqueue {requests / enqueued:.0f}/s, "
+          f"drain {requests / drained:.0f}/s (batch size {admission_queue.batch_size})")
+    assert_fifo(db, event_id, capacity)
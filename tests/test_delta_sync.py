@@ -0,0 +1,62 @@
+from sqlalchemy import text
+
+from app.db.database import SessionLocal
+from app.services.event_service import event_service
+
+def rename(session, event_id, title):
+    session.execute(text("UPDATE events SET title = :title WHERE id = :id"), {"title": title, "id": event_id})
+
+def test_changes_wait_for_transactions_that_commit_out_of_order(db, make_event):
+    first, second = make_event(), make_event()
+    cursor = event_service.get_changes(db, 0, 1000)["cursor"]
+    db.commit()
+
+    slow, fast = SessionLocal(), SessionLocal()
+    try:
+        # slow takes the lower sequence value but commits last
+        rename(slow, first.id, "slow")
+        rename(fast, second.id, "fast")
+        fast.commit()
+
+        early = event_service.get_changes(db, cursor, 1000)
+        db.commit()
+        assert early["changes"] == []
+        assert early["cursor"] == cursor
+
+        slow.commit()
+        late = event_service.get_changes(db, early["cursor"], 1000)
+        assert [event.id for event in late["changes"]] == [first.id, second.id]
+        assert late["cursor"] > cursor
+    finally:
+        slow.close()
+        fast.close()
+
+def test_deletes_wait_for_transactions_that_commit_out_of_order(db, make_event):
+    updated, deleted = make_event().id, make_event().id
+    cursor = event_service.get_changes(db, 0, 1000)["cursor"]
+    db.commit()
+
+    slow, fast = SessionLocal(), SessionLocal()
+    try:
+        rename(slow, updated, "slow")
+        fast.execute(text("DELETE FROM events WHERE id = :id"), {"id": deleted})
+        fast.commit()
+
+        assert event_service.get_changes(db, cursor, 1000)["deleted"] == []
+        db.commit()
+
+        slow.commit()
+        late = event_service.get_changes(db, cursor, 1000)
+        assert [event.id for event in late["changes"]] == [updated]
+        assert late["deleted"] == [deleted]
+    finally:
+        slow.close()
+        fast.close()
+
+def test_own_uncommitted_changes_do_not_hold_back_the_cursor(db, make_event):
+    event = make_event()
+    cursor = event_service.get_changes(db, 0, 1000)["cursor"]
+
+    rename(db, event.id, "mine")
+    changes = event_service.get_changes(db, cursor, 1000)
+    assert [changed.id for changed in changes["changes"]] == [event.id]
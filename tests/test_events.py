@@ -0,0 +1,12 @@
+from app.services.view_counter import view_counter
+
+from conftest import auth_headers
+
+def test_update_includes_unflushed_views(client, organizer, make_event):
+    event_id = make_event().id
+    view_counter.record(event_id, 3)
+
+    updated = client.put(f"/api/v1/events/{event_id}", headers=auth_headers(organizer), json={"title": "Renamed"})
+    assert updated.status_code == 200, updated.text
+    assert updated.json()["title"] == "Renamed"
+    assert updated.json()["views_count"] == 3
@@ -0,0 +1,42 @@
+from app.db.models import EventStatus
+from app.services.event_service import event_service
+from app.services.feed_service import feed_service
+
+def feed_ids(db, user_id):
+    events, _ = feed_service.get_feed(db, user_id)
+    return [event.id for event in events]
+
+def test_events_read_on_demand_stay_in_feeds_after_followers_drop(db, make_users, make_event, monkeypatch):
+    monkeypatch.setattr(feed_service, "fanout_max_followers", 1)
+    organizer_id, reader, leaver, newcomer = make_users(4)
+    feed_service.follow(db, reader, organizer_id)
+    feed_service.follow(db, leaver, organizer_id)
+
+    def publish():
+        event = make_event(organizer_id=organizer_id, status=EventStatus.DRAFT, published_at=None)
+        return event_service.publish_event(db, event.id, organizer_id)
+
+    # Two followers: published while fan-out on read
+    on_read = publish()
+    assert on_read.feed_on_read
+    assert feed_ids(db, reader) == [on_read.id]
+
+    # Back under the threshold: new events are fanned out, the earlier one is still read on demand
+    feed_service.unfollow(db, leaver, organizer_id)
+    fanned_out = publish()
+    assert not fanned_out.feed_on_read
+    assert feed_ids(db, reader) == [fanned_out.id, on_read.id]
+
+    # New followers get the fanned-out event backfilled and the other one on read
+    feed_service.follow(db, newcomer, organizer_id)
+    assert feed_ids(db, newcomer) == [fanned_out.id, on_read.id]
+
+def test_publishing_again_keeps_the_feed_position(db, make_users, make_event):
+    organizer_id, reader = make_users(2)
+    feed_service.follow(db, reader, organizer_id)
+    older, newer = (make_event(organizer_id=organizer_id, status=EventStatus.DRAFT, published_at=None) for _ in range(2))
+    published_at = event_service.publish_event(db, older.id, organizer_id).published_at
+    event_service.publish_event(db, newer.id, organizer_id)
+
+    assert event_service.publish_event(db, older.id, organizer_id).published_at == published_at
+    assert feed_ids(db, reader) == [newer.id, older.id]
@@ -0,0 +1,58 @@
+import asyncio
+
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.idempotency import IdempotencyMiddleware, idempotency_store
+
+def make_request(key="retry-1"):
+    async def receive():
+        return {"type": "http.request", "body": b"{}", "more_body": False}
+    return Request({
+        "type": "http",
+        "method": "POST",
+        "path": "/api/v1/events/1/register",
+        "query_string": b"",
+        "headers": [(b"idempotency-key", key.encode()), (b"authorization", b"Bearer token")]
+    }, receive)
+
+async def hang(request):
+    await asyncio.Event().wait()
+
+async def ok(request):
+    async def body():
+        yield b"registered"
+    return StreamingResponse(body(), status_code=201)
+
+def test_cancelled_request_releases_its_key():
+    idempotency_store.clear()
+    middleware = IdempotencyMiddleware(app=None)
+
+    async def scenario():
+        first = asyncio.create_task(middleware.dispatch(make_request(), hang))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        await asyncio.gather(first, return_exceptions=True)
+        # The retry runs instead of waiting on the abandoned claim
+        return await asyncio.wait_for(middleware.dispatch(make_request(), ok), timeout=1)
+
+    response = asyncio.run(scenario())
+    assert response.status_code == 201
+    assert response.body == b"registered"
+
+def test_duplicate_stops_waiting_for_a_stuck_request(monkeypatch):
+    idempotency_store.clear()
+    monkeypatch.setattr(settings, "IDEMPOTENCY_WAIT_SECONDS", 0.05)
+    middleware = IdempotencyMiddleware(app=None)
+
+    async def scenario():
+        first = asyncio.create_task(middleware.dispatch(make_request(), hang))
+        await asyncio.sleep(0.01)
+        try:
+            return await asyncio.wait_for(middleware.dispatch(make_request(), ok), timeout=1)
+        finally:
+            first.cancel()
+            await asyncio.gather(first, return_exceptions=True)
+
+    assert asyncio.run(scenario()).status_code == 409
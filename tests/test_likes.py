@@ -0,0 +1,34 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from app.db.database import SessionLocal
+from app.db.models import Event, EventLike
+from app.services.event_service import event_service
+
+def in_session(action, *args):
+    db = SessionLocal()
+    try:
+        return action(db, *args)
+    finally:
+        db.close()
+
+def test_parallel_likes_count_each_user_once(db, make_event, make_users):
+    event = make_event()
+    users = make_users(300)
+
+    # Every user double-taps: two likes in flight at once
+    with ThreadPoolExecutor(32) as pool:
+        liked = list(pool.map(lambda user_id: in_session(event_service.like_event, event.id, user_id), users * 2))
+
+    assert liked.count(True) == 300
+    assert db.query(EventLike).filter(EventLike.event_id == event.id).count() == 300
+    assert db.query(Event.likes_count).filter(Event.id == event.id).scalar() == 300
+
+    with ThreadPoolExecutor(32) as pool:
+        unliked = list(pool.map(lambda user_id: in_session(event_service.unlike_event, event.id, user_id), users[:150] * 2))
+
+    assert unliked.count(True) == 150
+    assert db.query(Event.likes_count).filter(Event.id == event.id).scalar() == 150
+
+def test_like_of_missing_event_is_rejected(db, make_users):
+    user_id, = make_users(1)
+    assert event_service.like_event(db, 10 ** 9, user_id) is False
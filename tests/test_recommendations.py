@@ -0,0 +1,144 @@
+import time
+from datetime import date, time as clock, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import delete, func, insert, select, text, update
+
+from app.db.database import SessionLocal, engine
+from app.db.models import Event, EventCooccurrence, EventLike, EventNeighbor, EventStatus, PendingInteraction
+from app.services.event_service import event_service
+from app.services.recommendation_service import SIMILAR_EVENTS_LOCK_KEY, recommendation_service
+
+def matrix(db):
+    db.commit()
+    return {
+        (row.event_id, row.other_event_id): row.count
+        for row in db.execute(select(EventCooccurrence.event_id, EventCooccurrence.other_event_id, EventCooccurrence.count))
+    }
+
+def like_all(pairs):
+    def like(pair):
+        db = SessionLocal()
+        try:
+            return event_service.like_event(db, pair[1], pair[0])
+        finally:
+            db.close()
+    with ThreadPoolExecutor(16) as pool:
+        assert all(pool.map(like, pairs))
+
+def test_folded_interactions_match_a_rebuild(db, make_event, make_users, monkeypatch):
+    monkeypatch.setattr(recommendation_service, "fold_batch_size", 7)
+    recommendation_service.rebuild()
+    events = [make_event().id for _ in range(4)]
+    users = make_users(12)
+
+    # Likes only queue rows; the matrix changes when the refresh folds them
+    like_all([(user, events[0]) for user in users[:6]])
+    before = matrix(db)
+    assert db.query(PendingInteraction).count() == 6
+    recommendation_service.refresh_neighbors()
+    like_all([(user, event) for i, user in enumerate(users) for event in events[1:1 + i % 3]])
+    recommendation_service.refresh_neighbors()
+
+    folded = matrix(db)
+    assert folded != before
+    assert db.query(PendingInteraction).count() == 0
+    assert folded[(events[0], events[0])] == 6
+
+    recommendation_service.rebuild()
+    assert matrix(db) == folded
+
+def neighbor_scores(db, event_id):
+    db.commit()
+    return dict(db.execute(
+        select(EventNeighbor.neighbor_id, EventNeighbor.score).where(EventNeighbor.event_id == event_id)
+    ).all())
+
+def test_refresh_rescores_rows_pointing_at_a_changed_event(db, make_event, make_users):
+    recommendation_service.rebuild()
+    first, second = make_event().id, make_event().id
+    both, only_second = make_users(2)
+    like_all([(both, first), (both, second)])
+    recommendation_service.refresh_neighbors()
+    assert neighbor_scores(db, first) == {second: pytest.approx(1.0)}
+    # Out of the refresh overlap, so only cells written from here on look changed
+    db.execute(update(EventCooccurrence).values(updated_at=func.now() - timedelta(minutes=10)))
+    db.commit()
+
+    # Only the second event's diagonal changes; the first event's row must follow
+    like_all([(only_second, second)])
+    recommendation_service.refresh_neighbors()
+    assert neighbor_scores(db, first) == {second: pytest.approx(2 ** -0.5)}
+
+def test_unlikes_leave_the_matrix_until_the_next_rebuild(db, make_event, make_users):
+    recommendation_service.rebuild()
+    event = make_event().id
+    user, = make_users(1)
+    like_all([(user, event)])
+    recommendation_service.refresh_neighbors()
+    assert event_service.unlike_event(db, event, user)
+
+    recommendation_service.refresh_neighbors()
+    assert matrix(db)[(event, event)] == 1
+    recommendation_service.rebuild()
+    assert (event, event) not in matrix(db)
+
+def test_refresh_is_skipped_while_another_worker_holds_the_lock(db, make_event, make_users):
+    event = make_event()
+    user, = make_users(1)
+    assert event_service.like_event(db, event.id, user)
+
+    with engine.connect() as other:
+        other.execute(select(func.pg_advisory_lock(*SIMILAR_EVENTS_LOCK_KEY)))
+        try:
+            assert recommendation_service.refresh_neighbors() == 0
+            assert db.query(PendingInteraction).filter(PendingInteraction.event_id == event.id).count() == 1
+        finally:
+            other.execute(select(func.pg_advisory_unlock(*SIMILAR_EVENTS_LOCK_KEY)))
+
+    recommendation_service.refresh_neighbors()
+    db.commit()
+    assert db.query(PendingInteraction).filter(PendingInteraction.event_id == event.id).count() == 0
+
+@pytest.mark.benchmark
+def test_rebuild_100k_users_10k_events(db, organizer, make_users):
+    users, events, per_user = 100_000, 10_000, 5
+    user_ids = make_users(users)
+    start = date.today() + timedelta(days=30)
+    table = Event.__table__
+    event_ids = db.execute(insert(table).returning(table.c.id, sort_by_parameter_order=True), [{
+        "title": f"Benchmark event {i}",
+        "start_date": start,
+        "end_date": start,
+        "start_time": clock(9, 0),
+        "end_time": clock(17, 0),
+        "location": "Benchmark venue",
+        "organizer_id": organizer.id,
+        "status": EventStatus.PUBLISHED
+    } for i in range(events)]).scalars().all()
+    # Each user likes `per_user` distinct events spread over the catalogue
+    db.execute(text("""
+        INSERT INTO event_likes (event_id, user_id)
+        SELECT :first_event + (u * 7919 + k * (u % 97 + 1) * 104729) % :events, :first_user + u
+        FROM generate_series(0, :users - 1) AS u, generate_series(0, :per_user - 1) AS k
+    """), {"first_event": event_ids[0], "events": events, "first_user": user_ids[0], "users": users, "per_user": per_user})
+    db.commit()
+
+    try:
+        started = time.perf_counter()
+        cells = recommendation_service.rebuild()
+        elapsed = time.perf_counter() - started
+        print(f"\nrebuild: {users} users x {events} events, {users * per_user} interactions, "
+              f"{cells} cells in {elapsed:.1f}s")
+
+        diagonal = db.execute(select(func.sum(EventCooccurrence.count)).where(
+            EventCooccurrence.event_id == EventCooccurrence.other_event_id
+        )).scalar()
+        assert diagonal >= users * per_user
+    finally:
+        db.rollback()
+        db.execute(delete(EventLike).where(EventLike.event_id.in_(event_ids)))
+        db.execute(delete(Event).where(Event.id.in_(event_ids)))
+        db.commit()
+        recommendation_service.rebuild()
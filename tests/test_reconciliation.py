@@ -0,0 +1,46 @@
+from sqlalchemy import func, select, update
+
+from app.db.database import engine
+from app.db.models import EventCounter
+from app.schemas.event import SeatHoldCreate, SeatMapCreate, SeatSectionCreate
+from app.services.event_service import event_service
+from app.services.reconciliation_service import RECONCILE_LOCK_KEY, reconciliation_service
+from app.services.seating_service import seating_service
+
+def test_run_is_skipped_while_another_worker_holds_the_lock(database):
+    with engine.connect() as other:
+        assert other.execute(select(func.pg_try_advisory_lock(*RECONCILE_LOCK_KEY))).scalar()
+        try:
+            assert reconciliation_service.run() is None
+        finally:
+            other.execute(select(func.pg_advisory_unlock(*RECONCILE_LOCK_KEY)))
+
+    assert reconciliation_service.run() is not None
+    # The lock is released after a run
+    assert reconciliation_service.run() is not None
+
+def stored_registrations(db, event_id):
+    return db.execute(
+        select(func.coalesce(func.sum(EventCounter.registrations_count), 0)).where(EventCounter.event_id == event_id)
+    ).scalar()
+
+def test_seated_registrations_reconcile_to_their_seat_count(db, organizer, make_users, make_event):
+    event = make_event()
+    seating_service.set_seat_map(db, event.id, organizer.id, SeatMapCreate(
+        sections=[SeatSectionCreate(name="Stalls", rows=2, seats_per_row=10)]
+    ))
+    user_id, = make_users(1)
+    hold = seating_service.hold_seats(db, event.id, user_id, SeatHoldCreate(quantity=4))
+    assert event_service.confirm_seat_hold(db, hold.id, user_id, {})
+    assert stored_registrations(db, event.id) == 4
+
+    assert reconciliation_service.reconcile_registrations(db, event.id, event.id) == []
+    db.commit()
+    assert stored_registrations(db, event.id) == 4
+
+    # Drift is corrected to the seats held, not to the number of registrations
+    db.execute(update(EventCounter).where(EventCounter.event_id == event.id).values(registrations_count=0))
+    corrections = reconciliation_service.reconcile_registrations(db, event.id, event.id)
+    db.commit()
+    assert corrections == [{"id": event.id, "stored": 0, "actual": 4}]
+    assert stored_registrations(db, event.id) == 4
@@ -0,0 +1,36 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import func
+
+from app.db.database import SessionLocal
+from app.db.models import Event, EventRegistration
+from app.services.event_service import event_service
+
+def register(event_id, user_id):
+    db = SessionLocal()
+    try:
+        registration = event_service.register_for_event(db, event_id, user_id, {})
+        return registration.status if registration else None
+    finally:
+        db.close()
+
+def test_5000_concurrent_registrations_fill_500_seats_exactly(db, make_event, make_users):
+    event_id = make_event(max_capacity=500).id
+    # Committed last, so this session holds no connection while the threads run
+    users = make_users(5000)
+    # 200 users double-submit: both requests are in flight at once
+    attempts = [user_id for user_id in users[:200] for _ in range(2)] + users[200:]
+
+    # As many requests in flight as the default connection pool allows (5 + 10 overflow)
+    with ThreadPoolExecutor(15) as pool:
+        results = list(pool.map(lambda user_id: register(event_id, user_id), attempts))
+
+    assert results.count("confirmed") == 500
+    assert results.count("waitlisted") == 4500
+    assert results.count(None) == 200
+
+    statuses = dict(db.query(EventRegistration.status, func.count()).filter(
+        EventRegistration.event_id == event_id
+    ).group_by(EventRegistration.status).all())
+    assert statuses == {"confirmed": 500, "waitlisted": 4500}
+    assert db.query(Event.current_registrations).filter(Event.id == event_id).scalar() == 500
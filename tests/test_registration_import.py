@@ -0,0 +1,89 @@
+import io
+import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import func
+
+from app.db.database import SessionLocal
+from app.db.models import Event, EventRegistration, User
+from app.services.admission_queue import admission_queue
+from app.services.event_service import event_service
+from app.services.registration_import import RegistrationImportService
+
+def read_report(report):
+    report.seek(0)
+    return [json.loads(line) for line in report]
+
+def test_failed_batch_keeps_the_report_of_earlier_batches(db, organizer, make_event, monkeypatch):
+    event = make_event(max_capacity=100)
+    prefix = uuid.uuid4().hex[:8]
+    upload = "\n".join(json.dumps({"email": f"{prefix}-{i}@test.example"}) for i in range(5)).encode()
+
+    admit = admission_queue.admit
+    calls = []
+    def fail_second_batch(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 2:
+            raise RuntimeError("connection reset")
+        return admit(*args, **kwargs)
+    monkeypatch.setattr(admission_queue, "admit", fail_second_batch)
+
+    report = io.StringIO()
+    summary = RegistrationImportService(batch_size=2).import_registrations(
+        db, event.id, organizer.id, io.BytesIO(upload), "ndjson", report
+    )
+
+    lines = read_report(report)
+    assert summary == {"confirmed": 2}
+    assert [line["status"] for line in lines[:2]] == ["confirmed", "confirmed"]
+    assert lines[2]["row"] == 3
+    assert "connection reset" in lines[2]["error"]
+    assert lines[3] == {"summary": {"confirmed": 2}}
+
+def test_import_and_direct_registrations_share_the_seats(db, organizer, make_event, make_users):
+    event_id = make_event(max_capacity=100, allow_waitlist=True).id
+    users = make_users(300)
+    emails = dict(db.query(User.id, User.email).filter(User.id.in_(users)).all())
+    # Release the connection for the threads below
+    db.rollback()
+    upload = "\n".join(json.dumps({"email": emails[user_id]}) for user_id in users).encode()
+
+    def run_import():
+        session = SessionLocal()
+        try:
+            report = io.StringIO()
+            return RegistrationImportService(batch_size=50).import_registrations(
+                session, event_id, organizer.id, io.BytesIO(upload), "ndjson", report
+            )
+        finally:
+            session.close()
+
+    def register_then_cancel(user_id):
+        session = SessionLocal()
+        try:
+            if not event_service.register_for_event(session, event_id, user_id, {}):
+                return 0
+            # Every third one frees its place again, promoting from the waitlist
+            if user_id % 3 == 0 and event_service.cancel_registration(session, event_id, user_id):
+                return -1
+            return 1
+        finally:
+            session.close()
+
+    # One import plus direct registrations within the connection pool (5 + 10 overflow)
+    with ThreadPoolExecutor(14) as pool:
+        imported = pool.submit(run_import)
+        direct = list(pool.map(register_then_cancel, users))
+        summary = imported.result()
+
+    statuses = dict(db.query(EventRegistration.status, func.count()).filter(
+        EventRegistration.event_id == event_id
+    ).group_by(EventRegistration.status).all())
+    cancelled = direct.count(-1)
+    registered = summary.get("confirmed", 0) + summary.get("waitlisted", 0) + direct.count(1) + cancelled
+    assert statuses.get("confirmed", 0) + statuses.get("waitlisted", 0) == registered - cancelled
+    # Cancelled rows can be registered again by a later import batch
+    assert statuses.get("cancelled", 0) <= cancelled
+    assert statuses["confirmed"] == 100
+    assert db.query(Event.current_registrations).filter(Event.id == event_id).scalar() == 100
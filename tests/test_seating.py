@@ -0,0 +1,10 @@
+from app.schemas.event import SeatMapCreate, SeatRef, SeatSectionCreate
+from app.services.seating_service import seating_service
+
+def test_fully_blocked_map_has_no_capacity(db, organizer, make_event):
+    event = make_event()
+    seating_service.set_seat_map(db, event.id, organizer.id, SeatMapCreate(sections=[SeatSectionCreate(
+        name="Box", rows=1, seats_per_row=2, blocked=[SeatRef(row=1, seat=1), SeatRef(row=1, seat=2)]
+    )]))
+    db.refresh(event)
+    assert event.max_capacity == 0
@@ -0,0 +1,26 @@
+from app.db.models import EventViewSketch
+from app.services.unique_viewers import unique_viewer_service
+
+def test_flush_drops_sketches_of_deleted_events(db, make_event):
+    kept, deleted = make_event(), make_event()
+    for user_id in range(50):
+        unique_viewer_service.record(kept.id, user_id)
+        unique_viewer_service.record(deleted.id, user_id)
+    db.delete(deleted)
+    db.commit()
+
+    assert unique_viewer_service.flush() == 2  # kept: total and today
+    assert unique_viewer_service.flush() == 0
+    assert db.query(EventViewSketch).filter(EventViewSketch.event_id == kept.id).count() == 2
+    assert abs(unique_viewer_service.estimate(db, kept.id) - 50) <= 2
+
+def test_flush_merges_into_stored_sketches(db, make_event):
+    event = make_event()
+    for user_id in range(100):
+        unique_viewer_service.record(event.id, user_id)
+    unique_viewer_service.flush()
+    for user_id in range(50, 150):
+        unique_viewer_service.record(event.id, user_id)
+    unique_viewer_service.flush()
+
+    assert abs(unique_viewer_service.estimate(db, event.id) - 150) <= 5
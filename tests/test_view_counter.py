@@ -0,0 +1,28 @@
+from sqlalchemy import func, select
+
+from app.db.models import EventCounter
+from app.services.view_counter import ViewCounter
+
+def stored_views(db, event_id):
+    return db.execute(
+        select(func.coalesce(func.sum(EventCounter.views_count), 0)).where(EventCounter.event_id == event_id)
+    ).scalar()
+
+def test_views_of_a_deleted_event_do_not_poison_the_flush(db, make_event):
+    counter = ViewCounter(flush_interval=3600, max_pending=10**9)
+    kept, deleted = make_event(), make_event()
+    kept_id, deleted_id = kept.id, deleted.id
+    counter.record(kept_id, 3)
+    counter.record(deleted_id, 5)
+    db.delete(deleted)
+    db.commit()
+
+    assert counter.flush() == 1
+    assert counter.pending(deleted_id) == 0
+    assert stored_views(db, kept_id) == 3
+
+    counter.record(kept_id, 2)
+    assert counter.flush() == 1
+    db.commit()
+    assert stored_views(db, kept_id) == 5
+    assert counter.flush() == 0